@@ -0,0 +1,84 @@
+import os
+import sys
+import logging
+import threading
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field
+from core.job_queue import JobQueue
+from core.single_flight import analysis_key
+
+_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from master_orchestrator import get_master_app, master_flight, build_initial_state, summarize_final_state
+
+router = APIRouter(prefix="/jobs", tags=["Background Jobs"])
+logger = logging.getLogger("api.jobs")
+
+class JobRequest(BaseModel):
+    """Submission payload. `lane` defaults to interactive for one ticker, batch otherwise."""
+    tickers: List[str] = Field(min_length=1)
+    query: str = "Analyze"
+    lane: Optional[str] = None
+
+def _analyze_ticker(ticker: str, query: str) -> dict:
+    """
+    Runs the master graph for one job ticker. Identical tickers from other jobs
+    and `run_master_orchestrator` callers share one run through `master_flight`;
+    /analyze/ coalesces separately on its own async flight.
+    """
+    state = master_flight.do(analysis_key(ticker, query), get_master_app().invoke, build_initial_state(ticker, query))
+    return summarize_final_state(state)
+
+_queue_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    """Process-wide queue, created on first use so importing the router never opens jobs.db."""
+    queue = globals().get("job_queue")
+    if queue is None:
+        with _queue_lock:
+            queue = globals().get("job_queue")
+            if queue is None:
+                queue = globals()["job_queue"] = JobQueue(_analyze_ticker)
+    return queue
+
+def __getattr__(name):
+    # `api.jobs.job_queue` keeps working and triggers the lazy construction
+    if name == "job_queue":
+        return get_job_queue()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@router.post("", status_code=202)
+def submit_job(request: JobRequest):
+    """Queues an analysis job for one or many tickers and returns its id immediately."""
+    queue = get_job_queue()
+    try:
+        job_id = queue.submit(request.tickers, request.query, request.lane)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # JobQueue.submit drops duplicate tickers, so report the total it recorded
+    total = queue.store.get(job_id, include_results=False)["total"]
+    return {"job_id": job_id, "status": "queued", "total": total}
+
+@router.get("/{job_id}")
+def get_job(job_id: str, include_results: bool = True):
+    """Returns job status, progress counters and (optionally) per-ticker results."""
+    job = get_job_queue().store.get(job_id, include_results=include_results)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    finished = job["completed"] + job["failed"]
+    job["progress"] = round(finished / job["total"], 4) if job["total"] else 1.0
+    return job
+
+@router.delete("/{job_id}")
+def cancel_job(job_id: str):
+    """Cancels a queued or running job."""
+    queue = get_job_queue()
+    if queue.cancel(job_id):
+        return {"job_id": job_id, "status": "cancelled"}
+    job = queue.store.get(job_id, include_results=False)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    raise HTTPException(status_code=409, detail=f"Job {job_id} is already {job['status']}")
@@ -1,21 +1,49 @@
-from fastapi import APIRouter
-from core.orchestrator import run_analyst
+import os
+import sys
+import json
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Header
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from core.orchestrator import arun_analyst, profile_analyst
+from core.single_flight import SingleFlight, analysis_key
 import logging
 
+# The unified master graph lives at the repo root and wires every Phase onto sys.path
+_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from master_orchestrator import get_master_app, build_initial_state
+
 router = APIRouter(prefix="/analyze", tags=["Trading Graph"])
 logger = logging.getLogger("api")
 
+# Hot tickers hit /analyze many times per second at market open; identical
+# requests within the same market bar share a single graph run.
+analysis_flight = SingleFlight()
+
 @router.post("/")
-async def start_analysis(ticker: str, query: str):
+async def start_analysis(ticker: str, query: str, x_profile: Optional[str] = Header(default=None)):
     """
     Triggers the LangGraph orchestration loop for the specified stock.
-    In Phase 1, everything is returned directly without streaming.
+    The graph is awaited via `ainvoke`, so a slow analysis never blocks the
+    event loop (other requests and /health keep being served).
+
+    Sending `X-Profile: 1` runs this request (uncoalesced, in a worker thread)
+    under the per-node cProfile/tracemalloc profiler and returns the report path.
     """
     logger.info(f"Triggered analysis for ticker: {ticker}")
+    profile = (x_profile or "").lower() in ("1", "true", "yes")
     
     # 1. Start the Graph Run
     try:
-        final_state = run_analyst(ticker, query)
+        report_dir = None
+        if profile:
+            final_state, report_dir = await asyncio.to_thread(profile_analyst, ticker, query)
+        else:
+            final_state = await analysis_flight.ado(analysis_key(ticker, query), arun_analyst, ticker, query)
         
         # 2. Extract Key Outcomes
         response = {
@@ -25,8 +53,57 @@ async def start_analysis(ticker: str, query: str):
             "risk_approved": final_state.get("risk_approved", False),
             "execution_plan": final_state.get("execution_plan", ""),
         }
+        if report_dir:
+            response["profile_report"] = report_dir
         return response
     
     except Exception as e:
         logger.error(f"Graph execution failed: {str(e)}")
         return {"status": "error", "message": str(e)}
+
+def _to_jsonable(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, dict):
+        return {k: _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    return value
+
+def _sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(_to_jsonable(data), default=str)}\n\n"
+
+async def _stream_master_graph(ticker: str, query: str):
+    """
+    Yields one SSE event per graph node as soon as that node's partial state lands:
+    `ingest` (market snapshot), `agent_reasoning` (once per specialist verdict),
+    `risk_layer` (risk verdict), `advisory_logger` (algo id), then `done`.
+    """
+    try:
+        async for update in get_master_app().astream(build_initial_state(ticker, query), stream_mode="updates"):
+            for node_name, partial_state in update.items():
+                partial_state = partial_state or {}
+                if "agent_debates" in partial_state:
+                    for reasoning in partial_state["agent_debates"]:
+                        yield _sse_event("agent_reasoning", {"node": node_name, **_to_jsonable(reasoning)})
+                    partial_state = {k: v for k, v in partial_state.items() if k != "agent_debates"}
+                if partial_state:
+                    yield _sse_event(node_name, partial_state)
+        yield _sse_event("done", {"ticker": ticker})
+    except Exception as e:
+        logger.error(f"Streaming graph execution failed: {str(e)}")
+        yield _sse_event("error", {"ticker": ticker, "message": str(e)})
+
+@router.get("/stream")
+async def stream_analysis(ticker: str, query: str = "Analyze"):
+    """
+    Server-Sent-Events view of the unified master graph. Clients receive the
+    ingest snapshot within milliseconds, then each agent's reasoning as it
+    finishes instead of waiting for the slowest LLM call.
+    """
+    logger.info(f"Triggered streaming analysis for ticker: {ticker}")
+    return StreamingResponse(
+        _stream_master_graph(ticker, query),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,27 +1,59 @@
+import os
+import asyncio
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from api.routes import router as analyze_router
+from api.jobs import router as jobs_router, get_job_queue
+from master_orchestrator import warm_up
+from core.metrics import render_prometheus
+from data_connectors.yfinance_data import quote_cache
+from data_connectors.http_client import http_client
+from data_connectors.rag_pipeline.ingest import query_cache
 import logging
 
 # Set up basic logging for uvicorn
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("trade_today_app")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Heavy dependencies load lazily on the first request. Deployments that would rather
+    # pay that before taking traffic set WARM_UP_ON_STARTUP=1.
+    if os.getenv("WARM_UP_ON_STARTUP", "0") == "1":
+        timings = await asyncio.to_thread(warm_up)
+        logger.info(f"Warm-up complete: {timings}")
+    # Background job workers (also resumes jobs left unfinished by a previous run);
+    # the queue and its jobs.db are only created here, not at import
+    job_queue = get_job_queue()
+    job_queue.start()
+    yield
+    job_queue.stop()
+
 # Initialize the Backend Web Layer
 app = FastAPI(
     title="Multi-Factor Trading Analyst API",
     description="Agentic framework mapping LangGraph logic to HTTP endpoints.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Connect Endpoint routes
 app.include_router(analyze_router)
+app.include_router(jobs_router)
 
 @app.get("/health")
 async def root():
     """Simple healthcheck."""
     return {"status": "ok", "message": "Trading Analyst Backend Online"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Latency histograms plus quote-cache, HTTP client and query-embedding cache counters in Prometheus text format."""
+    return PlainTextResponse(render_prometheus() + quote_cache.render_prometheus() + http_client.render_prometheus()
+                             + query_cache.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     logger.info("Starting Multi-Factor Trading Analyst Development Server...")
     # Bind to localhost port 8000
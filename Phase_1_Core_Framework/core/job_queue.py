@@ -0,0 +1,224 @@
+import os
+import json
+import uuid
+import sqlite3
+import threading
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Callable, List, Optional
+
+logger = logging.getLogger("job_queue")
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "jobs.db"))
+
+# Lanes: interactive work always jumps ahead of batch work, and a few workers
+# only ever serve the interactive lane so a 2000-ticker scan cannot starve them.
+LANE_INTERACTIVE = "interactive"
+LANE_BATCH = "batch"
+LANES = (LANE_INTERACTIVE, LANE_BATCH)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+class JobStore:
+    """SQLite persistence for jobs and their per-ticker results (survives restarts)."""
+    def __init__(self, db_path: str = JOBS_DB_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT,
+                lane TEXT,
+                query TEXT,
+                tickers TEXT,
+                total INTEGER,
+                completed INTEGER DEFAULT 0,
+                failed INTEGER DEFAULT 0,
+                created_at TEXT,
+                updated_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS job_results (
+                job_id TEXT,
+                ticker TEXT,
+                status TEXT,
+                result TEXT,
+                PRIMARY KEY (job_id, ticker)
+            );
+        ''')
+        self._conn.commit()
+
+    def create(self, job_id: str, tickers: List[str], query: str, lane: str):
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                '''INSERT INTO jobs (id, status, lane, query, tickers, total, created_at, updated_at)
+                   VALUES (?, 'queued', ?, ?, ?, ?, ?, ?)''',
+                (job_id, lane, query, json.dumps(tickers), len(tickers), now, now)
+            )
+            self._conn.commit()
+
+    def set_status(self, job_id: str, status: str, only_if_active: bool = False):
+        sql = "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?"
+        if only_if_active:
+            sql += " AND status IN ('queued', 'running')"
+        with self._lock:
+            cur = self._conn.execute(sql, (status, datetime.now().isoformat(), job_id))
+            self._conn.commit()
+            return cur.rowcount > 0
+
+    def record_result(self, job_id: str, ticker: str, ok: bool, result: dict) -> dict:
+        """Stores one ticker outcome and returns the updated job counters."""
+        column = "completed" if ok else "failed"
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_results (job_id, ticker, status, result) VALUES (?, ?, ?, ?)",
+                (job_id, ticker, "success" if ok else "error", json.dumps(result, default=str))
+            )
+            self._conn.execute(
+                f"UPDATE jobs SET {column} = {column} + 1, updated_at = ? WHERE id = ?",
+                (datetime.now().isoformat(), job_id)
+            )
+            self._conn.commit()
+            row = self._conn.execute("SELECT total, completed, failed FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row)
+
+    def get(self, job_id: str, include_results: bool = True) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            job = dict(row)
+            job["tickers"] = json.loads(job["tickers"])
+            if include_results:
+                results = self._conn.execute(
+                    "SELECT ticker, status, result FROM job_results WHERE job_id = ?", (job_id,)
+                ).fetchall()
+                job["results"] = [
+                    {"ticker": r["ticker"], "status": r["status"], "result": json.loads(r["result"])}
+                    for r in results
+                ]
+        return job
+
+    def unfinished(self) -> List[dict]:
+        """Active jobs plus the tickers that still have no stored result."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, lane, query, tickers FROM jobs WHERE status IN ('queued', 'running') ORDER BY created_at"
+            ).fetchall()
+            pending = []
+            for row in rows:
+                done = {r[0] for r in self._conn.execute(
+                    "SELECT ticker FROM job_results WHERE job_id = ?", (row["id"],)
+                )}
+                tickers = [t for t in json.loads(row["tickers"]) if t not in done]
+                pending.append({"id": row["id"], "lane": row["lane"], "query": row["query"], "tickers": tickers})
+        return pending
+
+class JobQueue:
+    """
+    Bounded worker pool executing per-ticker tasks for submitted jobs.
+
+    `runner(ticker, query)` performs one analysis and returns a JSON-safe dict.
+    `workers` threads serve both lanes (interactive first); `interactive_workers`
+    extra threads serve only the interactive lane.
+    """
+    def __init__(self, runner: Callable[[str, str], dict], store: JobStore = None,
+                 workers: int = int(os.getenv("JOB_WORKERS", "4")),
+                 interactive_workers: int = int(os.getenv("JOB_INTERACTIVE_WORKERS", "1"))):
+        self.runner = runner
+        self.store = store or JobStore()
+        self.workers = workers
+        self.interactive_workers = interactive_workers
+        self._queues = {lane: deque() for lane in LANES}
+        self._cond = threading.Condition()
+        self._cancelled = set()
+        self._threads = []
+        self._stopping = False
+
+    def start(self):
+        """Spawns the workers and re-enqueues jobs left unfinished by a previous process."""
+        if self._threads:
+            return
+        for job in self.store.unfinished():
+            logger.info(f"Resuming job {job['id']} ({len(job['tickers'])} tickers left)")
+            if not job["tickers"]:
+                self.store.set_status(job["id"], "completed", only_if_active=True)
+                continue
+            self._enqueue(job["id"], job["tickers"], job["query"], job["lane"])
+
+        lanes_by_worker = [LANES] * self.workers + [(LANE_INTERACTIVE,)] * self.interactive_workers
+        for i, lanes in enumerate(lanes_by_worker):
+            t = threading.Thread(target=self._worker_loop, args=(lanes,), name=f"job-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join(timeout=5)
+        self._threads = []
+        self._stopping = False
+
+    def submit(self, tickers: List[str], query: str = "Analyze", lane: str = None) -> str:
+        # One job_results row per ticker, so counters must count each ticker once
+        tickers = list(dict.fromkeys(tickers))
+        lane = lane or (LANE_INTERACTIVE if len(tickers) == 1 else LANE_BATCH)
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane '{lane}'. Expected one of {LANES}.")
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, tickers, query, lane)
+        self._enqueue(job_id, tickers, query, lane)
+        logger.info(f"Queued job {job_id}: {len(tickers)} tickers on the {lane} lane")
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancels a queued/running job. Tickers already executing finish but are not recorded."""
+        if not self.store.set_status(job_id, "cancelled", only_if_active=True):
+            return False
+        with self._cond:
+            self._cancelled.add(job_id)
+            for lane in LANES:
+                self._queues[lane] = deque(t for t in self._queues[lane] if t[0] != job_id)
+        return True
+
+    def _enqueue(self, job_id: str, tickers: List[str], query: str, lane: str):
+        with self._cond:
+            self._queues[lane].extend((job_id, ticker, query) for ticker in tickers)
+            self._cond.notify_all()
+
+    def _next_task(self, lanes):
+        with self._cond:
+            while True:
+                if self._stopping:
+                    return None
+                for lane in lanes:
+                    if self._queues[lane]:
+                        return self._queues[lane].popleft()
+                self._cond.wait()
+
+    def _worker_loop(self, lanes):
+        while True:
+            task = self._next_task(lanes)
+            if task is None:
+                return
+            job_id, ticker, query = task
+            if job_id in self._cancelled:
+                continue
+
+            self.store.set_status(job_id, "running", only_if_active=True)
+            try:
+                result, ok = self.runner(ticker, query), True
+            except Exception as e:
+                logger.error(f"Job {job_id} failed on {ticker}: {str(e)}")
+                result, ok = {"ticker": ticker, "error": str(e)}, False
+
+            if job_id in self._cancelled:
+                continue
+            counters = self.store.record_result(job_id, ticker, ok, result)
+            if counters["completed"] + counters["failed"] >= counters["total"]:
+                self.store.set_status(job_id, "completed", only_if_active=True)
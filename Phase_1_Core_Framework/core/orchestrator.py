@@ -1,7 +1,17 @@
-from langgraph.graph import StateGraph, END
+import os
+import sys
+import threading
 from typing import Dict, Any
 from core.state import AnalystState, MarketData, AgentReasoning
 
+# Inject Phase 4 path for the opt-in node profiler
+_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_phase4 = os.path.join(_root, "Phase_4_Risk_And_Observability")
+if _phase4 not in sys.path:
+    sys.path.insert(0, _phase4)
+
+from core.profiler import RunProfiler, profiled
+
 def mock_market_data_node(state: AnalystState):
     """Dummy node representing initial data ingestion."""
     print(f"[Orchestrator] Ingesting data for {state['active_ticker']}...")
@@ -22,24 +32,38 @@ def mock_portfolio_manager_node(state: AnalystState):
         "risk_approved": True
     }
 
-# Build the simplified graph
-builder = StateGraph(AnalystState)
+def _build_graph():
+    from langgraph.graph import StateGraph, END
 
-# Add Nodes
-builder.add_node("ingest_data", mock_market_data_node)
-builder.add_node("portfolio_manager", mock_portfolio_manager_node)
+    # Build the simplified graph
+    builder = StateGraph(AnalystState)
 
-# Set edges
-builder.set_entry_point("ingest_data")
-builder.add_edge("ingest_data", "portfolio_manager")
-builder.add_edge("portfolio_manager", END)
+    # Add Nodes
+    builder.add_node("ingest_data", profiled("ingest_data", mock_market_data_node))
+    builder.add_node("portfolio_manager", profiled("portfolio_manager", mock_portfolio_manager_node))
 
-# Compile Graph
-graph = builder.compile()
+    # Set edges
+    builder.set_entry_point("ingest_data")
+    builder.add_edge("ingest_data", "portfolio_manager")
+    builder.add_edge("portfolio_manager", END)
 
-# Example runner for local testing
-def run_analyst(ticker: str, query: str = "Analyze this stock"):
-    initial_state = AnalystState(
+    # Compile Graph
+    return builder.compile()
+
+_graph = None
+_graph_lock = threading.Lock()
+
+def get_graph():
+    """Compiled graph, built on first use so importing the API stays cheap."""
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                _graph = _build_graph()
+    return _graph
+
+def _initial_state(ticker: str, query: str) -> AnalystState:
+    return AnalystState(
         user_query=query,
         active_ticker=ticker,
         market_data=MarketData(ticker=ticker),
@@ -47,8 +71,22 @@ def run_analyst(ticker: str, query: str = "Analyze this stock"):
         final_decision="",
         execution_plan="",
         risk_approved=False,
+        advisory_algo_id="",
         error_logs=[]
     )
-    
-    events = graph.invoke(initial_state)
+
+# Example runner for local testing
+def run_analyst(ticker: str, query: str = "Analyze this stock"):
+    events = get_graph().invoke(_initial_state(ticker, query))
     return events
+
+async def arun_analyst(ticker: str, query: str = "Analyze this stock"):
+    """Non-blocking runner for async callers (the FastAPI routes)."""
+    events = await get_graph().ainvoke(_initial_state(ticker, query))
+    return events
+
+def profile_analyst(ticker: str, query: str = "Analyze this stock"):
+    """Runs the graph under a RunProfiler and returns (final_state, report_dir)."""
+    profiler = RunProfiler(label=ticker.replace(".", "_"))
+    events = get_graph().invoke(_initial_state(ticker, query), config={"configurable": {"profiler": profiler}})
+    return events, profiler.write_report()
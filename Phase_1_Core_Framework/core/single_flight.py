@@ -0,0 +1,133 @@
+import os
+import time
+import asyncio
+import threading
+import logging
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger("single_flight")
+
+# Identical analyses share one execution while in flight, and the finished result
+# is reused for COALESCE_REUSE_SECONDS afterwards. Requests are bucketed by market
+# bar, so a new bar always triggers a fresh run.
+COALESCE_REUSE_SECONDS = float(os.getenv("COALESCE_REUSE_SECONDS", "5"))
+COALESCE_BAR_SECONDS = int(os.getenv("COALESCE_BAR_SECONDS", "60"))
+
+def analysis_key(ticker: str, query: str, bar_seconds: int = COALESCE_BAR_SECONDS) -> Tuple[str, str, int]:
+    """(ticker, query, market-bar) coalescing key. The bar index is wall-clock time floored to `bar_seconds`."""
+    return (ticker.strip().upper(), query, int(time.time() // bar_seconds))
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    In-process request coalescing for both threads (`do`) and asyncio (`ado`).
+
+    The first caller for a key executes; concurrent callers with the same key
+    block/await that execution and receive the very same result object, so
+    results must be treated as read-only. Errors are propagated to every waiter
+    but never cached.
+    """
+    def __init__(self, reuse_seconds: float = COALESCE_REUSE_SECONDS):
+        self.reuse_seconds = reuse_seconds
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self._recent: Dict[Hashable, Tuple[float, Any]] = {}
+        self.stats = {"executed": 0, "coalesced": 0, "reused": 0}
+
+    def _reusable(self, key: Hashable):
+        """Must be called with the lock held. Returns (hit, result)."""
+        entry = self._recent.get(key)
+        if entry is None:
+            return False, None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self._recent[key]
+            return False, None
+        self.stats["reused"] += 1
+        return True, result
+
+    def _remember(self, key: Hashable, result: Any):
+        if self.reuse_seconds <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            # Opportunistically drop expired entries so the map stays small
+            for stale in [k for k, (exp, _) in self._recent.items() if exp <= now]:
+                del self._recent[stale]
+            self._recent[key] = (now + self.reuse_seconds, result)
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        """Blocking single-flight call."""
+        with self._lock:
+            hit, result = self._reusable(key)
+            if hit:
+                return result
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["executed"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            self._remember(key, call.result)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    async def ado(self, key: Hashable, coro_fn: Callable, *args, **kwargs):
+        """
+        Awaitable single-flight call. The shared execution runs as its own task
+        and waiters are shielded, so one client disconnecting does not cancel
+        the analysis for everybody else.
+        """
+        with self._lock:
+            hit, result = self._reusable(key)
+            if hit:
+                return result
+            task = self._tasks.get(key)
+            if task is None:
+                task = asyncio.ensure_future(coro_fn(*args, **kwargs))
+                self._tasks[key] = task
+                task.add_done_callback(lambda t, k=key: self._on_task_done(k, t))
+                self.stats["executed"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        return await asyncio.shield(task)
+
+    def _on_task_done(self, key: Hashable, task: asyncio.Future):
+        with self._lock:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+        if not task.cancelled() and task.exception() is None:
+            self._remember(key, task.result())
+
+    def invalidate(self, key: Hashable = None):
+        """Drops reusable results for `key` (or all keys)."""
+        with self._lock:
+            if key is None:
+                self._recent.clear()
+            else:
+                self._recent.pop(key, None)
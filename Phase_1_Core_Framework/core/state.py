@@ -36,4 +36,5 @@ class AnalystState(TypedDict):
     
     # Routing constraints
     risk_approved: bool 
+    advisory_algo_id: str     # SEBI-style audit id written by the advisory logger
     error_logs: Annotated[List[str], operator.add]
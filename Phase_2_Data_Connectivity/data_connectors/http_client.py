@@ -0,0 +1,271 @@
+"""
+Shared HTTP layer for every scraper in `data_connectors`.
+
+- One keep-alive `requests.Session` with a sized connection pool, so repeated
+  calls to Yahoo/NSE reuse TCP/TLS connections.
+- A token bucket per host keeps bursts (batch scans, page reruns) under the
+  upstream rate limits; callers block briefly instead of getting 429s.
+- Connection errors, 429 and 5xx are retried with full-jitter exponential
+  backoff (Retry-After is honoured when present).
+- GET responses can be kept in a content-addressed on-disk cache: bodies are
+  stored once under their SHA-256, and an index entry per request points at
+  them. TTLs are per URL pattern (`CACHE_TTL_RULES`) or per call. Expired
+  entries with an ETag/Last-Modified are revalidated with a conditional GET.
+"""
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger("http_client")
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE_SECONDS = float(os.getenv("HTTP_BACKOFF_BASE_SECONDS", "0.5"))
+HTTP_BACKOFF_MAX_SECONDS = float(os.getenv("HTTP_BACKOFF_MAX_SECONDS", "10"))
+HTTP_CACHE_DIR = os.getenv(
+    "HTTP_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "http_cache")
+)
+
+# (requests per second, burst) per host; anything unlisted gets the default
+HTTP_DEFAULT_RATE = (float(os.getenv("HTTP_DEFAULT_RATE_PER_SECOND", "5")), 10)
+HOST_RATE_LIMITS = {
+    "finance.yahoo.com": (2.0, 5),
+    "nsearchives.nseindia.com": (1.0, 3),
+    "www.nseindia.com": (1.0, 3),
+}
+
+# First matching pattern wins; 0 means "do not cache"
+CACHE_TTL_RULES = [
+    (re.compile(r"^https://finance\.yahoo\.com/quote/[^/]+/news"), 300.0),
+]
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `capacity` banked."""
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Takes one token, sleeping until one is available. Returns the time waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+class ResponseCache:
+    """Content-addressed response store: `blobs/<sha256>` bodies plus `index/<key>.json` entries."""
+    def __init__(self, root: str = HTTP_CACHE_DIR):
+        self.root = root
+
+    @staticmethod
+    def key(url: str, params: Optional[dict] = None) -> str:
+        query = json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.sha256(f"GET {url} {query}".encode("utf-8")).hexdigest()
+
+    def _index_path(self, key: str) -> str:
+        return os.path.join(self.root, "index", f"{key}.json")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest[:2], digest)
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def load(self, key: str) -> Optional[dict]:
+        try:
+            with open(self._index_path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            with open(self._blob_path(entry["digest"]), "rb") as f:
+                entry["body"] = f.read()
+            return entry
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def store(self, key: str, url: str, response: requests.Response) -> dict:
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        blob = self._blob_path(digest)
+        if not os.path.exists(blob):  # identical bodies are stored once
+            self._write_atomic(blob, body)
+        entry = {
+            "url": url,
+            "digest": digest,
+            "stored_at": time.time(),
+            "status": response.status_code,
+            "encoding": response.encoding,
+            "headers": {k: v for k, v in response.headers.items()
+                        if k.lower() in ("content-type", "etag", "last-modified")},
+        }
+        self._write_atomic(self._index_path(key), json.dumps(entry).encode("utf-8"))
+        entry["body"] = body
+        return entry
+
+    def touch(self, key: str, entry: dict):
+        entry = dict(entry, stored_at=time.time())
+        body = entry.pop("body", None)
+        self._write_atomic(self._index_path(key), json.dumps(entry).encode("utf-8"))
+        entry["body"] = body
+        return entry
+
+def _cached_response(entry: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response._content = entry["body"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.encoding = entry["encoding"]
+    response.url = entry["url"]
+    response.from_cache = True
+    return response
+
+class HttpClient:
+    def __init__(self, cache: Optional[ResponseCache] = None, pool_size: int = HTTP_POOL_SIZE,
+                 max_retries: int = HTTP_MAX_RETRIES, backoff_base: float = HTTP_BACKOFF_BASE_SECONDS,
+                 backoff_max: float = HTTP_BACKOFF_MAX_SECONDS, sleep=time.sleep):
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.cache = cache or ResponseCache()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.requests = self.cache_hits = self.revalidated = self.retries = 0
+        self.throttled_seconds = 0.0
+
+    def bucket(self, host: str) -> TokenBucket:
+        """The shared per-host limiter (also used by async callers that bypass the session)."""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = HOST_RATE_LIMITS.get(host, HTTP_DEFAULT_RATE)
+                bucket = self._buckets[host] = TokenBucket(rate, burst, sleep=self._sleep)
+            return bucket
+
+    @staticmethod
+    def ttl_for(url: str) -> float:
+        for pattern, ttl in CACHE_TTL_RULES:
+            if pattern.search(url):
+                return ttl
+        return 0.0
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        bucket = self.bucket(urlsplit(url).hostname or "")
+        for attempt in range(self.max_retries + 1):
+            waited = bucket.acquire()
+            response = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+                with self._lock:
+                    self.requests += 1
+                    self.throttled_seconds += waited
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    return response
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+            delay = self._backoff(attempt, response)
+            logger.warning(f"Retrying {method} {url} in {delay:.2f}s (attempt {attempt + 1}/{self.max_retries})")
+            with self._lock:
+                self.retries += 1
+            self._sleep(delay)
+
+    def get(self, url: str, params: Optional[dict] = None, headers: Optional[dict] = None,
+            timeout: float = 10, ttl: Optional[float] = None) -> requests.Response:
+        """
+        Rate-limited, retried GET. With a positive `ttl` (or a matching
+        `CACHE_TTL_RULES` entry) successful responses are served from the disk
+        cache until they expire; cached responses carry `from_cache = True`.
+        """
+        ttl = self.ttl_for(url) if ttl is None else ttl
+        if ttl <= 0:
+            return self._send("GET", url, params=params, headers=headers, timeout=timeout)
+
+        key = self.cache.key(url, params)
+        entry = self.cache.load(key)
+        if entry is not None and time.time() - entry["stored_at"] < ttl:
+            with self._lock:
+                self.cache_hits += 1
+            return _cached_response(entry)
+
+        headers = dict(headers or {})
+        if entry is not None:
+            # Stored with the server's casing ("etag", "ETag", ...)
+            validators = CaseInsensitiveDict(entry["headers"])
+            if validators.get("ETag"):
+                headers["If-None-Match"] = validators["ETag"]
+            if validators.get("Last-Modified"):
+                headers["If-Modified-Since"] = validators["Last-Modified"]
+        response = self._send("GET", url, params=params, headers=headers, timeout=timeout)
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self.revalidated += 1
+            return _cached_response(self.cache.touch(key, entry))
+        if response.status_code == 200:
+            self.cache.store(key, url, response)
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "cache_hits": self.cache_hits,
+                "revalidated": self.revalidated,
+                "retries": self.retries,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+            }
+
+    def render_prometheus(self, prefix: str = "trade_today_http") -> str:
+        stats = self.stats()
+        lines = []
+        for name in ("requests", "cache_hits", "revalidated", "retries", "throttled_seconds"):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {stats[name]}")
+        return "\n".join(lines) + "\n"
+
+# Process-wide client shared by news_mcp, the universe loader and the UI
+http_client = HttpClient()
@@ -0,0 +1,239 @@
+"""
+Incremental Technical Indicators
+────────────────────────────────
+Per-ticker running state that absorbs one bar in O(1): EMA 12/26, MACD +
+signal, Wilder RSI and ATR, rolling SMA 20/50/200 with Bollinger std, and
+session VWAP. Definitions match `data_connectors.indicators` exactly, so a
+state fed the same bars reports the same values as the vectorized engine.
+
+Re-sending the most recent timestamp (an intraday bar that is still forming)
+revises that bar instead of appending a new one. `to_dict()` / `from_dict()`
+round-trip the state through JSON so a restarted worker resumes without
+replaying history.
+"""
+import math
+from array import array
+
+# IST sessions: VWAP resets when the exchange-local calendar day changes
+SESSION_UTC_OFFSET_SECONDS = 5 * 3600 + 30 * 60
+
+_NAN = float("nan")
+
+class RecursiveAverage:
+    """y = y + alpha * (x - y), seeded with the first value (EMA / Wilder smoothing)."""
+    __slots__ = ("alpha", "value", "_before")
+
+    def __init__(self, alpha: float, value: float = _NAN, before: float = _NAN):
+        self.alpha = alpha
+        self.value = value
+        self._before = before
+
+    def _apply(self, prev: float, x: float) -> float:
+        if math.isnan(x):
+            return prev
+        return x if math.isnan(prev) else prev + self.alpha * (x - prev)
+
+    def update(self, x: float) -> float:
+        self._before = self.value
+        self.value = self._apply(self.value, x)
+        return self.value
+
+    def revise(self, x: float) -> float:
+        """Replaces the most recent input."""
+        self.value = self._apply(self._before, x)
+        return self.value
+
+    def to_dict(self) -> dict:
+        return {"alpha": self.alpha, "value": self.value, "before": self._before}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RecursiveAverage":
+        return cls(d["alpha"], d["value"], d["before"])
+
+class RollingWindow:
+    """Fixed-size ring buffer with running sum / sum of squares for SMA and std."""
+    __slots__ = ("size", "buffer", "head", "count", "total", "total_sq", "_since_resum")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.buffer = array("d", [0.0] * size)
+        self.head = 0
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._since_resum = 0
+
+    def update(self, x: float):
+        evicted = self.buffer[self.head] if self.count == self.size else 0.0
+        self.total += x - evicted
+        self.total_sq += x * x - evicted * evicted
+        self.buffer[self.head] = x
+        self.head = (self.head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        # Re-sum once per window so floating-point drift in the running totals stays bounded
+        self._since_resum += 1
+        if self._since_resum >= self.size:
+            self._resum()
+
+    def revise(self, x: float):
+        last = (self.head - 1) % self.size
+        old = self.buffer[last]
+        self.total += x - old
+        self.total_sq += x * x - old * old
+        self.buffer[last] = x
+
+    def _resum(self):
+        values = self.buffer if self.count == self.size else self.buffer[:self.count]
+        self.total = math.fsum(values)
+        self.total_sq = math.fsum(v * v for v in values)
+        self._since_resum = 0
+
+    def mean(self) -> float:
+        return self.total / self.size if self.count == self.size else _NAN
+
+    def std(self) -> float:
+        if self.count < self.size:
+            return _NAN
+        mean = self.total / self.size
+        return math.sqrt(max(self.total_sq / self.size - mean * mean, 0.0))
+
+    def to_dict(self) -> dict:
+        return {"size": self.size, "buffer": list(self.buffer), "head": self.head, "count": self.count}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RollingWindow":
+        window = cls(d["size"])
+        window.buffer = array("d", d["buffer"])
+        window.head, window.count = d["head"], d["count"]
+        window._resum()
+        return window
+
+class IndicatorState:
+    """Running indicator state for one ticker."""
+    __slots__ = (
+        "last_ts", "bars", "close", "prev_close", "last_bar",
+        "ema_12", "ema_26", "macd_signal", "avg_gain", "avg_loss", "atr",
+        "sma_20", "sma_50", "sma_200",
+        "vwap_session", "vwap_pv", "vwap_volume", "_vwap_last",
+    )
+
+    def __init__(self):
+        self.last_ts = None
+        self.bars = 0
+        self.close = _NAN
+        self.prev_close = _NAN
+        self.last_bar = None
+        self.ema_12 = RecursiveAverage(2.0 / 13)
+        self.ema_26 = RecursiveAverage(2.0 / 27)
+        self.macd_signal = RecursiveAverage(2.0 / 10)
+        self.avg_gain = RecursiveAverage(1.0 / 14)
+        self.avg_loss = RecursiveAverage(1.0 / 14)
+        self.atr = RecursiveAverage(1.0 / 14)
+        self.sma_20 = RollingWindow(20)
+        self.sma_50 = RollingWindow(50)
+        self.sma_200 = RollingWindow(200)
+        self.vwap_session = None
+        self.vwap_pv = 0.0
+        self.vwap_volume = 0.0
+        self._vwap_last = (0.0, 0.0)
+
+    def update(self, ts: int, open_: float, high: float, low: float, close: float, volume: float) -> "IndicatorState":
+        """Absorbs one bar. A bar with the current `last_ts` revises it; older bars are ignored."""
+        ts, open_, high, low, close, volume = int(ts), float(open_), float(high), float(low), float(close), float(volume)
+        if self.last_ts is not None and ts < self.last_ts:
+            return self
+        revising = ts == self.last_ts
+        if not revising:
+            self.prev_close = self.close
+            self.bars += 1
+        step = "revise" if revising else "update"
+
+        change = close - self.prev_close
+        getattr(self.avg_gain, step)(max(change, 0.0) if not math.isnan(change) else _NAN)
+        getattr(self.avg_loss, step)(max(-change, 0.0) if not math.isnan(change) else _NAN)
+        true_range = high - low
+        if not math.isnan(self.prev_close):
+            true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+        getattr(self.atr, step)(true_range)
+
+        fast = getattr(self.ema_12, step)(close)
+        slow = getattr(self.ema_26, step)(close)
+        getattr(self.macd_signal, step)(fast - slow)
+        for window in (self.sma_20, self.sma_50, self.sma_200):
+            getattr(window, step)(close)
+
+        self._update_vwap(ts, high, low, close, volume, revising)
+        self.close = close
+        self.last_ts = ts
+        self.last_bar = {"open": open_, "high": high, "low": low, "close": close, "volume": volume}
+        return self
+
+    def _update_vwap(self, ts: int, high: float, low: float, close: float, volume: float, revising: bool):
+        session = (ts + SESSION_UTC_OFFSET_SECONDS) // 86400
+        if revising:
+            pv, vol = self._vwap_last
+            self.vwap_pv -= pv
+            self.vwap_volume -= vol
+        elif session != self.vwap_session:
+            self.vwap_session, self.vwap_pv, self.vwap_volume = session, 0.0, 0.0
+        typical = (high + low + close) / 3.0
+        self._vwap_last = (typical * volume, float(volume))
+        self.vwap_pv += typical * volume
+        self.vwap_volume += volume
+
+    def snapshot(self) -> dict:
+        """Latest values keyed like `indicators.compute_indicators` (plus VWAP)."""
+        def value(x):
+            return None if x is None or math.isnan(x) else round(x, 4)
+
+        avg_gain, avg_loss = self.avg_gain.value, self.avg_loss.value
+        if math.isnan(avg_gain) or math.isnan(avg_loss):
+            rsi = _NAN
+        elif avg_loss == 0:
+            rsi = 100.0 if avg_gain > 0 else _NAN
+        else:
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        macd_line = self.ema_12.value - self.ema_26.value
+        middle, std = self.sma_20.mean(), self.sma_20.std()
+        vwap = self.vwap_pv / self.vwap_volume if self.vwap_volume else _NAN
+        return {
+            "sma_20": value(middle),
+            "sma_50": value(self.sma_50.mean()),
+            "sma_200": value(self.sma_200.mean()),
+            "ema_12": value(self.ema_12.value),
+            "ema_26": value(self.ema_26.value),
+            "rsi_14": value(rsi),
+            "macd": value(macd_line),
+            "macd_signal": value(self.macd_signal.value),
+            "macd_hist": value(macd_line - self.macd_signal.value),
+            "atr_14": value(self.atr.value),
+            "bb_upper": value(middle + 2.0 * std),
+            "bb_middle": value(middle),
+            "bb_lower": value(middle - 2.0 * std),
+            "vwap": value(vwap),
+            "bars": self.bars,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "last_ts": self.last_ts, "bars": self.bars, "close": self.close,
+            "prev_close": self.prev_close, "last_bar": self.last_bar,
+            **{name: getattr(self, name).to_dict() for name in
+               ("ema_12", "ema_26", "macd_signal", "avg_gain", "avg_loss", "atr", "sma_20", "sma_50", "sma_200")},
+            "vwap_session": self.vwap_session, "vwap_pv": self.vwap_pv,
+            "vwap_volume": self.vwap_volume, "vwap_last": list(self._vwap_last),
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "IndicatorState":
+        state = cls()
+        state.last_ts, state.bars, state.close = d["last_ts"], d["bars"], d["close"]
+        state.prev_close, state.last_bar = d["prev_close"], d["last_bar"]
+        for name in ("ema_12", "ema_26", "macd_signal", "avg_gain", "avg_loss", "atr"):
+            setattr(state, name, RecursiveAverage.from_dict(d[name]))
+        for name in ("sma_20", "sma_50", "sma_200"):
+            setattr(state, name, RollingWindow.from_dict(d[name]))
+        state.vwap_session, state.vwap_pv, state.vwap_volume = d["vwap_session"], d["vwap_pv"], d["vwap_volume"]
+        state._vwap_last = tuple(d["vwap_last"])
+        return state
@@ -0,0 +1,160 @@
+"""
+Vectorized Technical Indicators
+───────────────────────────────
+Stacks the stored daily bars of many tickers into aligned 2-D arrays
+(tickers x bars, NaN where a ticker has no bar) and computes SMA, EMA, RSI,
+MACD, ATR and Bollinger bands for the whole panel in one pass. Rolling
+windows use cumulative sums; the recursive averages (EMA, Wilder) step over
+the time axis once with every ticker updated per step.
+
+Conventions (shared with `incremental_indicators`):
+  - EMA:    alpha = 2 / (n + 1), seeded with the first observation.
+  - Wilder: alpha = 1 / n, seeded with the first observation (RSI, ATR).
+  - Bollinger: SMA(n) +/- k * population std (ddof=0).
+"""
+import logging
+import numpy as np
+from typing import Dict, List
+
+from data_connectors.market_store import MarketStore
+
+logger = logging.getLogger("indicators")
+
+# Enough bars for the 200-day SMA plus headroom for the recursive averages to settle
+INDICATOR_LOOKBACK = 260
+
+def build_panel(tickers: List[str], store: MarketStore, lookback: int = INDICATOR_LOOKBACK) -> Dict[str, np.ndarray]:
+    """
+    Aligns each ticker's bars on the union of their timestamps (last `lookback`
+    of them). Returns {"ts": (T,), "open"/"high"/"low"/"close"/"volume": (N, T)}.
+    """
+    columns = {t: store.read(t) for t in tickers}
+    stamps = [c["ts"][-lookback:] for c in columns.values() if c]
+    ts = np.unique(np.concatenate(stamps))[-lookback:] if stamps else np.empty(0, dtype=np.int64)
+
+    panel = {"ts": ts}
+    for name in ("open", "high", "low", "close", "volume"):
+        panel[name] = np.full((len(tickers), len(ts)), np.nan)
+    for row, ticker in enumerate(tickers):
+        cols = columns[ticker]
+        if not cols or not len(ts):
+            continue
+        keep = cols["ts"] >= ts[0]
+        positions = np.searchsorted(ts, cols["ts"][keep])
+        for name in ("open", "high", "low", "close", "volume"):
+            panel[name][row, positions] = cols[name][keep]
+    return panel
+
+def sma(x: np.ndarray, n: int) -> np.ndarray:
+    """Rolling mean along the last axis; NaN until a full window of valid values exists."""
+    valid = ~np.isnan(x)
+    csum = np.cumsum(np.where(valid, x, 0.0), axis=-1)
+    ccount = np.cumsum(valid, axis=-1)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < n:
+        return out
+    window_sum = csum[..., n - 1:] - np.concatenate([np.zeros(x.shape[:-1] + (1,)), csum[..., :-n]], axis=-1)
+    window_count = ccount[..., n - 1:] - np.concatenate([np.zeros(x.shape[:-1] + (1,)), ccount[..., :-n]], axis=-1)
+    out[..., n - 1:] = np.where(window_count == n, window_sum / n, np.nan)
+    return out
+
+def rolling_std(x: np.ndarray, n: int) -> np.ndarray:
+    """Population standard deviation over the same windows as `sma`."""
+    mean = sma(x, n)
+    mean_sq = sma(x * x, n)
+    return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+def _recursive_average(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    y[t] = y[t-1] + alpha * (x[t] - y[t-1]), seeded with each row's first valid
+    value. Missing bars carry the previous average forward.
+    """
+    out = np.full(x.shape, np.nan)
+    prev = np.full(x.shape[:-1], np.nan)
+    for t in range(x.shape[-1]):
+        col = x[..., t]
+        prev = np.where(np.isnan(prev), col, np.where(np.isnan(col), prev, prev + alpha * (col - prev)))
+        out[..., t] = prev
+    return out
+
+def ema(x: np.ndarray, n: int) -> np.ndarray:
+    return _recursive_average(x, 2.0 / (n + 1))
+
+def wilder(x: np.ndarray, n: int) -> np.ndarray:
+    return _recursive_average(x, 1.0 / n)
+
+def _prev(x: np.ndarray) -> np.ndarray:
+    return np.concatenate([np.full(x.shape[:-1] + (1,), np.nan), x[..., :-1]], axis=-1)
+
+def rsi(close: np.ndarray, n: int = 14) -> np.ndarray:
+    change = close - _prev(close)
+    avg_gain = wilder(np.where(np.isnan(change), np.nan, np.maximum(change, 0.0)), n)
+    avg_loss = wilder(np.where(np.isnan(change), np.nan, np.maximum(-change, 0.0)), n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # No losses in the window: RSI is 100 (or undefined when price never moved)
+    return np.where(avg_loss == 0, np.where(avg_gain > 0, 100.0, np.nan), out)
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9):
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = _prev(close)
+    # fmax skips NaN: without a previous close the true range is just high - low
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, n: int = 14) -> np.ndarray:
+    return wilder(true_range(high, low, close), n)
+
+def bollinger(close: np.ndarray, n: int = 20, k: float = 2.0):
+    middle = sma(close, n)
+    width = k * rolling_std(close, n)
+    return middle + width, middle, middle - width
+
+def compute_indicator_arrays(panel: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Full (N, T) indicator arrays for a panel from `build_panel`."""
+    close, high, low = panel["close"], panel["high"], panel["low"]
+    macd_line, macd_signal, macd_hist = macd(close)
+    bb_upper, bb_middle, bb_lower = bollinger(close)
+    return {
+        "sma_20": bb_middle,
+        "sma_50": sma(close, 50),
+        "sma_200": sma(close, 200),
+        "ema_12": ema(close, 12),
+        "ema_26": ema(close, 26),
+        "rsi_14": rsi(close, 14),
+        "macd": macd_line,
+        "macd_signal": macd_signal,
+        "macd_hist": macd_hist,
+        "atr_14": atr(high, low, close, 14),
+        "bb_upper": bb_upper,
+        "bb_middle": bb_middle,
+        "bb_lower": bb_lower,
+    }
+
+def _latest_valid(row: np.ndarray):
+    idx = np.flatnonzero(~np.isnan(row))
+    return round(float(row[idx[-1]]), 4) if idx.size else None
+
+def compute_indicators(tickers: List[str], store: MarketStore = None,
+                       lookback: int = INDICATOR_LOOKBACK) -> Dict[str, dict]:
+    """
+    Latest indicator values per ticker, ready for `MarketData.technical_indicators`.
+    Values a ticker does not have enough history for are None.
+    """
+    if store is None:
+        from data_connectors.yfinance_data import market_store as store
+    tickers = list(dict.fromkeys(tickers))
+    panel = build_panel(tickers, store, lookback)
+    arrays = compute_indicator_arrays(panel)
+
+    results = {}
+    for row, ticker in enumerate(tickers):
+        bars = int(np.count_nonzero(~np.isnan(panel["close"][row])))
+        values = {name: _latest_valid(arr[row]) for name, arr in arrays.items()}
+        values["bars"] = bars
+        results[ticker] = values
+    logger.info(f"Computed indicators for {len(tickers)} tickers over {len(panel['ts'])} bars.")
+    return results
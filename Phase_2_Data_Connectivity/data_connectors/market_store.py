@@ -0,0 +1,197 @@
+"""
+Local OHLCV Store: append-only columnar files per ticker
+─────────────────────────────────────────────────────────
+Layout (one directory per ticker):
+  <MARKET_STORE_DIR>/<TICKER>/ts.i8, open.f8, high.f8, low.f8, close.f8, volume.i8
+  <MARKET_STORE_DIR>/<TICKER>/meta.json   {"rows", "last_ts", "fetched_at", "ts_convention"}
+
+Columns are raw little-endian arrays that only ever grow, so reads are a
+zero-copy `np.memmap` over the first `rows` entries and writers append new
+bars without rewriting history. `meta.json` is replaced atomically after the
+columns are written, which makes it the commit point for readers.
+
+A bar is keyed by its exchange trading date, stored as that date's midnight
+in UTC epoch seconds. `Ticker.history` returns exchange-local (IST) indexes
+while `yf.download` strips the zone from daily bars, so both are mapped to
+the same key before merging.
+"""
+import os
+import re
+import json
+import time
+import threading
+import logging
+import numpy as np
+from typing import Dict, Optional
+
+logger = logging.getLogger("market_store")
+
+MARKET_STORE_DIR = os.getenv(
+    "MARKET_STORE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "market_store")
+)
+
+# (column, dtype) – timestamps are exchange-date midnights as UTC epoch seconds
+COLUMNS = (
+    ("ts", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<i8"),
+)
+_FRAME_COLUMNS = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"}
+
+TS_CONVENTION = "exchange_date"
+DAY_SECONDS = 86400
+
+def bar_timestamps(index) -> np.ndarray:
+    """Store keys for a yfinance daily index, tz-aware (history) or naive (download) alike."""
+    if index.tz is not None:
+        index = index.tz_localize(None)  # wall-clock time at the exchange
+    return np.asarray(index.normalize().as_unit("s").asi8, dtype="<i8")
+
+class MarketStore:
+    """Per-ticker daily bars on disk. Thread-safe for writers within one process."""
+    def __init__(self, root: str = MARKET_STORE_DIR):
+        self.root = root
+        # Re-entrant: meta() may upgrade a legacy store while append() holds the lock
+        self._lock = threading.RLock()
+
+    def ticker_dir(self, ticker: str) -> str:
+        return os.path.join(self.root, re.sub(r"[^A-Za-z0-9._&^-]", "_", ticker.upper()))
+
+    def meta(self, ticker: str) -> dict:
+        try:
+            with open(os.path.join(self.ticker_dir(ticker), "meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"rows": 0, "last_ts": None, "fetched_at": 0.0, "ts_convention": TS_CONVENTION}
+        if meta.get("ts_convention") != TS_CONVENTION:
+            meta = self._upgrade_timestamps(ticker)
+        return meta
+
+    def _upgrade_timestamps(self, ticker: str) -> dict:
+        """
+        Stores written before TS_CONVENTION keyed bars by their raw UTC open, which
+        differed between the two fetch paths. Snaps every bar to the nearest UTC
+        midnight (its exchange date for any zone within ±12h) and keeps the last
+        row written for each date.
+        """
+        with self._lock:
+            base = self.ticker_dir(ticker)
+            with open(os.path.join(base, "meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("ts_convention") == TS_CONVENTION:
+                return meta
+            rows = meta["rows"]
+            cols = {name: np.fromfile(os.path.join(base, f"{name}.{dtype[1:]}"), dtype=dtype, count=rows)
+                    for name, dtype in COLUMNS}
+            days = (cols["ts"] + DAY_SECONDS // 2) // DAY_SECONDS * DAY_SECONDS
+            keep = np.append(days[1:] != days[:-1], True) if rows else np.zeros(0, dtype=bool)
+            cols["ts"] = days
+            for name, dtype in COLUMNS:
+                path = os.path.join(base, f"{name}.{dtype[1:]}")
+                np.asarray(cols[name][keep], dtype=dtype).tofile(f"{path}.tmp")
+                os.replace(f"{path}.tmp", path)
+            meta.update(rows=int(keep.sum()), last_ts=int(days[-1]) if rows else None, ts_convention=TS_CONVENTION)
+            self._write_meta(ticker, meta)
+        logger.info(f"Re-keyed {ticker} bars by exchange date ({rows} -> {meta['rows']} rows)")
+        return meta
+
+    def last_timestamp(self, ticker: str) -> Optional[int]:
+        return self.meta(ticker)["last_ts"]
+
+    def is_fresh(self, ticker: str, max_age_seconds: float) -> bool:
+        meta = self.meta(ticker)
+        return meta["rows"] > 0 and time.time() - meta["fetched_at"] < max_age_seconds
+
+    def read(self, ticker: str) -> Dict[str, np.ndarray]:
+        """Read-only memory-mapped columns ({} if the ticker has never been stored)."""
+        rows = self.meta(ticker)["rows"]
+        if rows == 0:
+            return {}
+        base = self.ticker_dir(ticker)
+        return {
+            name: np.memmap(os.path.join(base, f"{name}.{dtype[1:]}"), dtype=dtype, mode="r", shape=(rows,))
+            for name, dtype in COLUMNS
+        }
+
+    def latest_bar(self, ticker: str) -> Optional[dict]:
+        """The newest bar in the same shape `fetch_live_ohlcv` returns."""
+        cols = self.read(ticker)
+        if not cols:
+            return None
+        return {
+            "ticker": ticker,
+            "current_price": float(cols["close"][-1]),
+            "open": float(cols["open"][-1]),
+            "high": float(cols["high"][-1]),
+            "low": float(cols["low"][-1]),
+            "volume": int(cols["volume"][-1]),
+        }
+
+    def append(self, ticker: str, hist) -> int:
+        """
+        Merges a yfinance history frame into the store. Bars older than the last
+        stored one are ignored, a bar with the same timestamp replaces the last row
+        (today's bar keeps moving until the close) and newer bars are appended.
+        Returns the number of rows added.
+        """
+        hist = hist.dropna(subset=["Close"]) if "Close" in hist else hist.iloc[0:0]
+        with self._lock:
+            meta = self.meta(ticker)
+            meta["fetched_at"] = time.time()
+            if hist.empty:
+                self._write_meta(ticker, meta)
+                return 0
+
+            ts = bar_timestamps(hist.index)
+            values = {"ts": ts}
+            for name, frame_col in _FRAME_COLUMNS.items():
+                values[name] = hist[frame_col].to_numpy()
+
+            base = self.ticker_dir(ticker)
+            os.makedirs(base, exist_ok=True)
+            rows, last_ts = meta["rows"], meta["last_ts"]
+            self._truncate_uncommitted(base, rows)
+
+            if last_ts is not None:
+                same = np.flatnonzero(ts == last_ts)
+                if same.size:
+                    for name, dtype in COLUMNS:
+                        col = np.memmap(os.path.join(base, f"{name}.{dtype[1:]}"), dtype=dtype, mode="r+", shape=(rows,))
+                        col[-1] = values[name][same[-1]]
+                        col.flush()
+                        del col
+                newer = ts > last_ts
+            else:
+                newer = np.ones(len(ts), dtype=bool)
+
+            added = int(newer.sum())
+            if added:
+                for name, dtype in COLUMNS:
+                    with open(os.path.join(base, f"{name}.{dtype[1:]}"), "ab") as f:
+                        np.asarray(values[name][newer], dtype=dtype).tofile(f)
+                meta["rows"] = rows + added
+                meta["last_ts"] = int(ts[newer].max())
+
+            self._write_meta(ticker, meta)
+        logger.debug(f"Stored {added} new bars for {ticker} ({meta['rows']} total)")
+        return added
+
+    def _truncate_uncommitted(self, base: str, rows: int):
+        """Drops bytes past the committed row count left behind by an interrupted append."""
+        for name, dtype in COLUMNS:
+            path = os.path.join(base, f"{name}.{dtype[1:]}")
+            size = rows * np.dtype(dtype).itemsize
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+
+    def _write_meta(self, ticker: str, meta: dict):
+        base = self.ticker_dir(ticker)
+        os.makedirs(base, exist_ok=True)
+        tmp = os.path.join(base, "meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(base, "meta.json"))
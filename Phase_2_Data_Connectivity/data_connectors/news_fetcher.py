@@ -0,0 +1,146 @@
+"""
+Yahoo Finance headline fetching shared by the news MCP server and the
+sentiment scorer.
+
+Headlines are parsed with lxml (via BeautifulSoup), de-duplicated through a
+set of normalised-text hashes instead of list scans, and kept per ticker in an
+in-memory TTL cache. `iter_headlines` scrapes a whole watchlist concurrently
+with one bounded `httpx.AsyncClient` (still paced by the shared per-host token
+bucket) and yields each ticker as soon as its page is parsed.
+"""
+import os
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from bs4 import BeautifulSoup
+
+from data_connectors.http_client import DEFAULT_HEADERS, http_client
+
+logger = logging.getLogger("news_fetcher")
+
+NEWS_URL = "https://finance.yahoo.com/quote/{ticker}/news"
+NEWS_TTL_SECONDS = float(os.getenv("NEWS_TTL_SECONDS", "300"))
+NEWS_MAX_CONCURRENCY = int(os.getenv("NEWS_MAX_CONCURRENCY", "8"))
+NEWS_TIMEOUT_SECONDS = float(os.getenv("NEWS_TIMEOUT_SECONDS", "10"))
+MAX_HEADLINES = 5
+
+_cache = {}  # ticker -> (headlines, fetched_at)
+_cache_lock = threading.Lock()
+
+def _fingerprint(text: str) -> bytes:
+    return hashlib.blake2b(" ".join(text.casefold().split()).encode("utf-8"), digest_size=8).digest()
+
+def parse_headlines(html: str, limit: int = MAX_HEADLINES) -> List[str]:
+    """Unique headlines in page order: `h3.clamp` first, any long `h3` as a fallback."""
+    soup = BeautifulSoup(html, "lxml")
+    headlines, seen = [], set()
+
+    def collect(tags, min_length=1):
+        for h3 in tags:
+            text = h3.get_text(strip=True)
+            if len(text) < min_length:
+                continue
+            key = _fingerprint(text)
+            if key not in seen:
+                seen.add(key)
+                headlines.append(text)
+                if len(headlines) == limit:
+                    return
+
+    # Yahoo finance news headlines are usually in h3 tags with specific classes
+    collect(soup.find_all('h3', class_='clamp'))
+    if not headlines:
+        # Fallback for standard h3s if class changed
+        collect(soup.find_all('h3'), min_length=16)
+    return headlines
+
+def cached_headlines(ticker: str, ttl: float = NEWS_TTL_SECONDS) -> Optional[List[str]]:
+    with _cache_lock:
+        entry = _cache.get(ticker)
+    if entry is not None and time.time() - entry[1] < ttl:
+        return entry[0]
+    return None
+
+def _remember(ticker: str, headlines: List[str]):
+    with _cache_lock:
+        _cache[ticker] = (headlines, time.time())
+
+def invalidate(ticker: str = None):
+    with _cache_lock:
+        if ticker is None:
+            _cache.clear()
+        else:
+            _cache.pop(ticker, None)
+
+def fetch_headlines(ticker: str, ttl: float = NEWS_TTL_SECONDS) -> List[str]:
+    """Latest headlines for one ticker through the shared (pooled, cached) HTTP client."""
+    headlines = cached_headlines(ticker, ttl)
+    if headlines is None:
+        response = http_client.get(NEWS_URL.format(ticker=ticker), timeout=NEWS_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        headlines = parse_headlines(response.text)
+        _remember(ticker, headlines)
+    return headlines
+
+def format_news(ticker: str, headlines: List[str]) -> str:
+    """The text block handed to the LLM."""
+    if not headlines:
+        return f"No recent news found for {ticker}."
+    formatted_news = "\n".join([f"- {h}" for h in headlines])
+    return f"Latest Headlines for {ticker}:\n{formatted_news}"
+
+async def _scrape(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, ticker: str) -> Tuple[str, dict]:
+    url = NEWS_URL.format(ticker=ticker)
+    try:
+        async with semaphore:
+            # Same per-host pacing as the synchronous client
+            await asyncio.to_thread(http_client.bucket(urlsplit(url).hostname).acquire)
+            response = await client.get(url)
+            response.raise_for_status()
+        # Parsing is CPU-bound; keep it off the event loop
+        headlines = await asyncio.to_thread(parse_headlines, response.text)
+        _remember(ticker, headlines)
+        return ticker, {"headlines": headlines}
+    except Exception as e:
+        return ticker, {"error": f"Error scraping news for {ticker}: {str(e)}"}
+
+async def iter_headlines(tickers: Iterable[str], max_concurrency: int = NEWS_MAX_CONCURRENCY,
+                         ttl: float = NEWS_TTL_SECONDS,
+                         client: Optional[httpx.AsyncClient] = None) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Yields (ticker, {"headlines": [...]}) or (ticker, {"error": ...}) in
+    completion order. Cached tickers are yielded first without a request;
+    at most `max_concurrency` pages are in flight at once.
+    """
+    pending = []
+    for ticker in dict.fromkeys(tickers):
+        headlines = cached_headlines(ticker, ttl)
+        if headlines is not None:
+            yield ticker, {"headlines": headlines}
+        else:
+            pending.append(ticker)
+    if not pending:
+        return
+
+    owns_client = client is None
+    if owns_client:
+        client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS, timeout=NEWS_TIMEOUT_SECONDS, follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = [asyncio.create_task(_scrape(client, semaphore, ticker)) for ticker in pending]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+        if owns_client:
+            await client.aclose()
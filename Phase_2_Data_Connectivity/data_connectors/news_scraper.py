@@ -1,21 +1,23 @@
-import requests
-from bs4 import BeautifulSoup
 import logging
 
+from data_connectors.news_fetcher import fetch_headlines
+from data_connectors.sentiment_scorer import sentiment_scorer
+
 logger = logging.getLogger("news_scraper")
 
 def get_basic_sentiment(ticker: str) -> float:
     """
-    Dummy free-tier scraper for news sentiment.
-    In production, this would hit free endpoints like Yahoo Finance or Google News 
-    via BeautifulSoup to extract headlines and run a local lightweight NLP model 
-    (or basic keyword matching) to gauge fear/greed logic without paid API keys.
+    Free-tier news sentiment (-1.0 to 1.0) without paid API keys.
+    Scrapes the latest Yahoo Finance headlines (cached per ticker) and scores
+    them locally against bullish/bearish prototypes with the MiniLM model
+    already used by the RAG pipeline. Returns 0.0 (neutral) when no news can
+    be fetched.
     """
     logger.info(f"Scraping free news sources for {ticker}...")
-    
-    # Placeholder: Simulated network call
-    # response = requests.get(f"https://free-news-endpoint/{ticker}")
-    # soup = BeautifulSoup(response.content, 'html.parser')
-    
-    # Return a dummy sentiment score (-1.0 to 1.0)
-    return 0.25 
+
+    try:
+        headlines = fetch_headlines(ticker)
+    except Exception as e:
+        logger.error(f"News scrape failed for {ticker}: {str(e)}")
+        return 0.0
+    return sentiment_scorer.score_ticker(headlines)["score"]
@@ -0,0 +1,123 @@
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+logger = logging.getLogger("quote_cache")
+
+# Quotes move every few seconds while NSE is trading and not at all after the close
+QUOTE_TTL_MARKET_SECONDS = float(os.getenv("QUOTE_TTL_MARKET_SECONDS", "10"))
+QUOTE_TTL_CLOSED_SECONDS = float(os.getenv("QUOTE_TTL_CLOSED_SECONDS", "900"))
+# How long past its TTL an entry may still be served while a background refresh runs
+QUOTE_STALE_SECONDS = float(os.getenv("QUOTE_STALE_SECONDS", "60"))
+QUOTE_CACHE_SIZE = int(os.getenv("QUOTE_CACHE_SIZE", "2048"))
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+def market_is_open(now: float = None) -> bool:
+    """NSE cash session: Monday-Friday, 09:15-15:30 IST (exchange holidays are not modelled)."""
+    local = datetime.fromtimestamp(time.time() if now is None else now, IST)
+    minutes = local.hour * 60 + local.minute
+    return local.weekday() < 5 and 9 * 60 + 15 <= minutes < 15 * 60 + 30
+
+class QuoteCache:
+    """
+    In-memory LRU of latest quotes keyed by ticker.
+
+    Fresh entries are returned as-is. Entries past their TTL but within
+    `stale_seconds` are still returned immediately while one background refresh
+    per ticker reloads them (stale-while-revalidate). Anything older is a miss
+    and loads inline. Loader results carrying an "error" key are never cached.
+    """
+    def __init__(self, loader: Callable[[str], dict], maxsize: int = QUOTE_CACHE_SIZE,
+                 ttl_market: float = QUOTE_TTL_MARKET_SECONDS, ttl_closed: float = QUOTE_TTL_CLOSED_SECONDS,
+                 stale_seconds: float = QUOTE_STALE_SECONDS, clock: Callable[[], float] = time.time):
+        self.loader = loader
+        self.maxsize = maxsize
+        self.ttl_market = ttl_market
+        self.ttl_closed = ttl_closed
+        self.stale_seconds = stale_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # ticker -> (quote, stored_at)
+        self._refreshing = set()
+        self._refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="quote-refresh")
+        self.hits = self.stale_hits = self.misses = self.refreshes = self.evictions = 0
+
+    def ttl(self, now: float = None) -> float:
+        return self.ttl_market if market_is_open(self._clock() if now is None else now) else self.ttl_closed
+
+    def get(self, ticker: str) -> dict:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is not None:
+                quote, stored_at = entry
+                age, ttl = now - stored_at, self.ttl(now)
+                if age < ttl:
+                    self.hits += 1
+                    self._entries.move_to_end(ticker)
+                    return quote
+                if age < ttl + self.stale_seconds:
+                    self.stale_hits += 1
+                    self._entries.move_to_end(ticker)
+                    if ticker not in self._refreshing:
+                        self._refreshing.add(ticker)
+                        self._refresh_pool.submit(self._refresh, ticker)
+                    return quote
+            self.misses += 1
+        return self._load(ticker)
+
+    def _load(self, ticker: str) -> dict:
+        quote = self.loader(ticker)
+        if "error" not in quote:
+            with self._lock:
+                self._entries[ticker] = (quote, self._clock())
+                self._entries.move_to_end(ticker)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return quote
+
+    def _refresh(self, ticker: str):
+        try:
+            self._load(ticker)
+            with self._lock:
+                self.refreshes += 1
+        except Exception as e:
+            logger.warning(f"Background quote refresh failed for {ticker}: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(ticker)
+
+    def invalidate(self, ticker: str = None):
+        with self._lock:
+            if ticker is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(ticker, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def render_prometheus(self, prefix: str = "trade_today_quote_cache") -> str:
+        stats = self.stats()
+        lines = [f"# TYPE {prefix}_size gauge", f"{prefix}_size {stats['size']}"]
+        for name in ("hits", "stale_hits", "misses", "refreshes", "evictions"):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {stats[name]}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,258 @@
+"""
+Cross-ticker approximate nearest-neighbour index (IVF, NumPy only)
+──────────────────────────────────────────────────────────────────
+Unit vectors are partitioned into `nlist` cells by spherical k-means. A query
+scores the centroids, scans only the `nprobe` closest cells and ranks those
+candidates exactly, so cost grows with nprobe/nlist of the corpus instead of
+all of it. `nprobe` is the recall/latency knob: nprobe == nlist is exact.
+
+- Below `min_train` vectors the index stays untrained and searches by brute
+  force (cheap at that size); it trains itself once enough data arrives and
+  retrains when the corpus outgrows the trained size by `retrain_factor`.
+- `add()` is incremental: new vectors go to their nearest cell. Re-adding an
+  id with an unchanged vector is a no-op; a changed one tombstones its old
+  row, and tombstones are compacted away once they pass `ANN_COMPACT_RATIO`
+  of the rows.
+- `save()` / `load()` persist everything in one `.npz` (atomic replace).
+"""
+import os
+import math
+import logging
+import threading
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("rag_pipeline")
+
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "8"))
+ANN_MIN_TRAIN = int(os.getenv("ANN_MIN_TRAIN", "1024"))
+ANN_KMEANS_ITERS = 12
+ANN_TRAIN_SAMPLE = 65536
+# Dead (tombstoned) share of rows that triggers a compaction
+ANN_COMPACT_RATIO = float(os.getenv("ANN_COMPACT_RATIO", "0.25"))
+
+def _unit(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=-1, keepdims=True), 1e-10)
+
+def default_nlist(n: int) -> int:
+    """~2*sqrt(n) cells keeps both the centroid scan and the per-cell scans small."""
+    return max(1, int(2 * math.sqrt(n)))
+
+def spherical_kmeans(vectors: np.ndarray, nlist: int, iters: int = ANN_KMEANS_ITERS, seed: int = 0) -> np.ndarray:
+    """Unit centroids (nlist, dim) maximizing cosine similarity to their members."""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > ANN_TRAIN_SAMPLE:
+        vectors = vectors[rng.choice(len(vectors), ANN_TRAIN_SAMPLE, replace=False)]
+    nlist = min(nlist, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iters):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=nlist)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+        centroids[filled] = np.add.reduceat(vectors[order], starts, axis=0)
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            # Re-seed empty cells from random points so every cell stays useful
+            centroids[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+        centroids = _unit(centroids)
+    return centroids
+
+class IVFIndex:
+    def __init__(self, dim: int = 0, nprobe: int = ANN_NPROBE, min_train: int = ANN_MIN_TRAIN,
+                 retrain_factor: float = 4.0):
+        self.dim = dim
+        self.nprobe = nprobe
+        self.min_train = min_train
+        self.retrain_factor = retrain_factor
+        self._lock = threading.RLock()
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._size = 0                 # rows used in _vectors (alive or not)
+        self._dead = 0                 # tombstoned rows among them
+        self.ids: List[str] = []       # row -> chunk id
+        self.tickers: List[str] = []   # row -> ticker
+        self._row_of = {}              # chunk id -> live row
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[array] = []  # cell -> rows (int64)
+        self.trained_size = 0
+        self.dirty = False
+        self.path = None               # where the owner persists it
+        self.encoding = "float32"      # storage encoding of the vectors it was built from
+
+    def __len__(self):
+        return len(self._row_of)
+
+    @property
+    def nlist(self) -> int:
+        return 0 if self.centroids is None else len(self.centroids)
+
+    def _reserve(self, extra: int):
+        needed = self._size + extra
+        if needed > len(self._vectors):
+            capacity = max(needed, 2 * len(self._vectors), 1024)
+            vectors = np.empty((capacity, self.dim), dtype=np.float32)
+            vectors[:self._size] = self._vectors[:self._size]
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:self._size] = self._alive[:self._size]
+            self._vectors, self._alive = vectors, alive
+
+    def add(self, ids: Sequence[str], tickers: Sequence[str], vectors: np.ndarray):
+        """Inserts (or replaces, by chunk id) vectors; trains, retrains or compacts when due."""
+        vectors = _unit(np.atleast_2d(vectors))
+        if not len(vectors):
+            return
+        with self._lock:
+            if not self.dim:
+                self.dim = vectors.shape[1]
+                self._vectors = np.empty((0, self.dim), dtype=np.float32)
+            # Re-ingesting unchanged fundamentals re-adds identical vectors: keep the existing rows
+            old_rows = [self._row_of.get(chunk_id, -1) for chunk_id in ids]
+            keep = [r < 0 or not np.array_equal(self._vectors[r], v) for r, v in zip(old_rows, vectors)]
+            if not all(keep):
+                ids = [i for i, k in zip(ids, keep) if k]
+                tickers = [t for t, k in zip(tickers, keep) if k]
+                vectors = vectors[np.asarray(keep)]
+                if not len(vectors):
+                    return
+            self._reserve(len(vectors))
+            rows = np.arange(self._size, self._size + len(vectors))
+            self._vectors[rows] = vectors
+            self._alive[rows] = True
+            for chunk_id, row in zip(ids, rows.tolist()):
+                old = self._row_of.get(chunk_id)
+                if old is not None:
+                    self._alive[old] = False
+                    self._dead += 1
+                self._row_of[chunk_id] = row
+            self.ids.extend(ids)
+            self.tickers.extend(tickers)
+            self._size += len(vectors)
+            self.dirty = True
+
+            if self.centroids is None:
+                if len(self) >= self.min_train:
+                    self.train()
+            elif len(self) > self.retrain_factor * self.trained_size:
+                self.train()
+            else:
+                cells = np.argmax(vectors @ self.centroids.T, axis=1)
+                for row, cell in zip(rows.tolist(), cells.tolist()):
+                    self._lists[cell].append(row)
+            if self._dead > ANN_COMPACT_RATIO * self._size:
+                self.compact()
+
+    def compact(self):
+        """Drops tombstoned rows, keeping the trained cells (rows are renumbered)."""
+        with self._lock:
+            live = np.flatnonzero(self._alive[:self._size])
+            self.ids = [self.ids[r] for r in live.tolist()]
+            self.tickers = [self.tickers[r] for r in live.tolist()]
+            if self.centroids is not None:
+                renumber = np.full(self._size, -1, dtype=np.int64)
+                renumber[live] = np.arange(len(live))
+                for cell, rows in enumerate(self._lists):
+                    moved = renumber[np.frombuffer(rows, dtype=np.int64)]
+                    self._lists[cell] = array("q", moved[moved >= 0].tobytes())
+            self._vectors = np.ascontiguousarray(self._vectors[live])
+            self._alive, self._size, self._dead = np.ones(len(live), dtype=bool), len(live), 0
+            self._row_of = {chunk_id: row for row, chunk_id in enumerate(self.ids)}
+            self.dirty = True
+
+    def train(self, nlist: int = None):
+        """(Re)builds the cells over all live vectors, compacting tombstoned rows away."""
+        with self._lock:
+            self.centroids, self._lists = None, []
+            self.compact()
+            vectors = self._vectors
+            if not len(vectors):
+                self.centroids, self._lists, self.trained_size = None, [], 0
+                return
+            self.centroids = spherical_kmeans(vectors, nlist or default_nlist(len(vectors)))
+            cells = np.argmax(vectors @ self.centroids.T, axis=1)
+            self._lists = [array("q") for _ in range(len(self.centroids))]
+            for row, cell in enumerate(cells.tolist()):
+                self._lists[cell].append(row)
+            self.trained_size = len(vectors)
+            self.dirty = True
+            logger.info(f"ANN index trained: {len(vectors)} vectors in {len(self.centroids)} cells.")
+
+    def _rank(self, candidates: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[str, str, float]]:
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.ids[r], self.tickers[r], float(s))
+                for r, s in zip(candidates[top].tolist(), scores[top].tolist())]
+
+    def _exact(self, query: np.ndarray, k: int) -> List[Tuple[str, str, float]]:
+        # One contiguous matvec over every row; tombstones are dropped afterwards
+        live = np.flatnonzero(self._alive[:self._size])
+        scores = (self._vectors[:self._size] @ query)[live]
+        return self._rank(live, scores, k)
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: int = None) -> List[Tuple[str, str, float]]:
+        """[(chunk_id, ticker, cosine)] of the approximate top-k, best first."""
+        query = _unit(query).reshape(-1)
+        with self._lock:
+            probe = min(nprobe or self.nprobe, self.nlist)
+            if self.centroids is None or probe == self.nlist:
+                return self._exact(query, k)
+            cells = np.argpartition(-(self.centroids @ query), probe - 1)[:probe]
+            candidates = np.concatenate([np.frombuffer(self._lists[c], dtype=np.int64) for c in cells])
+            candidates = candidates[self._alive[candidates]]
+            return self._rank(candidates, self._vectors[candidates] @ query, k)
+
+    def exact_search(self, query: np.ndarray, k: int = 10) -> List[Tuple[str, str, float]]:
+        """Brute force over every live vector (ground truth for recall measurements)."""
+        query = _unit(query).reshape(-1)
+        with self._lock:
+            return self._exact(query, k)
+
+    def save(self, path: str):
+        with self._lock:
+            live = self._alive[:self._size]
+            cell_of = np.full(self._size, -1, dtype=np.int64)
+            for cell, rows in enumerate(self._lists):
+                cell_of[np.frombuffer(rows, dtype=np.int64)] = cell
+            # Unique per writer: batch_scan process workers may save the same index concurrently
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+            np.savez(
+                tmp,
+                vectors=self._vectors[:self._size][live],
+                ids=np.array(self.ids, dtype=str)[live],
+                tickers=np.array(self.tickers, dtype=str)[live],
+                cells=cell_of[live],
+                centroids=self.centroids if self.centroids is not None else np.empty((0, self.dim), dtype=np.float32),
+                meta=np.array([self.dim, self.nprobe, self.min_train, self.trained_size], dtype=np.int64),
+                encoding=np.array(self.encoding),
+            )
+            os.replace(tmp, path)
+            self.dirty = False
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        with np.load(path, allow_pickle=False) as data:
+            dim, nprobe, min_train, trained_size = data["meta"].tolist()
+            index = cls(dim=dim, nprobe=nprobe, min_train=min_train)
+            if "encoding" in data.files:
+                index.encoding = str(data["encoding"])
+            vectors = data["vectors"]
+            index._vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            index._alive = np.ones(len(vectors), dtype=bool)
+            index._size = len(vectors)
+            index.ids = data["ids"].tolist()
+            index.tickers = data["tickers"].tolist()
+            index._row_of = {chunk_id: row for row, chunk_id in enumerate(index.ids)}
+            if len(data["centroids"]):
+                index.centroids = data["centroids"]
+                index._lists = [array("q") for _ in range(len(index.centroids))]
+                for row, cell in enumerate(data["cells"].tolist()):
+                    index._lists[cell].append(row)
+                index.trained_size = trained_size
+        return index
@@ -3,17 +3,34 @@ RAG Pipeline: Pure-Python Vector Store (No C++ required)
 ─────────────────────────────────────────────────────────
 Architecture:
   - Embeddings: SentenceTransformers 'all-MiniLM-L6-v2' (CPU-friendly, free)
-  - Vector Store: Local SQLite with numpy cosine similarity (no ChromaDB/faiss needed)
+  - Vector Store: Local SQLite (WAL, batched upserts) with numpy cosine similarity
+                  over cached per-ticker matrices (no ChromaDB/faiss needed)
   - Data Source: yfinance live financial metadata + Yahoo Finance summaries
 """
 import os
 import sys
 import json
-import sqlite3
+import time
+import atexit
+import hashlib
+import asyncio
 import logging
+import threading
 import numpy as np
-import yfinance as yf
-from sentence_transformers import SentenceTransformer
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
+
+# Inject Phase 4 path so we can record latency metrics (and Phase 2 for standalone runs)
+_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+for _phase in ("Phase_2_Data_Connectivity", "Phase_4_Risk_And_Observability"):
+    _phase_path = os.path.join(_root, _phase)
+    if _phase_path not in sys.path:
+        sys.path.insert(0, _phase_path)
+
+from core.metrics import track_latency
+from data_connectors.rag_pipeline.vector_store import VectorStore
+from data_connectors.rag_pipeline.ann_index import IVFIndex
+from data_connectors.rag_pipeline.query_cache import QueryEmbeddingCache
 
 logger = logging.getLogger("rag_pipeline")
 
@@ -23,116 +40,222 @@ logger = logging.getLogger("rag_pipeline")
 _BASE = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(_BASE, "vector_store.db")
 
+# Cross-ticker ANN index is saved at most this often during ingest (and at exit)
+ANN_FLUSH_SECONDS = float(os.getenv("ANN_FLUSH_SECONDS", "30"))
+
+# Parallel yfinance `.info` calls during bulk ingest
+INGEST_MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "8"))
+
 # ─────────────────────────────────────────────
 # Model (loaded once)
 # ─────────────────────────────────────────────
+EMBED_MODEL_NAME = "all-MiniLM-L6-v2"
 _EMBED_MODEL = None
 
 def _get_embed_model():
     global _EMBED_MODEL
     if _EMBED_MODEL is None:
-        logger.info("Loading SentenceTransformer (all-MiniLM-L6-v2)...")
-        _EMBED_MODEL = SentenceTransformer("all-MiniLM-L6-v2")
+        # Deferred: sentence_transformers pulls in torch, which dominates cold start
+        from sentence_transformers import SentenceTransformer
+        logger.info(f"Loading SentenceTransformer ({EMBED_MODEL_NAME})...")
+        _EMBED_MODEL = SentenceTransformer(EMBED_MODEL_NAME)
     return _EMBED_MODEL
 
+def _encode_queries(queries: List[str]) -> np.ndarray:
+    with track_latency(service="embedding", operation="encode_query"):
+        return _get_embed_model().encode(queries)
+
+# Agents query with a few fixed strings (e.g. fa_agent.FA_RAG_QUERY); see warm_up()
+query_cache = QueryEmbeddingCache(_encode_queries)
+
+def prewarm_query_cache(queries: Iterable[str]) -> int:
+    """Embeds the standard agent queries ahead of traffic; returns how many were new."""
+    return query_cache.prewarm(queries)
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(f"{EMBED_MODEL_NAME}\0{text}".encode("utf-8")).hexdigest()
+
+def _encode_chunks(chunks: List[str]) -> np.ndarray:
+    """
+    Embeddings for `chunks`, encoding only texts never seen before. Results are
+    keyed by sha256(model name, text) in the store's `embedding_cache` table,
+    so unchanged summaries and ratios are never re-encoded across runs.
+    """
+    store = _get_store()
+    hashes = [_content_hash(text) for text in chunks]
+    cached = store.cached_embeddings(list(set(hashes)))
+    missing = list(dict.fromkeys(h for h in hashes if h not in cached))
+    if missing:
+        texts = {h: text for h, text in zip(hashes, chunks)}
+        with track_latency(service="embedding", operation="encode_chunks"):
+            fresh = _get_embed_model().encode([texts[h] for h in missing])
+        store.cache_embeddings(zip(missing, fresh))
+        cached.update(zip(missing, np.asarray(fresh, dtype=np.float32)))
+    logger.debug(f"Encoded {len(missing)}/{len(chunks)} chunks; the rest came from the embedding cache.")
+    return np.stack([cached[h] for h in hashes]) if chunks else np.empty((0, 0), dtype=np.float32)
+
 # ─────────────────────────────────────────────
-# SQLite Vector Store helpers
-# ─────────────────────────────────────────────
-def _init_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS embeddings (
-            id TEXT PRIMARY KEY,
-            ticker TEXT,
-            chunk_text TEXT,
-            embedding BLOB
-        )
-    """)
-    conn.commit()
-    conn.close()
-
-def _upsert_chunk(chunk_id: str, ticker: str, text: str, embedding: np.ndarray):
-    conn = sqlite3.connect(DB_PATH)
-    embedding_bytes = embedding.astype(np.float32).tobytes()
-    conn.execute(
-        "INSERT OR REPLACE INTO embeddings (id, ticker, chunk_text, embedding) VALUES (?, ?, ?, ?)",
-        (chunk_id, ticker, text, embedding_bytes)
-    )
-    conn.commit()
-    conn.close()
-
-def _fetch_all_for_ticker(ticker: str):
-    conn = sqlite3.connect(DB_PATH)
-    rows = conn.execute(
-        "SELECT id, chunk_text, embedding FROM embeddings WHERE ticker = ?", (ticker,)
-    ).fetchall()
-    conn.close()
-    
-    results = []
-    for row_id, text, emb_bytes in rows:
-        emb = np.frombuffer(emb_bytes, dtype=np.float32)
-        results.append((row_id, text, emb))
-    return results
+# SQLite Vector Store (one long-lived connection per DB_PATH)
+# ─────────────────────────────────────────────
+_STORE = None
+_store_lock = threading.Lock()
+
+def _get_store() -> VectorStore:
+    global _STORE
+    with _store_lock:
+        if _STORE is None or _STORE.db_path != DB_PATH:
+            _STORE = VectorStore(DB_PATH)
+        return _STORE
+
+def _ann_index_path() -> str:
+    """Persisted next to the SQLite file: vector_store.db -> vector_store.ivf.npz"""
+    return os.path.splitext(DB_PATH)[0] + ".ivf.npz"
+
+# ─────────────────────────────────────────────
+# Cross-ticker ANN index (persisted next to DB_PATH)
+# ─────────────────────────────────────────────
+# Loading/building, inserting and saving all run on one background thread, so
+# ingest (and the FA request behind it) never waits on k-means or an npz write.
+# Work is applied in submission order; `search_fundamentals` waits for it.
+_ANN = None
+_ann_saved_at = 0.0
+_ann_lock = threading.Lock()
+_ann_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ann-index")
+
+def _get_ann_index() -> IVFIndex:
+    """
+    Loads the persisted index, rebuilding it from SQLite if it is missing or out
+    of sync: a different chunk count, or built from another storage encoding
+    (e.g. before migrate_vector_store.py).
+    """
+    global _ANN, _ann_saved_at
+    with _ann_lock:
+        path = _ann_index_path()
+        if _ANN is not None and _ANN.path == path:
+            return _ANN
+        store = _get_store()
+        index = None
+        if os.path.exists(path):
+            try:
+                index = IVFIndex.load(path)
+            except Exception as e:
+                logger.warning(f"Could not load ANN index ({str(e)}); rebuilding.")
+        if index is None or len(index) != store.count() or index.encoding != store.dtype:
+            logger.info("Building cross-ticker ANN index from the vector store...")
+            index = IVFIndex()
+            index.encoding = store.dtype
+            ids, tickers, vectors = store.all_vectors()
+            index.add(ids, tickers, vectors)
+        index.path = path
+        _ANN, _ann_saved_at = index, time.time()
+        return _ANN
+
+def _apply_ann_update(ids: List[str], tickers: List[str], embeddings: np.ndarray):
+    try:
+        _get_ann_index().add(ids, tickers, embeddings)
+        if time.time() - _ann_saved_at >= ANN_FLUSH_SECONDS:
+            _save_ann_index()
+    except Exception as e:
+        logger.warning(f"ANN index update failed: {str(e)}")
+
+def _index_chunks(ids: List[str], tickers: List[str], embeddings: np.ndarray):
+    """
+    Queues an incremental ANN insert; a failure here never fails the (already committed) ingest.
+    The index gets the vectors as the store holds them, so an unchanged chunk of
+    a quantized store matches its indexed row exactly and is skipped.
+    """
+    try:
+        _ann_worker.submit(_apply_ann_update, list(ids), list(tickers), _get_store().as_stored(embeddings))
+    except RuntimeError:
+        # Interpreter shutdown: the index is rebuilt from SQLite on next load
+        pass
+
+def _save_ann_index():
+    global _ann_saved_at
+    index = _ANN
+    if index is not None and index.dirty:
+        try:
+            index.save(index.path)
+            _ann_saved_at = time.time()
+        except Exception as e:
+            logger.warning(f"Could not save ANN index to {index.path}: {str(e)}")
+
+def load_ann_index():
+    """Loads (or builds) the ANN index in the background, e.g. from warm_up()."""
+    return _ann_worker.submit(_get_ann_index)
+
+def flush_ann_index():
+    """Applies queued ANN inserts and writes the index to disk if it changed since the last save."""
+    try:
+        _ann_worker.submit(_save_ann_index).result()
+    except RuntimeError:
+        # Worker already shut down (interpreter exit): its queue has been drained
+        _save_ann_index()
 
-def _cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
-    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-10))
+atexit.register(flush_ann_index)
 
 # ─────────────────────────────────────────────
 # Ingest
 # ─────────────────────────────────────────────
+def _fetch_info(ticker: str) -> dict:
+    import yfinance as yf
+    with track_latency(service="yfinance", operation="info"):
+        return yf.Ticker(ticker).info
+
+def _build_chunks(ticker: str, info: dict) -> list:
+    """Text chunks describing one company, from its yfinance `.info` dict."""
+    name = info.get("longName", ticker)
+    sector = info.get("sector", "N/A")
+    industry = info.get("industry", "N/A")
+    market_cap = info.get("marketCap", "N/A")
+    pe_ratio = info.get("trailingPE", "N/A")
+    pb_ratio = info.get("priceToBook", "N/A")
+    eps = info.get("trailingEps", "N/A")
+    revenue = info.get("totalRevenue", "N/A")
+    profit_margin = info.get("profitMargins", "N/A")
+    debt_equity = info.get("debtToEquity", "N/A")
+    roe = info.get("returnOnEquity", "N/A")
+    dividend_yield = info.get("dividendYield", "N/A")
+    beta = info.get("beta", "N/A")
+    week52_high = info.get("fiftyTwoWeekHigh", "N/A")
+    week52_low = info.get("fiftyTwoWeekLow", "N/A")
+    analyst_target = info.get("targetMeanPrice", "N/A")
+    recommendation = info.get("recommendationKey", "N/A")
+    business_summary = info.get("longBusinessSummary", "")
+    
+    chunks = [
+        f"{name} ({ticker}) operates in the {sector} sector ({industry}). "
+        f"Market Cap: {market_cap}. Beta: {beta}. "
+        f"52-week range: {week52_low} to {week52_high}.",
+        
+        f"{name} valuation: P/E Ratio: {pe_ratio}, "
+        f"Price-to-Book: {pb_ratio}, EPS: {eps}. "
+        f"Analyst target price: {analyst_target}. Recommendation: {recommendation}.",
+        
+        f"{name} financial health: Revenue: {revenue}, "
+        f"Profit Margin: {profit_margin}, Debt-to-Equity: {debt_equity}, "
+        f"ROE: {roe}, Dividend Yield: {dividend_yield}.",
+    ]
+    
+    if business_summary:
+        chunks.append(f"{name} business overview: {business_summary[:1200]}")
+    return chunks
+
 def ingest_stock_fundamentals(ticker: str) -> dict:
     """
     Pulls live financial data from yfinance, creates text chunks,
     embeds with SentenceTransformers and stores in local SQLite.
     """
     logger.info(f"Ingesting fundamental data for {ticker} into Vector Store...")
-    _init_db()
     
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        
-        name = info.get("longName", ticker)
-        sector = info.get("sector", "N/A")
-        industry = info.get("industry", "N/A")
-        market_cap = info.get("marketCap", "N/A")
-        pe_ratio = info.get("trailingPE", "N/A")
-        pb_ratio = info.get("priceToBook", "N/A")
-        eps = info.get("trailingEps", "N/A")
-        revenue = info.get("totalRevenue", "N/A")
-        profit_margin = info.get("profitMargins", "N/A")
-        debt_equity = info.get("debtToEquity", "N/A")
-        roe = info.get("returnOnEquity", "N/A")
-        dividend_yield = info.get("dividendYield", "N/A")
-        beta = info.get("beta", "N/A")
-        week52_high = info.get("fiftyTwoWeekHigh", "N/A")
-        week52_low = info.get("fiftyTwoWeekLow", "N/A")
-        analyst_target = info.get("targetMeanPrice", "N/A")
-        recommendation = info.get("recommendationKey", "N/A")
-        business_summary = info.get("longBusinessSummary", "")
+        chunks = _build_chunks(ticker, _fetch_info(ticker))
+        embeddings = _encode_chunks(chunks)
         
-        chunks = [
-            f"{name} ({ticker}) operates in the {sector} sector ({industry}). "
-            f"Market Cap: {market_cap}. Beta: {beta}. "
-            f"52-week range: {week52_low} to {week52_high}.",
-            
-            f"{name} valuation: P/E Ratio: {pe_ratio}, "
-            f"Price-to-Book: {pb_ratio}, EPS: {eps}. "
-            f"Analyst target price: {analyst_target}. Recommendation: {recommendation}.",
-            
-            f"{name} financial health: Revenue: {revenue}, "
-            f"Profit Margin: {profit_margin}, Debt-to-Equity: {debt_equity}, "
-            f"ROE: {roe}, Dividend Yield: {dividend_yield}.",
-        ]
-        
-        if business_summary:
-            chunks.append(f"{name} business overview: {business_summary[:1200]}")
-        
-        model = _get_embed_model()
-        embeddings = model.encode(chunks)
-        
-        for i, (text, embedding) in enumerate(zip(chunks, embeddings)):
-            _upsert_chunk(f"{ticker}_chunk_{i}", ticker, text, embedding)
+        # All chunks for the ticker land in one transaction
+        with track_latency(service="sqlite", operation="vector_upsert"):
+            _get_store().upsert_chunks(ticker, chunks, embeddings)
+        _index_chunks([f"{ticker}_chunk_{i}" for i in range(len(chunks))], [ticker] * len(chunks), embeddings)
         
         logger.info(f"Ingested {len(chunks)} chunks for {ticker}.")
         return {"status": "success", "chunks_processed": len(chunks)}
@@ -141,6 +264,50 @@ def ingest_stock_fundamentals(ticker: str) -> dict:
         logger.error(f"Ingest failed for {ticker}: {str(e)}")
         return {"status": "error", "error": str(e)}
 
+def ingest_many_fundamentals(tickers: Iterable[str], max_workers: int = INGEST_MAX_WORKERS) -> Dict[str, dict]:
+    """
+    Bulk ingest: `.info` is fetched for all tickers in parallel, every chunk is
+    embedded in one batch and everything is written in a single transaction.
+    Returns {ticker: result} with the same shape as `ingest_stock_fundamentals`.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    logger.info(f"Bulk ingesting fundamental data for {len(tickers)} tickers...")
+    results, chunks_by_ticker = {}, {}
+
+    def build(ticker):
+        try:
+            return ticker, _build_chunks(ticker, _fetch_info(ticker)), None
+        except Exception as e:
+            return ticker, None, e
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as pool:
+        for ticker, chunks, error in pool.map(build, tickers):
+            if error is not None:
+                logger.error(f"Ingest failed for {ticker}: {str(error)}")
+                results[ticker] = {"status": "error", "error": str(error)}
+            else:
+                chunks_by_ticker[ticker] = chunks
+
+    if chunks_by_ticker:
+        flat = [(t, i, text) for t, chunks in chunks_by_ticker.items() for i, text in enumerate(chunks)]
+        try:
+            embeddings = _encode_chunks([text for _, _, text in flat])
+            with track_latency(service="sqlite", operation="vector_upsert"):
+                _get_store().upsert_many(
+                    (f"{t}_chunk_{i}", t, text, emb) for (t, i, text), emb in zip(flat, embeddings)
+                )
+            _index_chunks([f"{t}_chunk_{i}" for t, i, _ in flat], [t for t, _, _ in flat], embeddings)
+            flush_ann_index()
+            for ticker, chunks in chunks_by_ticker.items():
+                results[ticker] = {"status": "success", "chunks_processed": len(chunks)}
+        except Exception as e:
+            logger.error(f"Bulk ingest failed: {str(e)}")
+            for ticker in chunks_by_ticker:
+                results[ticker] = {"status": "error", "error": str(e)}
+
+    logger.info(f"Bulk ingested {sum(r['status'] == 'success' for r in results.values())}/{len(tickers)} tickers.")
+    return {t: results[t] for t in tickers}
+
 # ─────────────────────────────────────────────
 # Retrieve: Semantic Search
 # ─────────────────────────────────────────────
@@ -150,36 +317,62 @@ def query_fundamentals(ticker: str, query: str, n_results: int = 3) -> str:
     chunks from the local SQLite vector store for the given ticker.
     """
     logger.info(f"RAG Query for [{ticker}]: '{query}'")
-    _init_db()
     
     try:
-        rows = _fetch_all_for_ticker(ticker)
-        
-        if not rows:
+        store = _get_store()
+        if not store.load(ticker).texts:
             logger.warning(f"No stored data for {ticker}. Triggering auto-ingest...")
             ingest_stock_fundamentals(ticker)
-            rows = _fetch_all_for_ticker(ticker)
             
-        if not rows:
+        if not store.load(ticker).texts:
             return f"No fundamental data available for {ticker}."
         
-        model = _get_embed_model()
-        query_embedding = model.encode([query])[0]
-        
-        # Rank by cosine similarity
-        scored = [
-            (text, _cosine_similarity(query_embedding, emb))
-            for _, text, emb in rows
-        ]
-        scored.sort(key=lambda x: x[1], reverse=True)
+        query_embedding = query_cache.get(query)
         
-        top_chunks = [text for text, _ in scored[:n_results]]
+        # Rank by cosine similarity: one matvec over the cached unit-row matrix + argpartition
+        top_chunks = [text for text, _ in store.top_k(ticker, query_embedding, n_results)]
         return "\n\n".join(top_chunks)
         
     except Exception as e:
         logger.error(f"RAG query failed: {str(e)}")
         return f"RAG retrieval error: {str(e)}"
 
+def search_fundamentals(query: str, k: int = 10, nprobe: int = None) -> List[dict]:
+    """
+    Cross-ticker semantic search ("which companies mention capacity expansion
+    in specialty chemicals") over the ANN index. `nprobe` trades recall for
+    latency (default `ANN_NPROBE`). Returns [{"ticker", "chunk_id", "text", "score"}].
+    """
+    query_embedding = query_cache.get(query)
+    # Fetched through the worker so inserts queued before this call are visible
+    index = _ann_worker.submit(_get_ann_index).result()
+    with track_latency(service="ann", operation="search"):
+        hits = index.search(query_embedding, k=k, nprobe=nprobe)
+    texts = _get_store().texts([chunk_id for chunk_id, _, _ in hits])
+    return [
+        {"ticker": ticker, "chunk_id": chunk_id, "text": texts.get(chunk_id, ""), "score": round(score, 4)}
+        for chunk_id, ticker, score in hits
+    ]
+
+# ─────────────────────────────────────────────
+# Async wrappers (yfinance, SentenceTransformer and sqlite3 all block)
+# ─────────────────────────────────────────────
+async def aingest_stock_fundamentals(ticker: str) -> dict:
+    """Runs `ingest_stock_fundamentals` in the default executor."""
+    return await asyncio.to_thread(ingest_stock_fundamentals, ticker)
+
+async def aingest_many_fundamentals(tickers: Iterable[str]) -> Dict[str, dict]:
+    """Runs `ingest_many_fundamentals` in the default executor."""
+    return await asyncio.to_thread(ingest_many_fundamentals, tickers)
+
+async def asearch_fundamentals(query: str, k: int = 10, nprobe: int = None) -> List[dict]:
+    """Runs `search_fundamentals` in the default executor."""
+    return await asyncio.to_thread(search_fundamentals, query, k, nprobe)
+
+async def aquery_fundamentals(ticker: str, query: str, n_results: int = 3) -> str:
+    """Runs `query_fundamentals` in the default executor."""
+    return await asyncio.to_thread(query_fundamentals, ticker, query, n_results)
+
 # ─────────────────────────────────────────────
 # Standalone test
 # ─────────────────────────────────────────────
@@ -0,0 +1,85 @@
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, List
+
+import numpy as np
+
+logger = logging.getLogger("rag_pipeline")
+
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+
+class QueryEmbeddingCache:
+    """
+    In-memory LRU of query embeddings keyed by the exact query string.
+
+    Agents retrieve with a handful of fixed query strings, so after the first
+    call per query the encoder forward pass is skipped entirely. `encoder`
+    maps a list of texts to an (n, dim) array; cached vectors are float32 and
+    read-only because the same array is handed to every caller.
+    """
+    def __init__(self, encoder: Callable[[List[str]], np.ndarray], maxsize: int = QUERY_CACHE_SIZE):
+        self.encoder = encoder
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # query -> embedding
+        self.hits = self.misses = self.evictions = 0
+
+    def _store(self, query: str, embedding: np.ndarray) -> np.ndarray:
+        embedding = np.array(embedding, dtype=np.float32)
+        embedding.flags.writeable = False
+        with self._lock:
+            self._entries[query] = embedding
+            self._entries.move_to_end(query)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return embedding
+
+    def get(self, query: str) -> np.ndarray:
+        with self._lock:
+            embedding = self._entries.get(query)
+            if embedding is not None:
+                self.hits += 1
+                self._entries.move_to_end(query)
+                return embedding
+            self.misses += 1
+        # Encoded outside the lock; two threads missing on the same query both encode, harmlessly
+        return self._store(query, self.encoder([query])[0])
+
+    def prewarm(self, queries: Iterable[str]) -> int:
+        """Encodes the not-yet-cached `queries` in one batch; returns how many were added."""
+        with self._lock:
+            missing = [q for q in dict.fromkeys(queries) if q not in self._entries]
+        if missing:
+            for query, embedding in zip(missing, self.encoder(missing)):
+                self._store(query, embedding)
+            logger.info(f"Query embedding cache pre-warmed with {len(missing)} queries.")
+        return len(missing)
+
+    def invalidate(self, query: str = None):
+        with self._lock:
+            if query is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(query, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def render_prometheus(self, prefix: str = "trade_today_query_cache") -> str:
+        stats = self.stats()
+        lines = [f"# TYPE {prefix}_size gauge", f"{prefix}_size {stats['size']}"]
+        for name in ("hits", "misses", "evictions"):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {stats[name]}")
+        return "\n".join(lines) + "\n"
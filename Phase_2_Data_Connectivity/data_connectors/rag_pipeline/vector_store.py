@@ -0,0 +1,296 @@
+"""
+SQLite-backed vector store for the RAG pipeline.
+
+One long-lived connection per database file (WAL journal, NORMAL sync), so
+ingest and query no longer reconnect per call. All of a ticker's chunks are
+written with `executemany` inside a single transaction, and `upsert_many`
+does the same for any number of tickers at once. The `ticker` column is
+indexed, so per-ticker reads no longer scan the whole table.
+
+Embeddings are L2-normalized on write. Each ticker's chunks are loaded once
+into a contiguous float32 matrix kept in an LRU (dropped whenever that
+ticker is upserted), so ranking is one matrix-vector product plus an
+`argpartition` top-k.
+
+`embedding_cache` maps a content hash (model name + chunk text) to its raw
+embedding, so re-ingesting unchanged fundamentals skips the encoder. It is
+always float32, whatever the store's encoding: cached vectors are re-encoded
+on every upsert, and quantizing them too would quantize twice.
+
+Blobs are float32 by default. A store can instead hold float16 (half the
+size) or int8 with one float32 scale per vector (about a quarter); the
+choice is recorded in `store_meta` when the file is created and existing
+files are converted with `convert()` / migrate_vector_store.py (which leave
+the embedding cache untouched). Quantized
+blobs are decoded for a whole ticker (or table) at once into the same
+float32 unit-row matrices, so ranking code is unchanged.
+"""
+import os
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("rag_pipeline")
+
+# Per-ticker matrices kept in memory (a ticker's fundamentals are a few KB)
+VECTOR_CACHE_TICKERS = int(os.getenv("VECTOR_CACHE_TICKERS", "512"))
+
+# Blob encoding for new stores: "float32", "float16" or "int8" (per-vector scale)
+VECTOR_STORE_DTYPE = os.getenv("VECTOR_STORE_DTYPE", "float32")
+EMBEDDING_DTYPES = ("float32", "float16", "int8")
+
+# (chunk_id, ticker, chunk_text, embedding)
+ChunkRow = Tuple[str, str, str, np.ndarray]
+
+# Encoder outputs are cached at full precision (see the module docstring)
+_CACHE_DTYPE = "float32"
+
+# Keeps `IN (...)` lists under SQLite's host-parameter limit on older builds
+_MAX_SQL_PARAMS = 500
+
+class TickerMatrix(NamedTuple):
+    ids: List[str]
+    texts: List[str]
+    vectors: np.ndarray  # (n_chunks, dim) float32, unit rows
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-10)
+
+def rank_top_k(vectors: np.ndarray, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(row indices, cosine scores) of the `k` best unit rows for `query`, best first."""
+    scores = vectors @ normalize_rows(query)
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+    top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return top, scores[top]
+
+def encode_embeddings(matrix: np.ndarray, dtype: str) -> List[bytes]:
+    """One blob per row. int8 rows are `<f4 scale><int8 * dim>` with value = q * scale."""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    if dtype == "float32":
+        return [row.tobytes() for row in matrix]
+    if dtype == "float16":
+        return [row.tobytes() for row in matrix.astype(np.float16)]
+    # Each row uses the full int8 range: scale = max|v| / 127
+    scales = np.maximum(np.abs(matrix).max(axis=1, initial=0.0), 1e-12) / 127.0
+    quantized = np.rint(matrix / scales[:, None]).astype(np.int8)
+    return [scale.tobytes() + row.tobytes() for scale, row in zip(scales.astype(np.float32), quantized)]
+
+def decode_embeddings(blobs: List[bytes], dtype: str) -> np.ndarray:
+    """(n, dim) float32 matrix from same-length blobs, decoded in one vectorized pass."""
+    if not blobs:
+        return np.empty((0, 0), dtype=np.float32)
+    data = b"".join(blobs)
+    if dtype == "float32":
+        return np.frombuffer(data, dtype=np.float32).reshape(len(blobs), -1)
+    if dtype == "float16":
+        return np.frombuffer(data, dtype=np.float16).reshape(len(blobs), -1).astype(np.float32)
+    layout = np.dtype([("scale", "<f4"), ("q", "i1", (len(blobs[0]) - 4,))])
+    records = np.frombuffer(data, dtype=layout)
+    return records["q"].astype(np.float32) * records["scale"][:, None]
+
+class VectorStore:
+    def __init__(self, db_path: str, dtype: str = None):
+        if dtype is not None and dtype not in EMBEDDING_DTYPES:
+            raise ValueError(f"Unknown embedding dtype {dtype!r}. Expected one of {EMBEDDING_DTYPES}.")
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL only fsyncs at checkpoints; a crash can lose the last commit, never corrupt
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                id TEXT PRIMARY KEY,
+                ticker TEXT,
+                chunk_text TEXT,
+                embedding BLOB
+            );
+            CREATE INDEX IF NOT EXISTS idx_embeddings_ticker ON embeddings (ticker);
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                content_hash TEXT PRIMARY KEY,
+                embedding BLOB
+            );
+            CREATE TABLE IF NOT EXISTS store_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        row = self._conn.execute("SELECT value FROM store_meta WHERE key = 'embedding_dtype'").fetchone()
+        if row is None:
+            # Files written before quantization existed hold float32 blobs
+            has_rows = self._conn.execute("SELECT EXISTS(SELECT 1 FROM embeddings)").fetchone()[0]
+            self.dtype = "float32" if has_rows else (dtype or VECTOR_STORE_DTYPE)
+            self._conn.execute("INSERT INTO store_meta (key, value) VALUES ('embedding_dtype', ?)", (self.dtype,))
+        else:
+            self.dtype = row[0]
+            if dtype is not None and dtype != self.dtype:
+                logger.warning(f"{db_path} stores {self.dtype} embeddings, not {dtype}; "
+                               f"run migrate_vector_store.py to convert it.")
+        self._conn.commit()
+        self._matrices = OrderedDict()  # ticker -> TickerMatrix
+        self.cache_size = VECTOR_CACHE_TICKERS
+
+    def upsert_many(self, rows: Iterable[ChunkRow]) -> int:
+        """Inserts or replaces every row in one transaction; returns the row count."""
+        rows = list(rows)
+        if not rows:
+            return 0
+        blobs = encode_embeddings(normalize_rows(np.stack([r[3] for r in rows])), self.dtype)
+        params = [(chunk_id, ticker, text, blob) for (chunk_id, ticker, text, _), blob in zip(rows, blobs)]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (id, ticker, chunk_text, embedding) VALUES (?, ?, ?, ?)",
+                params
+            )
+            for ticker in {p[1] for p in params}:
+                self._matrices.pop(ticker, None)
+        return len(params)
+
+    def upsert_chunks(self, ticker: str, texts: List[str], embeddings: np.ndarray) -> int:
+        """Replaces a ticker's chunks `<ticker>_chunk_<i>` in one transaction."""
+        return self.upsert_many(
+            (f"{ticker}_chunk_{i}", ticker, text, embedding)
+            for i, (text, embedding) in enumerate(zip(texts, embeddings))
+        )
+
+    def fetch(self, ticker: str) -> List[Tuple[str, str, np.ndarray]]:
+        """[(chunk_id, chunk_text, embedding)] for one ticker, in insertion order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, chunk_text, embedding FROM embeddings WHERE ticker = ? ORDER BY rowid", (ticker,)
+            ).fetchall()
+        vectors = decode_embeddings([r[2] for r in rows], self.dtype)
+        return [(row_id, text, vector) for (row_id, text, _), vector in zip(rows, vectors)]
+
+    def load(self, ticker: str) -> TickerMatrix:
+        """The ticker's chunks as one contiguous unit-row matrix (LRU cached)."""
+        with self._lock:
+            cached = self._matrices.get(ticker)
+            if cached is not None:
+                self._matrices.move_to_end(ticker)
+                return cached
+            rows = self._conn.execute(
+                "SELECT id, chunk_text, embedding FROM embeddings WHERE ticker = ? ORDER BY rowid", (ticker,)
+            ).fetchall()
+            if not rows:
+                return TickerMatrix([], [], np.empty((0, 0), dtype=np.float32))
+            # Rows written before normalization was introduced are normalized here too
+            vectors = normalize_rows(decode_embeddings([r[2] for r in rows], self.dtype))
+            entry = self._matrices[ticker] = TickerMatrix([r[0] for r in rows], [r[1] for r in rows], vectors)
+            while len(self._matrices) > self.cache_size:
+                self._matrices.popitem(last=False)
+            return entry
+
+    def top_k(self, ticker: str, query: np.ndarray, k: int = 3) -> List[Tuple[str, float]]:
+        """[(chunk_text, cosine)] of the `k` chunks closest to `query`, best first."""
+        entry = self.load(ticker)
+        if not entry.texts:
+            return []
+        rows, scores = rank_top_k(entry.vectors, query, k)
+        return [(entry.texts[i], float(s)) for i, s in zip(rows.tolist(), scores.tolist())]
+
+    def as_stored(self, matrix: np.ndarray) -> np.ndarray:
+        """The unit rows `all_vectors` will return for `matrix` once upserted (i.e. after this store's encoding)."""
+        matrix = normalize_rows(np.atleast_2d(np.asarray(matrix, dtype=np.float32)))
+        return normalize_rows(decode_embeddings(encode_embeddings(matrix, self.dtype), self.dtype))
+
+    def all_vectors(self) -> Tuple[List[str], List[str], np.ndarray]:
+        """(chunk ids, tickers, unit-row matrix) for every stored chunk, e.g. to build an ANN index."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, ticker, embedding FROM embeddings ORDER BY rowid").fetchall()
+        if not rows:
+            return [], [], np.empty((0, 0), dtype=np.float32)
+        vectors = normalize_rows(decode_embeddings([r[2] for r in rows], self.dtype))
+        return [r[0] for r in rows], [r[1] for r in rows], vectors
+
+    def _select_in(self, sql: str, keys: List[str]) -> list:
+        """Runs `<sql> IN (...)` over `keys` in parameter-limit sized batches."""
+        keys, rows = list(keys), []
+        with self._lock:
+            for start in range(0, len(keys), _MAX_SQL_PARAMS):
+                batch = keys[start:start + _MAX_SQL_PARAMS]
+                rows.extend(self._conn.execute(f"{sql} IN ({','.join('?' * len(batch))})", batch).fetchall())
+        return rows
+
+    def texts(self, chunk_ids: List[str]) -> dict:
+        """{chunk_id: chunk_text} for the given ids."""
+        return dict(self._select_in("SELECT id, chunk_text FROM embeddings WHERE id", chunk_ids))
+
+    def cached_embeddings(self, content_hashes: List[str]) -> dict:
+        """{content_hash: embedding} for the hashes already encoded (see `ingest._encode_chunks`)."""
+        rows = self._select_in("SELECT content_hash, embedding FROM embedding_cache WHERE content_hash", content_hashes)
+        return dict(zip((h for h, _ in rows), decode_embeddings([blob for _, blob in rows], _CACHE_DTYPE)))
+
+    def cache_embeddings(self, items: Iterable[Tuple[str, np.ndarray]]):
+        items = list(items)
+        if not items:
+            return
+        blobs = encode_embeddings(np.stack([e for _, e in items]), _CACHE_DTYPE)
+        params = [(h, blob) for (h, _), blob in zip(items, blobs)]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (content_hash, embedding) VALUES (?, ?)", params
+            )
+
+    def convert(self, dtype: str, vacuum: bool = True) -> dict:
+        """
+        Re-encodes every stored embedding as `dtype` in one transaction, then
+        VACUUMs so the file actually shrinks. The float32 embedding cache is
+        left as is. Converting to a narrower type is lossy; converting back
+        does not restore precision.
+        """
+        if dtype not in EMBEDDING_DTYPES:
+            raise ValueError(f"Unknown embedding dtype {dtype!r}. Expected one of {EMBEDDING_DTYPES}.")
+        counts = {"from": self.dtype, "to": dtype, "embeddings": 0}
+        if dtype == self.dtype:
+            return counts
+        with self._lock:
+            with self._conn:
+                rows = self._conn.execute("SELECT id, embedding FROM embeddings").fetchall()
+                # Blob lengths differ only if the table mixes embedding models
+                by_length = {}
+                for chunk_id, blob in rows:
+                    by_length.setdefault(len(blob), []).append((chunk_id, blob))
+                for group in by_length.values():
+                    blobs = encode_embeddings(decode_embeddings([b for _, b in group], self.dtype), dtype)
+                    self._conn.executemany(
+                        "UPDATE embeddings SET embedding = ? WHERE id = ?",
+                        [(blob, chunk_id) for blob, (chunk_id, _) in zip(blobs, group)]
+                    )
+                counts["embeddings"] = len(rows)
+                self._conn.execute("UPDATE store_meta SET value = ? WHERE key = 'embedding_dtype'", (dtype,))
+            if vacuum:
+                self._conn.execute("VACUUM")
+                # In WAL mode the rewritten pages only reach the main file at a checkpoint
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.dtype = dtype
+            self._matrices.clear()
+        logger.info(f"Converted {counts['embeddings']} embeddings in {self.db_path} "
+                    f"from {counts['from']} to {dtype}.")
+        return counts
+
+    def invalidate(self, ticker: str = None):
+        with self._lock:
+            if ticker is None:
+                self._matrices.clear()
+            else:
+                self._matrices.pop(ticker, None)
+
+    def count(self, ticker: str = None) -> int:
+        with self._lock:
+            if ticker is None:
+                return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings WHERE ticker = ?", (ticker,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,146 @@
+"""
+Local headline sentiment scoring
+────────────────────────────────
+Reuses the all-MiniLM-L6-v2 model already loaded by the RAG pipeline. Labelled
+bullish/bearish prototype headlines are embedded once and averaged into two
+unit centroids; a batch of headlines is then scored with a single
+(n x 384) @ (384 x 2) matrix multiply:
+
+    score = clip((cos(bullish) - cos(bearish)) / SENTIMENT_SCALE, -1, 1)
+
+Scores are cached per headline hash, so a watchlist scan only embeds
+headlines it has not seen before. Confidence is |mean score| of a ticker's
+headlines damped for small samples; callers use it to skip the LLM.
+"""
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+logger = logging.getLogger("sentiment_scorer")
+
+# Cosine gap that maps to a full +/-1 score
+SENTIMENT_SCALE = float(os.getenv("SENTIMENT_SCALE", "0.15"))
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "256"))
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "50000"))
+# Below this many headlines the confidence is scaled down proportionally
+SENTIMENT_FULL_SAMPLE = 5
+
+BULLISH_PROTOTYPES = [
+    "Company reports record quarterly profit, beats estimates",
+    "Shares surge after strong earnings and raised guidance",
+    "Revenue growth accelerates on robust demand",
+    "Stock upgraded to buy by analysts, target price raised",
+    "Company wins major order and expands market share",
+    "Board approves share buyback and higher dividend",
+    "Margins improve as costs fall and sales climb",
+    "Shares hit all-time high on bullish outlook",
+]
+BEARISH_PROTOTYPES = [
+    "Company posts quarterly loss, misses estimates",
+    "Shares plunge after weak earnings and guidance cut",
+    "Revenue declines as demand slows sharply",
+    "Stock downgraded to sell by analysts, target price cut",
+    "Regulator launches probe into accounting irregularities",
+    "Company defaults on debt, credit rating downgraded",
+    "Margins shrink as costs rise and sales fall",
+    "Shares hit 52-week low amid bearish outlook",
+]
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+def headline_key(text: str) -> bytes:
+    return hashlib.blake2b(" ".join(text.casefold().split()).encode("utf-8"), digest_size=16).digest()
+
+def _label(score: float) -> str:
+    if score >= 0.2:
+        return "Bullish"
+    if score <= -0.2:
+        return "Bearish"
+    return "Neutral"
+
+class SentimentScorer:
+    def __init__(self, model=None, cache_size: int = SENTIMENT_CACHE_SIZE, batch_size: int = SENTIMENT_BATCH_SIZE):
+        self._model = model
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self._prototypes = None  # (d, 2): bullish, bearish unit centroids
+        self._cache = OrderedDict()  # headline hash -> score
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            from data_connectors.rag_pipeline.ingest import _get_embed_model
+            self._model = _get_embed_model()
+        return self._model
+
+    def _embed(self, texts: Sequence[str]) -> np.ndarray:
+        return _normalize(self.model.encode(list(texts), batch_size=self.batch_size))
+
+    def _prototype_matrix(self) -> np.ndarray:
+        if self._prototypes is None:
+            vectors = self._embed(BULLISH_PROTOTYPES + BEARISH_PROTOTYPES)
+            split = len(BULLISH_PROTOTYPES)
+            centroids = np.stack([vectors[:split].mean(axis=0), vectors[split:].mean(axis=0)])
+            self._prototypes = _normalize(centroids).T
+        return self._prototypes
+
+    def score_headlines(self, headlines: Sequence[str]) -> np.ndarray:
+        """Scores in [-1, 1], one per headline; only uncached headlines are embedded."""
+        keys = [headline_key(h) for h in headlines]
+        scores = np.empty(len(keys), dtype=np.float32)
+        missing = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is None:
+                    missing.setdefault(key, []).append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    scores[i] = cached
+
+        if missing:
+            texts = [headlines[rows[0]] for rows in missing.values()]
+            sims = self._embed(texts) @ self._prototype_matrix()
+            fresh = np.clip((sims[:, 0] - sims[:, 1]) / SENTIMENT_SCALE, -1.0, 1.0)
+            with self._lock:
+                for (key, rows), score in zip(missing.items(), fresh.tolist()):
+                    scores[rows] = score
+                    self._cache[key] = score
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return scores
+
+    def _summarize(self, scores: np.ndarray) -> dict:
+        if not len(scores):
+            return {"score": 0.0, "confidence": 0.0, "label": "Neutral", "headlines": 0}
+        score = float(scores.mean())
+        confidence = abs(score) * min(1.0, len(scores) / SENTIMENT_FULL_SAMPLE)
+        return {"score": round(score, 4), "confidence": round(confidence, 4), "label": _label(score), "headlines": len(scores)}
+
+    def score_ticker(self, headlines: Sequence[str]) -> dict:
+        """{"score", "confidence", "label", "headlines"} for one ticker's headlines."""
+        return self._summarize(self.score_headlines(headlines))
+
+    def score_tickers(self, headlines_by_ticker: Dict[str, List[str]]) -> Dict[str, dict]:
+        """Same as `score_ticker` for a whole watchlist, embedded in one batch."""
+        tickers = list(headlines_by_ticker)
+        flat = [h for t in tickers for h in headlines_by_ticker[t]]
+        scores = self.score_headlines(flat)
+        results, start = {}, 0
+        for ticker in tickers:
+            end = start + len(headlines_by_ticker[ticker])
+            results[ticker] = self._summarize(scores[start:end])
+            start = end
+        return results
+
+# Process-wide scorer (lazy: the model loads on first use)
+sentiment_scorer = SentimentScorer()
@@ -0,0 +1,99 @@
+"""
+In-memory ticker search for the stock picker.
+
+Built once per universe: sorted arrays of symbol keys and company-name tokens
+(prefix lookups are two bisects) plus a one-edit deletion index for typo
+tolerance (SymSpell-style: a query and a key within one insert/delete/
+substitution share a deletion variant). Multi-word queries must match every
+term; results are ranked by match quality and carry their ticker directly.
+"""
+import re
+import heapq
+from bisect import bisect_left
+from collections import defaultdict
+from typing import List, Sequence
+
+# Scores per term: exact symbol > symbol prefix > name-token prefix > one-edit typo
+_EXACT_SYMBOL, _SYMBOL_PREFIX, _TOKEN_EXACT, _TOKEN_PREFIX, _FUZZY = 100, 80, 60, 50, 20
+_STOPWORDS = {"LIMITED", "LTD", "THE", "OF", "AND", "CO", "COMPANY"}
+_SPLIT = re.compile(r"[^A-Z0-9]+")
+
+def _deletes(word: str) -> set:
+    return {word[:i] + word[i + 1:] for i in range(len(word))} | {word}
+
+class TickerSearchIndex:
+    def __init__(self, tickers: Sequence[str], names: Sequence[str]):
+        self.tickers = list(tickers)
+        self.names = list(names)
+        self.labels = [f"{n} ({t})" for t, n in zip(self.tickers, self.names)]
+        self._row_of = {t: i for i, t in enumerate(self.tickers)}
+
+        symbol_keys, token_keys = [], []
+        self._fuzzy = defaultdict(set)
+        for row, (ticker, name) in enumerate(zip(self.tickers, self.names)):
+            symbol = ticker.upper().rsplit(".", 1)[0]
+            symbol_keys.append((symbol, row))
+            for variant in _deletes(symbol):
+                self._fuzzy[variant].add(row)
+            for token in set(_SPLIT.split(name.upper())) - _STOPWORDS - {""}:
+                token_keys.append((token, row))
+                if len(token) >= 4:
+                    for variant in _deletes(token):
+                        self._fuzzy[variant].add(row)
+
+        symbol_keys.sort()
+        token_keys.sort()
+        self._symbols = [k for k, _ in symbol_keys]
+        self._symbol_rows = [r for _, r in symbol_keys]
+        self._tokens = [k for k, _ in token_keys]
+        self._token_rows = [r for _, r in token_keys]
+
+    def __len__(self):
+        return len(self.tickers)
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str):
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + "\uffff")
+
+    def _score_term(self, term: str) -> dict:
+        scores = {}
+        lo, hi = self._prefix_range(self._symbols, term)
+        for i in range(lo, hi):
+            row = self._symbol_rows[i]
+            score = _EXACT_SYMBOL if self._symbols[i] == term else _SYMBOL_PREFIX - (len(self._symbols[i]) - len(term))
+            scores[row] = max(scores.get(row, 0), score)
+        lo, hi = self._prefix_range(self._tokens, term)
+        for i in range(lo, hi):
+            row = self._token_rows[i]
+            score = _TOKEN_EXACT if self._tokens[i] == term else _TOKEN_PREFIX
+            scores[row] = max(scores.get(row, 0), score)
+        if not scores and len(term) >= 3:
+            for variant in _deletes(term):
+                for row in self._fuzzy.get(variant, ()):
+                    scores.setdefault(row, _FUZZY)
+        return scores
+
+    def search(self, query: str, k: int = 20) -> List[dict]:
+        """Top-k matches for `query` as [{"ticker", "name", "label", "score"}], best first."""
+        terms = [t for t in _SPLIT.split(query.upper()) if t]
+        if not terms:
+            return []
+        combined = None
+        for term in terms:
+            scores = self._score_term(term)
+            if combined is None:
+                combined = scores
+            else:
+                combined = {row: combined[row] + s for row, s in scores.items() if row in combined}
+            if not combined:
+                return []
+        # Ties go to the shorter (usually the primary) symbol, then alphabetical order
+        best = heapq.nsmallest(k, combined.items(), key=lambda kv: (-kv[1], len(self.tickers[kv[0]]), self.tickers[kv[0]]))
+        return [
+            {"ticker": self.tickers[row], "name": self.names[row], "label": self.labels[row], "score": score}
+            for row, score in best
+        ]
+
+    def label(self, ticker: str) -> str:
+        row = self._row_of.get(ticker)
+        return self.labels[row] if row is not None else ticker
@@ -0,0 +1,176 @@
+"""
+Shared NSE/BSE universe loader.
+
+- Keeps the last downloaded EQUITY_L.csv on disk and revalidates it with a
+  conditional GET (If-None-Match / If-Modified-Since), so an unchanged list
+  costs a 304 instead of a full download.
+- Parses the CSV with vectorized pandas string ops (no iterrows).
+- Writes a compact `.npz` snapshot of (ticker, name, exchange) arrays that
+  loads in milliseconds at process start; it is only rebuilt when the
+  upstream file actually changed.
+"""
+import os
+import io
+import json
+import time
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from data_connectors.http_client import http_client
+
+logger = logging.getLogger("universe_loader")
+
+NSE_EQUITY_URL = "https://nsearchives.nseindia.com/content/equities/EQUITY_L.csv"
+
+_BASE = os.path.dirname(os.path.abspath(__file__))
+UNIVERSE_CACHE_DIR = os.getenv("UNIVERSE_CACHE_DIR", _BASE)
+EQUITY_CSV_PATH = os.path.join(UNIVERSE_CACHE_DIR, "EQUITY_L.csv")
+EQUITY_META_PATH = os.path.join(UNIVERSE_CACHE_DIR, "EQUITY_L.meta.json")
+UNIVERSE_SNAPSHOT_PATH = os.path.join(UNIVERSE_CACHE_DIR, "ticker_universe.npz")
+BSE_CSV_PATH = os.path.join(_BASE, "BSE_Equity.csv")
+
+# Snapshots younger than this are used without contacting NSE at all
+UNIVERSE_MAX_AGE_SECONDS = float(os.getenv("UNIVERSE_MAX_AGE_SECONDS", str(24 * 3600)))
+# After a failed refresh the stale (or empty) universe is served this long before NSE is tried again
+UNIVERSE_RETRY_SECONDS = float(os.getenv("UNIVERSE_RETRY_SECONDS", "900"))
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+def _clean(series: pd.Series) -> pd.Series:
+    return series.fillna("").astype(str).str.strip()
+
+def parse_nse_csv(text: str) -> pd.DataFrame:
+    """EQUITY_L.csv -> DataFrame[ticker, name, exchange] using vectorized string ops."""
+    df = pd.read_csv(io.StringIO(text), dtype=str)
+    df.columns = df.columns.str.strip()
+    symbol, name = _clean(df["SYMBOL"]), _clean(df["NAME OF COMPANY"])
+    keep = (symbol != "") & (name != "")
+    return pd.DataFrame({"ticker": symbol[keep] + ".NS", "name": name[keep], "exchange": "NSE"}).reset_index(drop=True)
+
+def parse_bse_csv(path: str) -> pd.DataFrame:
+    """Optional local BSE_Equity.csv ('Security Code', 'Security Name') -> same columns as NSE."""
+    df = pd.read_csv(path, dtype=str)
+    df.columns = df.columns.str.strip()
+    code, name = _clean(df["Security Code"]), _clean(df["Security Name"])
+    keep = (code != "") & (name != "")
+    return pd.DataFrame({"ticker": code[keep] + ".BO", "name": name[keep], "exchange": "BSE"}).reset_index(drop=True)
+
+def fetch_equity_csv(timeout: float = 15, fallback: bool = True) -> tuple:
+    """
+    Returns (csv_text, changed). Sends the stored validators so an unchanged
+    list comes back as 304 and is read from the on-disk copy. If NSE is
+    unreachable, the on-disk copy is used when one exists and `fallback` is set.
+    """
+    meta = {}
+    if os.path.exists(EQUITY_CSV_PATH) and os.path.exists(EQUITY_META_PATH):
+        with open(EQUITY_META_PATH, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        # The on-disk copy is the cache here, so the shared client's response cache is bypassed
+        res = http_client.get(NSE_EQUITY_URL, headers=headers, timeout=timeout, ttl=0)
+        if res.status_code == 304:
+            logger.info("NSE equity list unchanged (304); using the cached copy.")
+            with open(EQUITY_CSV_PATH, "r", encoding="utf-8") as f:
+                return f.read(), False
+        res.raise_for_status()
+    except Exception as e:
+        if fallback and os.path.exists(EQUITY_CSV_PATH):
+            logger.warning(f"NSE equity list unreachable ({str(e)}); using the cached copy.")
+            with open(EQUITY_CSV_PATH, "r", encoding="utf-8") as f:
+                return f.read(), False
+        raise
+
+    with open(EQUITY_CSV_PATH, "w", encoding="utf-8") as f:
+        f.write(res.text)
+    with open(EQUITY_META_PATH, "w", encoding="utf-8") as f:
+        json.dump({"etag": res.headers.get("ETag"), "last_modified": res.headers.get("Last-Modified")}, f)
+    return res.text, True
+
+def write_snapshot(df: pd.DataFrame):
+    tmp = UNIVERSE_SNAPSHOT_PATH + ".tmp.npz"
+    np.savez(tmp, **{col: df[col].to_numpy(dtype=str) for col in ("ticker", "name", "exchange")})
+    os.replace(tmp, UNIVERSE_SNAPSHOT_PATH)
+
+def _read_snapshot() -> Dict[str, np.ndarray]:
+    with np.load(UNIVERSE_SNAPSHOT_PATH, allow_pickle=False) as data:
+        return {col: data[col] for col in ("ticker", "name", "exchange")}
+
+def build_universe_from_text(text: Optional[str]) -> pd.DataFrame:
+    """Parsed NSE list (skipped when `text` is None) plus the optional local BSE CSV."""
+    frames = [parse_nse_csv(text)] if text is not None else []
+    if os.path.exists(BSE_CSV_PATH):
+        try:
+            frames.append(parse_bse_csv(BSE_CSV_PATH))
+        except Exception as e:
+            logger.error(f"Failed to parse BSE CSV: {str(e)}")
+    if not frames:
+        return pd.DataFrame({"ticker": [], "name": [], "exchange": []}, dtype=str)
+    return pd.concat(frames, ignore_index=True)
+
+def _empty_universe() -> Dict[str, np.ndarray]:
+    empty = np.array([], dtype=str)
+    return {"ticker": empty, "name": empty, "exchange": empty}
+
+def _snapshot_age():
+    if not os.path.exists(UNIVERSE_SNAPSHOT_PATH):
+        return None
+    return time.time() - os.path.getmtime(UNIVERSE_SNAPSHOT_PATH)
+
+def load_universe(max_age: float = UNIVERSE_MAX_AGE_SECONDS, refresh: bool = False) -> Dict[str, np.ndarray]:
+    """
+    {"ticker", "name", "exchange"} string arrays for the whole universe.
+
+    A snapshot younger than `max_age` is loaded directly; otherwise NSE is
+    revalidated and the snapshot only rebuilt if the list changed. Results are
+    memoized per process. A failed refresh is not retried for
+    `UNIVERSE_RETRY_SECONDS` (unless `refresh`). Returns empty arrays if
+    nothing can be loaded.
+    """
+    with _memo_lock:
+        age = _snapshot_age()
+        fresh = not refresh and age is not None and age < max_age
+        if fresh and "universe" in _memo:
+            return _memo["universe"]
+
+        backing_off = not refresh and time.time() - _memo.get("failed_at", float("-inf")) < UNIVERSE_RETRY_SECONDS
+        if not fresh and backing_off:
+            if "universe" in _memo:
+                return _memo["universe"]
+            if age is None:
+                return _empty_universe()
+        elif not fresh:
+            try:
+                # With a snapshot on disk a failure must surface, so it is backed off
+                # rather than counted as a successful revalidation
+                text, changed = fetch_equity_csv(fallback=age is None)
+                if changed or age is None:
+                    write_snapshot(build_universe_from_text(text))
+                else:
+                    os.utime(UNIVERSE_SNAPSHOT_PATH)  # revalidated: restart the max-age clock
+                _memo.pop("failed_at", None)
+            except Exception as e:
+                logger.error(f"Failed to refresh the market universe (next attempt in {UNIVERSE_RETRY_SECONDS:.0f}s): {str(e)}")
+                _memo["failed_at"] = time.time()
+                if age is None:
+                    return _empty_universe()
+
+        universe = _memo["universe"] = _read_snapshot()
+        logger.info(f"Market universe loaded: {len(universe['ticker'])} tickers.")
+        return universe
+
+def universe_records(universe: Dict[str, np.ndarray]) -> List[dict]:
+    """[{"ticker", "name", "exchange"}] view, the format of `ticker_universe.json`."""
+    return [
+        {"ticker": t, "name": n, "exchange": e}
+        for t, n, e in zip(universe["ticker"].tolist(), universe["name"].tolist(), universe["exchange"].tolist())
+    ]
@@ -1,35 +1,229 @@
-import yfinance as yf
+import os
+import sys
+import json
+import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+# Inject Phase 4 path so we can record latency metrics
+_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_phase4 = os.path.join(_root, "Phase_4_Risk_And_Observability")
+if _phase4 not in sys.path:
+    sys.path.insert(0, _phase4)
+
+from core.metrics import track_latency
+from data_connectors.market_store import MarketStore
+from data_connectors.incremental_indicators import IndicatorState
+from data_connectors.quote_cache import QuoteCache
 
 logger = logging.getLogger("yfinance_data")
 
-def fetch_live_ohlcv(ticker: str) -> dict:
+# Symbols per yf.download() call, and how many of those calls may be in flight at once
+OHLCV_BATCH_SIZE = int(os.getenv("OHLCV_BATCH_SIZE", "50"))
+OHLCV_MAX_CONCURRENCY = int(os.getenv("OHLCV_MAX_CONCURRENCY", "4"))
+
+# History pulled the first time a ticker is seen; afterwards only newer bars are requested.
+# Yahoo is not asked again for a ticker refreshed within OHLCV_REFRESH_SECONDS.
+OHLCV_BOOTSTRAP_PERIOD = os.getenv("OHLCV_BOOTSTRAP_PERIOD", "1y")
+OHLCV_REFRESH_SECONDS = float(os.getenv("OHLCV_REFRESH_SECONDS", "60"))
+# A batch downloads from its oldest gap, so tickers whose last bars are further
+# apart than this are put in separate batches
+OHLCV_BATCH_GAP_SECONDS = float(os.getenv("OHLCV_BATCH_GAP_SECONDS", str(5 * 86400)))
+
+market_store = MarketStore()
+
+# Incremental indicator state per ticker, persisted next to its bars. One lock per
+# ticker, so concurrent graph runs on different tickers never wait on each other.
+_indicator_states = {}
+_indicator_locks = {}
+_indicator_locks_guard = threading.Lock()
+
+def _history_window(last_ts):
+    """yfinance kwargs fetching everything from the last stored bar (inclusive) onwards."""
+    if last_ts is None:
+        return {"period": OHLCV_BOOTSTRAP_PERIOD}
+    import pandas as pd
+    return {"start": pd.Timestamp(last_ts, unit="s", tz="UTC")}
+
+def _stored_bar(ticker: str) -> dict:
+    bar = market_store.latest_bar(ticker)
+    if bar is None:
+        logger.warning(f"No yfinance data found for {ticker}")
+        return {"error": "No market data available"}
+    return bar
+
+def sync_history(ticker: str, force: bool = False) -> int:
+    """Brings the local store up to date for one ticker. Returns the number of new bars."""
+    if not force and market_store.is_fresh(ticker, OHLCV_REFRESH_SECONDS):
+        return 0
+    import yfinance as yf  # deferred: heavy import, only needed on first fetch
+    stock = yf.Ticker(ticker)
+    with track_latency(service="yfinance", operation="history"):
+        hist = stock.history(**_history_window(market_store.last_timestamp(ticker)))
+    return market_store.append(ticker, hist)
+
+def fetch_live_ohlcv(ticker: str, force: bool = False) -> dict:
     """
     Fetches real-time (last traded) OHLCV data for a given ticker using Yahoo Finance.
     For NSE stocks, the ticker must have a '.NS' suffix (e.g. RELIANCE.NS).
+    Bars are served from the local market store, which only downloads what it is missing.
     """
     logger.info(f"Fetching real OHLCV data from yfinance for {ticker}...")
     try:
-        stock = yf.Ticker(ticker)
-        
-        # Get historical data for the last 5 days to compute short-term trends if needed
-        hist = stock.history(period="5d")
-        
-        if hist.empty:
-            logger.warning(f"No yfinance data found for {ticker}")
-            return {"error": "No market data available"}
-            
-        latest = hist.iloc[-1]
-        
-        return {
-            "ticker": ticker,
-            "current_price": float(latest["Close"]),
-            "open": float(latest["Open"]),
-            "high": float(latest["High"]),
-            "low": float(latest["Low"]),
-            "volume": int(latest["Volume"])
-        }
+        sync_history(ticker, force=force)
+        return _stored_bar(ticker)
         
     except Exception as e:
         logger.error(f"yfinance fetch failed for {ticker}: {str(e)}")
         return {"error": str(e)}
+
+def _fetch_batch(batch: List[str]) -> Dict[str, dict]:
+    """
+    One multi-symbol yf.download() call covering the oldest gap in the batch.
+    A failed call marks every symbol in the batch.
+    """
+    last_seen = [market_store.last_timestamp(t) for t in batch]
+    window = _history_window(None if None in last_seen else min(last_seen))
+    try:
+        import yfinance as yf
+        with track_latency(service="yfinance", operation="download"):
+            data = yf.download(
+                batch, group_by="ticker", auto_adjust=True,
+                threads=False, progress=False, multi_level_index=True, **window
+            )
+    except Exception as e:
+        logger.error(f"yfinance batch download failed for {len(batch)} tickers: {str(e)}")
+        return {ticker: {"error": str(e)} for ticker in batch}
+
+    results = {}
+    available = set(data.columns.get_level_values(0)) if data is not None and not data.empty else set()
+    for ticker in batch:
+        # Symbols Yahoo failed on come back as all-NaN columns; they must not be marked fresh
+        if ticker not in available or not data[ticker]["Close"].notna().any():
+            logger.warning(f"No yfinance data found for {ticker}")
+            results[ticker] = {"error": "No market data available"}
+            continue
+        try:
+            market_store.append(ticker, data[ticker])
+            results[ticker] = _stored_bar(ticker)
+        except Exception as e:
+            logger.error(f"yfinance parse failed for {ticker}: {str(e)}")
+            results[ticker] = {"error": str(e)}
+    return results
+
+def _group_by_gap(tickers: List[str], batch_size: int) -> List[List[str]]:
+    """
+    Splits `tickers` into download batches of similar gap: never-seen tickers
+    (full bootstrap history) get batches of their own, and the rest are sorted
+    by last stored bar so one stale symbol doesn't widen every other download.
+    """
+    last_seen = {t: market_store.last_timestamp(t) for t in tickers}
+    new = [t for t in tickers if last_seen[t] is None]
+    known = sorted((t for t in tickers if last_seen[t] is not None), key=last_seen.get, reverse=True)
+
+    batches = [new[i:i + batch_size] for i in range(0, len(new), batch_size)]
+    batch = []
+    for ticker in known:
+        if batch and (len(batch) >= batch_size
+                      or last_seen[batch[0]] - last_seen[ticker] > OHLCV_BATCH_GAP_SECONDS):
+            batches.append(batch)
+            batch = []
+        batch.append(ticker)
+    if batch:
+        batches.append(batch)
+    return batches
+
+def fetch_live_ohlcv_many(tickers: List[str], batch_size: int = OHLCV_BATCH_SIZE,
+                          max_concurrency: int = OHLCV_MAX_CONCURRENCY) -> Dict[str, dict]:
+    """
+    Bulk `fetch_live_ohlcv`: groups tickers into multi-symbol downloads of at
+    most `batch_size` symbols with similar gaps (see `_group_by_gap`) and runs
+    at most `max_concurrency` of them at once.
+    Returns {ticker: <same dict as fetch_live_ohlcv>}; failures stay per ticker.
+    """
+    unique = list(dict.fromkeys(tickers))
+    results = {t: _stored_bar(t) for t in unique if market_store.is_fresh(t, OHLCV_REFRESH_SECONDS)}
+    stale = [t for t in unique if t not in results]
+    if not stale:
+        return results
+    batches = _group_by_gap(stale, batch_size)
+    logger.info(f"Fetching OHLCV for {len(stale)} tickers in {len(batches)} batches...")
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(batches)))) as pool:
+        for batch_result in pool.map(_fetch_batch, batches):
+            results.update(batch_result)
+    return results
+
+# Shared by the master graph and the UI; its TTL (not the store's) decides when Yahoo is asked again
+quote_cache = QuoteCache(lambda ticker: fetch_live_ohlcv(ticker, force=True))
+
+def get_quote(ticker: str) -> dict:
+    """Latest OHLCV bar through the in-memory quote cache (same shape as `fetch_live_ohlcv`)."""
+    return quote_cache.get(ticker)
+
+def _indicator_state_path(ticker: str) -> str:
+    return os.path.join(market_store.ticker_dir(ticker), "indicators.json")
+
+def _indicator_lock(ticker: str) -> threading.Lock:
+    with _indicator_locks_guard:
+        lock = _indicator_locks.get(ticker)
+        if lock is None:
+            lock = _indicator_locks[ticker] = threading.Lock()
+        return lock
+
+def _daily_snapshot(state: IndicatorState) -> dict:
+    # The store holds daily bars, where "session VWAP" would just be that day's
+    # typical price; VWAP is only reported by states fed intraday bars
+    snapshot = state.snapshot()
+    snapshot.pop("vwap", None)
+    return snapshot
+
+def latest_indicators(ticker: str) -> dict:
+    """
+    Indicator snapshot for `ticker`, advanced only by the bars stored since the
+    last call (O(1) per new bar). The state is reloaded from disk after a restart,
+    so only a ticker's very first call replays its stored history, and it is only
+    written back when a bar was added or revised.
+    """
+    with _indicator_lock(ticker):
+        state = _indicator_states.get(ticker)
+        if state is None:
+            try:
+                with open(_indicator_state_path(ticker), "r", encoding="utf-8") as f:
+                    state = IndicatorState.from_dict(json.load(f))
+            except (FileNotFoundError, ValueError, KeyError):
+                state = IndicatorState()
+
+        cols = market_store.read(ticker)
+        if not cols:
+            return _daily_snapshot(state)
+        absorbed = (state.last_ts, state.last_bar)
+        start = 0
+        if state.last_ts is not None:
+            # The last absorbed bar is replayed as a revision (it may have moved intraday)
+            start = int(cols["ts"].searchsorted(state.last_ts))
+            if start == len(cols["ts"]) or cols["ts"][start] != state.last_ts:
+                # State keyed differently from the store (e.g. bars re-keyed by date): rebuild
+                state, start = IndicatorState(), 0
+        for i in range(start, len(cols["ts"])):
+            state.update(cols["ts"][i], cols["open"][i], cols["high"][i], cols["low"][i],
+                         cols["close"][i], cols["volume"][i])
+
+        _indicator_states[ticker] = state
+        if (state.last_ts, state.last_bar) != absorbed:
+            with open(_indicator_state_path(ticker), "w", encoding="utf-8") as f:
+                json.dump(state.to_dict(), f)
+        return _daily_snapshot(state)
+
+async def afetch_live_ohlcv(ticker: str) -> dict:
+    """Non-blocking `fetch_live_ohlcv`: yfinance is synchronous, so it runs in the default executor."""
+    return await asyncio.to_thread(fetch_live_ohlcv, ticker)
+
+async def afetch_live_ohlcv_many(tickers: List[str], batch_size: int = OHLCV_BATCH_SIZE,
+                                 max_concurrency: int = OHLCV_MAX_CONCURRENCY) -> Dict[str, dict]:
+    return await asyncio.to_thread(fetch_live_ohlcv_many, tickers, batch_size, max_concurrency)
+
+async def aget_quote(ticker: str) -> dict:
+    return await asyncio.to_thread(get_quote, ticker)
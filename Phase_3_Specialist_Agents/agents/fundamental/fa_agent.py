@@ -1,19 +1,89 @@
 import os
 import sys
 import logging
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
 
-# Inject Phase 2 path so we can access the RAG pipeline
+# Inject Phase 2 path so we can access the RAG pipeline (and Phase 4 for metrics)
 _root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-_phase2 = os.path.join(_root, "Phase_2_Data_Connectivity")
-if _phase2 not in sys.path:
-    sys.path.insert(0, _phase2)
+for _phase in ("Phase_2_Data_Connectivity", "Phase_4_Risk_And_Observability"):
+    _phase_path = os.path.join(_root, _phase)
+    if _phase_path not in sys.path:
+        sys.path.insert(0, _phase_path)
 
-from data_connectors.rag_pipeline.ingest import ingest_stock_fundamentals, query_fundamentals
+from data_connectors.rag_pipeline.ingest import (
+    ingest_stock_fundamentals, query_fundamentals,
+    aingest_stock_fundamentals, aquery_fundamentals
+)
+from core.metrics import track_latency
 
 logger = logging.getLogger("fa_agent")
 
+FA_RAG_QUERY = "valuation, P/E ratio, revenue, profitability, debt, financial health, analyst recommendation"
+
+def _build_chain(api_key: str):
+    from langchain_groq import ChatGroq
+    from langchain_core.prompts import ChatPromptTemplate
+
+    llm = ChatGroq(
+        api_key=api_key,
+        model_name="llama-3.1-8b-instant",
+        temperature=0.2
+    )
+    
+    prompt = ChatPromptTemplate.from_messages([
+        ("system",
+         "You are a conservative, data-driven Fundamental Analyst for the Indian Equity Market. "
+         "You have been provided with retrieved financial data from a RAG knowledge base. "
+         "Analyze ONLY the provided data. Do NOT hallucinate any numbers. "
+         "Provide: (1) A one-word stance: Bullish, Bearish, or Neutral. "
+         "(2) A concise 2-3 sentence reasoning that cites specific metrics from the context."),
+        ("human",
+         "Company: {ticker}\n\n"
+         "Retrieved Financial Context (from RAG):\n{context}\n\n"
+         "Provide your fundamental analysis stance and reasoning based strictly on the above data.")
+    ])
+    return prompt | llm
+
+def _unsynthesized_result(retrieved_context: str) -> dict:
+    logger.warning("No GROQ_API_KEY found. Returning raw RAG context without LLM synthesis.")
+    return {
+        "agent_name": "Fundamental Analyst",
+        "stance": "Neutral",
+        "reasoning": (
+            "API Call Failed (Missing GROQ Key) — RAG context retrieved but not synthesized:\n\n"
+            + retrieved_context[:500]
+        ),
+        "confidence_score": 0.50
+    }
+
+def _llm_result(response) -> dict:
+    response_text = str(response.content)
+    
+    # Parse the stance from the LLM's response
+    stance = "Neutral"
+    if "bullish" in response_text.lower():
+        stance = "Bullish"
+    elif "bearish" in response_text.lower():
+        stance = "Bearish"
+    
+    return {
+        "agent_name": "Fundamental Analyst",
+        "stance": stance,
+        "reasoning": response_text,
+        "confidence_score": 0.85
+    }
+
+def _failed_result(e: Exception, retrieved_context: str) -> dict:
+    logger.error(f"FAA Groq call failed: {str(e)}")
+    return {
+        "agent_name": "Fundamental Analyst",
+        "stance": "Neutral",
+        "reasoning": (
+            f"API Call Failed: {str(e)}\n\n"
+            f"RAG Context (unsynthesized):\n{retrieved_context[:400]}"
+        ),
+        "confidence_score": 0.0
+    }
+
 def run_fundamental_analysis(ticker: str, rag_context: str = "") -> dict:
     """
     The Fundamental Analyst Agent (FAA) — Groq + RAG Edition.
@@ -31,77 +101,51 @@ def run_fundamental_analysis(ticker: str, rag_context: str = "") -> dict:
     logger.info(f"Ingest result: {ingest_result}")
     
     # ─── STEP 2: Retrieve relevant context via semantic search ───
-    retrieved_context = query_fundamentals(
-        ticker,
-        "valuation, P/E ratio, revenue, profitability, debt, financial health, analyst recommendation"
-    )
+    retrieved_context = query_fundamentals(ticker, FA_RAG_QUERY)
     logger.info(f"RAG context retrieved ({len(retrieved_context)} chars).")
     
     # ─── STEP 3: Synthesize with Groq Llama 3 ───
     api_key = os.getenv("GROQ_API_KEY", "dummy_key")
     
     if api_key == "dummy_key":
-        logger.warning("No GROQ_API_KEY found. Returning raw RAG context without LLM synthesis.")
-        return {
-            "agent_name": "Fundamental Analyst",
-            "stance": "Neutral",
-            "reasoning": (
-                "API Call Failed (Missing GROQ Key) — RAG context retrieved but not synthesized:\n\n"
-                + retrieved_context[:500]
-            ),
-            "confidence_score": 0.50
-        }
+        return _unsynthesized_result(retrieved_context)
     
     try:
-        llm = ChatGroq(
-            api_key=api_key,
-            model_name="llama-3.1-8b-instant",
-            temperature=0.2
-        )
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system",
-             "You are a conservative, data-driven Fundamental Analyst for the Indian Equity Market. "
-             "You have been provided with retrieved financial data from a RAG knowledge base. "
-             "Analyze ONLY the provided data. Do NOT hallucinate any numbers. "
-             "Provide: (1) A one-word stance: Bullish, Bearish, or Neutral. "
-             "(2) A concise 2-3 sentence reasoning that cites specific metrics from the context."),
-            ("human",
-             "Company: {ticker}\n\n"
-             "Retrieved Financial Context (from RAG):\n{context}\n\n"
-             "Provide your fundamental analysis stance and reasoning based strictly on the above data.")
-        ])
-        
-        chain = prompt | llm
-        response = chain.invoke({
-            "ticker": ticker,
-            "context": retrieved_context
-        })
-        
-        response_text = str(response.content)
-        
-        # Parse the stance from the LLM's response
-        stance = "Neutral"
-        if "bullish" in response_text.lower():
-            stance = "Bullish"
-        elif "bearish" in response_text.lower():
-            stance = "Bearish"
+        with track_latency(service="groq", operation="fundamental"):
+            response = _build_chain(api_key).invoke({
+                "ticker": ticker,
+                "context": retrieved_context
+            })
+        return _llm_result(response)
         
-        return {
-            "agent_name": "Fundamental Analyst",
-            "stance": stance,
-            "reasoning": response_text,
-            "confidence_score": 0.85
-        }
+    except Exception as e:
+        return _failed_result(e, retrieved_context)
+
+async def arun_fundamental_analysis(ticker: str, rag_context: str = "") -> dict:
+    """
+    Async FAA with the same flow as `run_fundamental_analysis`. The blocking
+    ingest/retrieval steps run in the default executor; Groq is awaited via `ainvoke`.
+    """
+    logger.info(f"Running async FAA on {ticker} using Groq Llama 3 + local RAG...")
+    
+    ingest_result = await aingest_stock_fundamentals(ticker)
+    logger.info(f"Ingest result: {ingest_result}")
+    
+    retrieved_context = await aquery_fundamentals(ticker, FA_RAG_QUERY)
+    logger.info(f"RAG context retrieved ({len(retrieved_context)} chars).")
+    
+    api_key = os.getenv("GROQ_API_KEY", "dummy_key")
+    
+    if api_key == "dummy_key":
+        return _unsynthesized_result(retrieved_context)
+    
+    try:
+        with track_latency(service="groq", operation="fundamental"):
+            response = await _build_chain(api_key).ainvoke({
+                "ticker": ticker,
+                "context": retrieved_context
+            })
+        return _llm_result(response)
         
     except Exception as e:
-        logger.error(f"FAA Groq call failed: {str(e)}")
-        return {
-            "agent_name": "Fundamental Analyst",
-            "stance": "Neutral",
-            "reasoning": (
-                f"API Call Failed: {str(e)}\n\n"
-                f"RAG Context (unsynthesized):\n{retrieved_context[:400]}"
-            ),
-            "confidence_score": 0.0
-        }
+        return _failed_result(e, retrieved_context)
@@ -1,53 +1,88 @@
 import os
+import sys
 import logging
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
 # Using relative imports assuming this will eventually be wrapped by the orchestrator 
 # from core.state import AgentReasoning
 
+_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+_phase4 = os.path.join(_root, "Phase_4_Risk_And_Observability")
+if _phase4 not in sys.path:
+    sys.path.insert(0, _phase4)
+
+from core.metrics import track_latency
+
 logger = logging.getLogger("ta_agent")
 
-def run_technical_analysis(ticker: str, ohlcv_dummy_data: dict) -> dict:
+def _build_chain():
+    # Deferred so importing the agent (and the master graph) stays cheap
+    from langchain_groq import ChatGroq
+    from langchain_core.prompts import ChatPromptTemplate
+
+    llm = ChatGroq(temperature=0.1, model_name="llama-3.1-8b-instant")
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "You are an expert Technical Analyst focusing on the Indian market. Analyze the given indicators and output a purely technical stance (Bullish/Bearish/Neutral)."),
+        ("human", "Assess {ticker} based on this data: {data}")
+    ])
+    return prompt | llm
+
+def _mock_result() -> dict:
+    logger.warning("No GROQ_API_KEY found, returning mock technical analysis.")
+    return {
+        "agent_name": "Technical Analyst",
+        "stance": "Bullish",
+        "reasoning": "API Call Failed (Missing Key) - Fallback Mock: 50 SMA crossed above 200 SMA indicating Golden Cross.",
+        "confidence_score": 0.85
+    }
+
+def _llm_result(response) -> dict:
+    return {
+        "agent_name": "Technical Analyst",
+        "stance": "Derived via LLM",
+        "reasoning": str(response.content),
+        "confidence_score": 0.75 # Typically derived from logprobs or a structured output parser
+    }
+
+def _failed_result(e: Exception) -> dict:
+    logger.error(f"TAA failed: {str(e)}")
+    return {
+        "agent_name": "Technical Analyst",
+        "stance": "Neutral",
+        "reasoning": f"API Call Failed: {str(e)}",
+        "confidence_score": 0.0
+    }
+
+def run_technical_analysis(ticker: str, indicator_data: dict) -> dict:
     """
     Simulates the Technical Analyst Agent (TAA).
-    In production, this node receives OHLCV data and utilizes a fast Groq-hosted
-    Llama 3 model (8B or 70B) to reason about moving averages, RSI, and MACD.
+    Receives the latest OHLCV bar plus computed indicators (SMA, EMA, RSI, MACD,
+    ATR, Bollinger) and utilizes a fast Groq-hosted Llama 3 model (8B or 70B)
+    to reason about them.
     """
     logger.info(f"Running TAA on {ticker} using Groq Llama 3...")
     
     api_key = os.getenv("GROQ_API_KEY", "dummy_key")
     if api_key == "dummy_key":
-        logger.warning("No GROQ_API_KEY found, returning mock technical analysis.")
-        return {
-            "agent_name": "Technical Analyst",
-            "stance": "Bullish",
-            "reasoning": "API Call Failed (Missing Key) - Fallback Mock: 50 SMA crossed above 200 SMA indicating Golden Cross.",
-            "confidence_score": 0.85
-        }
+        return _mock_result()
         
     # Example LangChain setup for when the API key is provided
     try:
-        llm = ChatGroq(temperature=0.1, model_name="llama-3.1-8b-instant")
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are an expert Technical Analyst focusing on the Indian market. Analyze the given indicators and output a purely technical stance (Bullish/Bearish/Neutral)."),
-            ("human", "Assess {ticker} based on this data: {data}")
-        ])
-        
-        chain = prompt | llm
-        response = chain.invoke({"ticker": ticker, "data": ohlcv_dummy_data})
-        
-        return {
-            "agent_name": "Technical Analyst",
-            "stance": "Derived via LLM",
-            "reasoning": str(response.content),
-            "confidence_score": 0.75 # Typically derived from logprobs or a structured output parser
-        }
+        with track_latency(service="groq", operation="technical"):
+            response = _build_chain().invoke({"ticker": ticker, "data": indicator_data})
+        return _llm_result(response)
+    except Exception as e:
+        return _failed_result(e)
+
+async def arun_technical_analysis(ticker: str, indicator_data: dict) -> dict:
+    """Async TAA: same contract as `run_technical_analysis`, awaiting Groq via `ainvoke`."""
+    logger.info(f"Running async TAA on {ticker} using Groq Llama 3...")
+    
+    api_key = os.getenv("GROQ_API_KEY", "dummy_key")
+    if api_key == "dummy_key":
+        return _mock_result()
         
+    try:
+        with track_latency(service="groq", operation="technical"):
+            response = await _build_chain().ainvoke({"ticker": ticker, "data": indicator_data})
+        return _llm_result(response)
     except Exception as e:
-        logger.error(f"TAA failed: {str(e)}")
-        return {
-            "agent_name": "Technical Analyst",
-            "stance": "Neutral",
-            "reasoning": f"API Call Failed: {str(e)}",
-            "confidence_score": 0.0
-        }
+        return _failed_result(e)
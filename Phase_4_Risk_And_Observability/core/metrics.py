@@ -0,0 +1,132 @@
+import time
+import bisect
+import asyncio
+import functools
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+logger = logging.getLogger("metrics")
+
+# Latency buckets (seconds) spanning a SQLite insert up to a slow Groq call
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+NODE_METRIC = "trade_today_node"
+EXTERNAL_METRIC = "trade_today_external_call"
+
+class Histogram:
+    """Fixed-bucket latency histogram (non-cumulative counts, cumulated at render time)."""
+    __slots__ = ("buckets", "counts", "total", "count", "errors")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, seconds: float, error: bool = False):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        if error:
+            self.errors += 1
+
+class MetricsRegistry:
+    """
+    In-memory store of wall-time histograms keyed by (metric, labels).
+    One dict lookup and a bisect per observation, so it can stay on in production.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+
+    def observe(self, metric: str, seconds: float, error: bool = False, **labels):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._series.get(key)
+            if hist is None:
+                hist = self._series[key] = Histogram()
+            hist.observe(seconds, error)
+
+    def snapshot(self) -> dict:
+        """Plain-dict view: {metric: [{labels, count, sum, errors}]}."""
+        with self._lock:
+            out = {}
+            for (metric, labels), hist in self._series.items():
+                out.setdefault(metric, []).append({
+                    "labels": dict(labels), "count": hist.count,
+                    "sum": round(hist.total, 6), "errors": hist.errors
+                })
+            return out
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition (format 0.0.4)."""
+        with self._lock:
+            series = sorted(self._series.items())
+            lines = []
+            seen = set()
+            for (metric, labels), hist in series:
+                if metric not in seen:
+                    seen.add(metric)
+                    lines.append(f"# HELP {metric}_duration_seconds Wall time per call.")
+                    lines.append(f"# TYPE {metric}_duration_seconds histogram")
+                label_str = ",".join(f'{k}="{v}"' for k, v in labels)
+                sep = "," if label_str else ""
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_duration_seconds_bucket{{{label_str}{sep}le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_duration_seconds_bucket{{{label_str}{sep}le="+Inf"}} {hist.count}')
+                lines.append(f"{metric}_duration_seconds_sum{{{label_str}}} {hist.total:.6f}")
+                lines.append(f"{metric}_duration_seconds_count{{{label_str}}} {hist.count}")
+
+            seen.clear()
+            for (metric, labels), hist in series:
+                if metric not in seen:
+                    seen.add(metric)
+                    lines.append(f"# HELP {metric}_errors_total Calls that raised.")
+                    lines.append(f"# TYPE {metric}_errors_total counter")
+                label_str = ",".join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f"{metric}_errors_total{{{label_str}}} {hist.errors}")
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+@contextmanager
+def track_latency(metric: str = EXTERNAL_METRIC, **labels):
+    """Times the enclosed block into `registry`; exceptions are counted and re-raised."""
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        registry.observe(metric, time.perf_counter() - started, error, **labels)
+
+def timed(metric: str = NODE_METRIC, **labels):
+    """Decorator form of `track_latency` for sync and async callables."""
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with track_latency(metric, **labels):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with track_latency(metric, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def render_prometheus() -> str:
+    return registry.render_prometheus()
@@ -0,0 +1,121 @@
+import os
+import io
+import json
+import time
+import uuid
+import pstats
+import cProfile
+import threading
+import tracemalloc
+import contextvars
+import logging
+from datetime import datetime
+
+logger = logging.getLogger("profiler")
+
+_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(_root, "profiles"))
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "25"))
+
+_active = contextvars.ContextVar("profiling_active", default=False)
+
+def profiling_active() -> bool:
+    """True while the current thread is executing a profiled node.
+
+    Code that normally fans work out to other threads (e.g. the specialist pool)
+    checks this and runs inline instead, so cProfile sees the real work.
+    """
+    return _active.get()
+
+class RunProfiler:
+    """
+    Captures cProfile stats and tracemalloc peak allocations per LangGraph node
+    for a single graph run, then writes `<node>.prof` files plus a top-N summary.
+
+    Nodes are serialized while profiling so neither the per-thread profiler nor
+    the process-wide tracemalloc peak mixes work from concurrent branches.
+    Pass it to a graph run via `config={"configurable": {"profiler": profiler}}`.
+    """
+    def __init__(self, label: str = "run", output_dir: str = PROFILE_DIR, top_n: int = PROFILE_TOP_N):
+        self.run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{label}_{uuid.uuid4().hex[:6]}"
+        self.output_dir = os.path.join(output_dir, self.run_id)
+        self.top_n = top_n
+        self.nodes = {}
+        self._lock = threading.Lock()
+        self._started_tracemalloc = not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+
+    def run_node(self, node_name: str, fn, *args, **kwargs):
+        with self._lock:
+            profile = cProfile.Profile()
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            token = _active.set(True)
+            started = time.perf_counter()
+            profile.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profile.disable()
+                wall = time.perf_counter() - started
+                _active.reset(token)
+                current, peak = tracemalloc.get_traced_memory()
+                self.nodes[node_name] = {
+                    "profile": profile,
+                    "wall_time_s": round(wall, 4),
+                    "peak_alloc_bytes": max(0, peak - baseline),
+                    "retained_bytes": current - baseline,
+                }
+
+    def write_report(self) -> str:
+        """Dumps pstats files and summary.txt / summary.json. Returns the report directory."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        summary = {"run_id": self.run_id, "nodes": {}}
+        text = [f"Profile report {self.run_id}", "=" * 60]
+        for node_name, data in self.nodes.items():
+            prof_path = os.path.join(self.output_dir, f"{node_name}.prof")
+            data["profile"].dump_stats(prof_path)
+
+            stream = io.StringIO()
+            stats = pstats.Stats(data["profile"], stream=stream)
+            stats.sort_stats("cumulative").print_stats(self.top_n)
+
+            summary["nodes"][node_name] = {
+                "wall_time_s": data["wall_time_s"],
+                "peak_alloc_bytes": data["peak_alloc_bytes"],
+                "retained_bytes": data["retained_bytes"],
+                "total_calls": stats.total_calls,
+                "pstats_file": prof_path,
+            }
+            text.append(
+                f"\n[{node_name}] wall {data['wall_time_s']}s | "
+                f"peak alloc {data['peak_alloc_bytes'] / 1024:.1f} KiB | "
+                f"calls {stats.total_calls}"
+            )
+            text.append(stream.getvalue())
+
+        with open(os.path.join(self.output_dir, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        with open(os.path.join(self.output_dir, "summary.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(text))
+
+        logger.info(f"Profile report written to {self.output_dir}")
+        return self.output_dir
+
+def profiled(node_name: str, fn):
+    """
+    Wraps a sync graph node so that, when the run's config carries a
+    RunProfiler, the node executes under it. Otherwise the node runs untouched.
+    """
+    def node(state, config=None):
+        profiler = ((config or {}).get("configurable") or {}).get("profiler")
+        if profiler is None:
+            return fn(state)
+        return profiler.run_node(node_name, fn, state)
+    node.__name__ = getattr(fn, "__name__", node_name)
+    node.__doc__ = fn.__doc__
+    return node
@@ -1,12 +1,23 @@
 import sqlite3
 import os
+import sys
 import logging
 from datetime import datetime
 
+# Inject Phase 4 path so audit writes show up in the latency metrics
+_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_phase4 = os.path.join(_root, "Phase_4_Risk_And_Observability")
+if _phase4 not in sys.path:
+    sys.path.insert(0, _phase4)
+
+from core.metrics import track_latency
+
 logger = logging.getLogger("audit_logger")
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "audit_logs.db")
 
+_db_ready = False
+
 def init_db():
     """Initializes the completely free local SQLite database for compliance trailing."""
     conn = sqlite3.connect(DB_PATH)
@@ -26,26 +37,32 @@ def init_db():
     conn.close()
     logger.debug("Audit Database Initialized.")
 
+def _ensure_db():
+    """Creates the table on first write instead of as an import side effect."""
+    global _db_ready
+    if not _db_ready:
+        init_db()
+        _db_ready = True
+
 def log_execution(algo_id: str, ticker: str, action: str, executed: bool, rejection_reason: str = ""):
     """Writes the graph outcome to the immutable local log."""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        timestamp = datetime.now().isoformat()
-        
-        cursor.execute(
-            '''INSERT INTO executions (timestamp, algo_id, ticker, action, rejection_reason, executed) 
-               VALUES (?, ?, ?, ?, ?, ?)''',
-            (timestamp, algo_id, ticker, action, rejection_reason, executed)
-        )
-        
-        conn.commit()
-        conn.close()
+        _ensure_db()
+        with track_latency(service="sqlite", operation="audit_insert"):
+            conn = sqlite3.connect(DB_PATH)
+            cursor = conn.cursor()
+            
+            timestamp = datetime.now().isoformat()
+            
+            cursor.execute(
+                '''INSERT INTO executions (timestamp, algo_id, ticker, action, rejection_reason, executed) 
+                   VALUES (?, ?, ?, ?, ?, ?)''',
+                (timestamp, algo_id, ticker, action, rejection_reason, executed)
+            )
+            
+            conn.commit()
+            conn.close()
         logger.info(f"Successfully logged Algo ID {algo_id} to local DB.")
         
     except Exception as e:
         logger.error(f"Failed to log execution to SQLite: {str(e)}")
-
-# Ensure the DB is created on import
-init_db()
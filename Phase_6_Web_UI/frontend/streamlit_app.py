@@ -1,13 +1,26 @@
+import os
+import re
+import sys
 import streamlit as st
 import time
 import random
 import hashlib
 import yfinance as yf
-import io
-import requests
-import pandas as pd
 
-NSE_EQUITY_URL = "https://nsearchives.nseindia.com/content/equities/EQUITY_L.csv"
+# Inject Phase 2 path so the UI reads bars from the shared local market store
+_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_phase2 = os.path.join(_root, "Phase_2_Data_Connectivity")
+if _phase2 not in sys.path:
+    sys.path.insert(0, _phase2)
+
+from data_connectors.yfinance_data import get_quote
+from data_connectors.universe_loader import load_universe
+from data_connectors.ticker_search import TickerSearchIndex
+
+DEFAULT_QUERY = "RELIANCE"
+SEARCH_RESULTS = 20
+# A query with no universe match is analysed as-is when it looks like a symbol (e.g. "NEWCO.NS")
+SYMBOL_PATTERN = re.compile(r"^[A-Z0-9&_-]{1,20}(\.[A-Z]{1,3})?$")
 
 FALLBACK_STOCKS = [
     {"ticker": "RELIANCE.NS", "name": "Reliance Industries Limited"},
@@ -27,28 +40,23 @@ FALLBACK_STOCKS = [
     {"ticker": "MARUTI.NS", "name": "Maruti Suzuki India Limited"},
 ]
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def load_universe():
-    """Fetch the live NSE equity list from the official NSE CSV.
-    Falls back to a hardcoded list of major stocks if the download fails."""
+@st.cache_resource(ttl=3600)  # Rebuilt at most hourly; the loader itself revalidates daily
+def load_search_index():
+    """Ticker search index over the shared universe snapshot (NSE list is conditionally refreshed).
+    Falls back to a hardcoded list of major stocks if nothing can be loaded."""
+    universe = load_universe()
+    if len(universe["ticker"]):
+        return TickerSearchIndex(universe["ticker"].tolist(), universe["name"].tolist())
+    st.warning("Could not fetch live NSE stock list (using fallback).")
+    return TickerSearchIndex([s["ticker"] for s in FALLBACK_STOCKS], [s["name"] for s in FALLBACK_STOCKS])
+
+@st.cache_data(ttl=86400)
+def load_company_name(ticker):
+    """Company names do not change intraday, so `.info` is fetched once a day per ticker."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        res = requests.get(NSE_EQUITY_URL, headers=headers, timeout=10)
-        res.raise_for_status()
-        df = pd.read_csv(io.StringIO(res.text))
-        stocks = []
-        for _, row in df.iterrows():
-            symbol = str(row.get('SYMBOL', '')).strip()
-            name = str(row.get('NAME OF COMPANY', '')).strip()
-            if symbol and name:
-                stocks.append({"name": name, "ticker": f"{symbol}.NS"})
-        if stocks:
-            return stocks
-    except Exception as e:
-        st.warning(f"Could not fetch live NSE stock list (using fallback): {e}")
-    return FALLBACK_STOCKS
+        return yf.Ticker(ticker).info.get('longName', ticker)
+    except Exception:
+        return ticker
 
 # Basic configuration
 st.set_page_config(
@@ -110,43 +118,32 @@ def main():
         "Trade at your own risk."
     )
     
-    universe = load_universe()
-    if universe:
-        options = [f"{item['name']} ({item['ticker']})" for item in universe]
-        # Default to Reliance if it exists in the list
-        default_index = 0
-        for i, opt in enumerate(options):
-            if "RELIANCE.NS" in opt:
-                default_index = i
-                break
-                
-        selected_display = st.selectbox("Search and Select a Stock:", options=options, index=default_index)
-        
-        # Extract just the ticker symbol from inside the parentheses
-        if selected_display:
-            ticker = selected_display.split('(')[-1].replace(')', '').strip()
-        else:
-            ticker = ""
+    index = load_search_index()
+    # Only the top matches are rendered; each option already is the ticker
+    query = st.text_input("Search for a stock (name or symbol):", value=DEFAULT_QUERY)
+    matches = index.search(query, k=SEARCH_RESULTS)
+    if matches:
+        ticker = st.selectbox("Select a Stock:", options=[m["ticker"] for m in matches], format_func=index.label)
+    elif SYMBOL_PATTERN.match(query.upper().strip()):
+        ticker = query.upper().strip()
+        st.caption(f"'{ticker}' is not in the stock list; analysing it as a symbol.")
     else:
-        # Fallback if the JSON file wasn't built yet
-        ticker = st.text_input("Enter Stock Symbol (e.g., RELIANCE.NS, INFY.NS):", value="RELIANCE.NS").upper().strip()
+        st.info(f"No stocks match '{query}'.")
+        ticker = ""
     
     if ticker:
         with st.spinner(f"Fetching live market data for {ticker}..."):
             try:
-                stock = yf.Ticker(ticker)
-                info = stock.info
-                current_price = info.get('currentPrice', info.get('regularMarketPrice', 0.0))
-                company_name = info.get('longName', ticker)
+                company_name = load_company_name(ticker)
                 
-                # Fetch recent history for OHLCV
-                hist = stock.history(period="1d")
-                if not hist.empty:
-                    latest = hist.iloc[-1]
-                    open_px = latest["Open"]
-                    high_px = latest["High"]
-                    low_px = latest["Low"]
-                    volume = latest["Volume"]
+                # Latest quote from the shared short-TTL quote cache (reruns within the TTL cost nothing)
+                bar = get_quote(ticker)
+                current_price = bar.get("current_price", 0.0)
+                if "error" not in bar:
+                    open_px = bar["open"]
+                    high_px = bar["high"]
+                    low_px = bar["low"]
+                    volume = bar["volume"]
                 else:
                     open_px, high_px, low_px, volume = 0.0, 0.0, 0.0, 0
                 
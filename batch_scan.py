@@ -0,0 +1,222 @@
+"""
+Universe-wide batch scan for the master graph.
+
+Runs the compiled `master_app` over many tickers on a bounded worker pool
+(threads or processes). Submission is throttled to `max_in_flight` so a 2000+
+symbol universe never sits in memory as pending futures, every ticker is
+isolated (one failure never aborts the scan), and each result is appended to a
+JSONL file the moment it finishes.
+
+With `--prefetch`, bars for the whole universe are pulled with batched
+downloads and indicators are computed in one vectorized pass up front; every
+graph run then starts from that pre-seeded market data instead of fetching.
+Headlines are scraped concurrently and scored locally in one batch too, so
+the sentiment branch can skip Groq for tickers with decisive news.
+
+Usage:
+    python batch_scan.py --universe                     # ticker_universe.json
+    python batch_scan.py --tickers RELIANCE.NS,TCS.NS --workers 4
+    python batch_scan.py --universe my_list.json --executor process --output scan.jsonl
+    python batch_scan.py --universe --prefetch
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+root_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, root_dir)
+
+import master_orchestrator
+from core.state import MarketData
+from data_connectors.universe_builder import UNIVERSE_PATH
+from data_connectors.yfinance_data import fetch_live_ohlcv_many
+from data_connectors.indicators import compute_indicators
+from data_connectors.news_fetcher import iter_headlines
+from data_connectors.sentiment_scorer import sentiment_scorer
+
+logger = logging.getLogger("batch_scan")
+
+DEFAULT_OUTPUT_PATH = os.path.join(root_dir, "scan_results.jsonl")
+
+def load_tickers(source: str = UNIVERSE_PATH) -> list:
+    """
+    Reads tickers from the universe JSON written by `build_market_universe`
+    (a list of {"ticker": ...} records), a JSON list of plain symbols, or a
+    newline-separated text file.
+    """
+    with open(source, "r", encoding="utf-8") as f:
+        if source.endswith(".json"):
+            entries = json.load(f)
+            return [e["ticker"] if isinstance(e, dict) else str(e) for e in entries]
+        return [line.strip() for line in f if line.strip()]
+
+def prefetch_market_data(tickers: list) -> dict:
+    """
+    Batched OHLCV download plus one indicator pass over the whole list.
+    Returns {ticker: MarketData}; tickers whose download failed are left out
+    so their graph run fetches (and reports) on its own.
+    """
+    bars = fetch_live_ohlcv_many(tickers)
+    ok = [t for t in tickers if "error" not in bars.get(t, {"error": None})]
+    indicators = compute_indicators(ok)
+    return {
+        t: MarketData(ticker=t, current_price=bars[t]["current_price"],
+                      technical_indicators={**bars[t], **indicators[t]})
+        for t in ok
+    }
+
+def prefetch_headlines(tickers: list) -> dict:
+    """
+    Scrapes headlines for every ticker concurrently (filling the per-ticker
+    headline cache the sentiment node reads) and scores them in one batch.
+    Returns {ticker: local sentiment}; tickers whose scrape failed are left out.
+    """
+    async def collect():
+        return {t: r["headlines"] async for t, r in iter_headlines(tickers) if "error" not in r}
+
+    try:
+        return sentiment_scorer.score_tickers(asyncio.run(collect()))
+    except Exception as e:
+        logger.warning(f"Headline prefetch failed: {str(e)}")
+        return {}
+
+def _scan_one(ticker: str, market_data: MarketData = None) -> dict:
+    """Worker entry point. Never raises, so a bad ticker cannot take down the pool."""
+    started = time.perf_counter()
+    try:
+        state = master_orchestrator.master_app.invoke(
+            master_orchestrator.build_initial_state(ticker, market_data=market_data)
+        )
+        record = master_orchestrator.summarize_final_state(state)
+        record["status"] = "success"
+    except Exception as e:
+        record = {"ticker": ticker, "status": "error", "error": str(e)}
+    record["latency_s"] = round(time.perf_counter() - started, 4)
+    return record
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+def run_batch_scan(tickers: list, workers: int = 8, executor: str = "thread",
+                   output_path: str = DEFAULT_OUTPUT_PATH, max_in_flight: int = None,
+                   prefetch: bool = False) -> dict:
+    """
+    Scans `tickers` through the master graph and returns a throughput/latency summary.
+
+    `executor` is "thread" (cheap, shares one compiled graph and model) or
+    "process" (sidesteps the GIL for CPU-bound embedding work, each worker
+    imports its own graph). At most `max_in_flight` tickers are queued at once.
+    `prefetch` seeds every run with market data from `prefetch_market_data` and
+    headlines from `prefetch_headlines` (thread executor only: the cache is per process).
+    """
+    max_in_flight = max_in_flight or workers * 2
+    seeded = {}
+    if prefetch:
+        prefetch_started = time.perf_counter()
+        seeded = prefetch_market_data(tickers)
+        scored = prefetch_headlines(tickers)
+        logger.info(f"Prefetched market data for {len(seeded)}/{len(tickers)} and headlines for "
+                    f"{len(scored)}/{len(tickers)} tickers in {time.perf_counter() - prefetch_started:.2f}s")
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    latencies = []
+    succeeded = failed = 0
+
+    logger.info(f"Batch scan: {len(tickers)} tickers | {workers} {executor} workers | max in-flight {max_in_flight}")
+    started = time.perf_counter()
+
+    with pool_cls(max_workers=workers) as pool, open(output_path, "w", encoding="utf-8") as out:
+        pending = set()
+        ticker_iter = iter(tickers)
+        exhausted = False
+
+        while pending or not exhausted:
+            # Back-pressure: only top up the queue while below the in-flight cap
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    ticker = next(ticker_iter)
+                    pending.add(pool.submit(_scan_one, ticker, seeded.get(ticker)))
+                except StopIteration:
+                    exhausted = True
+
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                out.write(json.dumps(record, default=str) + "\n")
+                out.flush()
+
+                latencies.append(record["latency_s"])
+                if record["status"] == "success":
+                    succeeded += 1
+                else:
+                    failed += 1
+                    logger.warning(f"{record['ticker']} failed: {record.get('error')}")
+
+    wall_time = time.perf_counter() - started
+    latencies.sort()
+    total = succeeded + failed
+    return {
+        "tickers": total,
+        "succeeded": succeeded,
+        "failed": failed,
+        "wall_time_s": round(wall_time, 3),
+        "throughput_per_s": round(total / wall_time, 3) if wall_time > 0 else 0.0,
+        "latency_mean_s": round(sum(latencies) / total, 4) if total else 0.0,
+        "latency_p50_s": _percentile(latencies, 50),
+        "latency_p95_s": _percentile(latencies, 95),
+        "latency_max_s": latencies[-1] if latencies else 0.0,
+        "output_path": output_path,
+    }
+
+def print_summary(summary: dict):
+    print("\n" + "="*50)
+    print("--- BATCH SCAN SUMMARY ---")
+    print("="*50)
+    print(f"Tickers:     {summary['tickers']} ({summary['succeeded']} ok, {summary['failed']} failed)")
+    print(f"Wall time:   {summary['wall_time_s']}s")
+    print(f"Throughput:  {summary['throughput_per_s']} tickers/s")
+    print(f"Latency:     mean {summary['latency_mean_s']}s | p50 {summary['latency_p50_s']}s | "
+          f"p95 {summary['latency_p95_s']}s | max {summary['latency_max_s']}s")
+    print(f"Results:     {summary['output_path']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the master graph across a ticker universe.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--tickers", help="Comma-separated tickers, e.g. RELIANCE.NS,TCS.NS")
+    source.add_argument("--universe", nargs="?", const=UNIVERSE_PATH,
+                        help="Universe JSON or text file (defaults to ticker_universe.json)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument("--limit", type=int, default=None, help="Only scan the first N tickers")
+    parser.add_argument("--prefetch", action="store_true",
+                        help="Batch-download bars, compute indicators and score headlines for all tickers before scanning")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_PATH)
+    args = parser.parse_args(argv)
+
+    if args.tickers:
+        tickers = [t.strip() for t in args.tickers.split(",") if t.strip()]
+    else:
+        tickers = load_tickers(args.universe)
+    if args.limit:
+        tickers = tickers[:args.limit]
+
+    summary = run_batch_scan(tickers, workers=args.workers, executor=args.executor,
+                             output_path=args.output, max_in_flight=args.max_in_flight,
+                             prefetch=args.prefetch)
+    print_summary(summary)
+    return summary
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
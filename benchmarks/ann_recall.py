@@ -0,0 +1,81 @@
+"""
+Recall / latency sweep for the cross-ticker IVF index against exact search.
+
+Builds an index over a synthetic clustered corpus (see
+`stubs.make_clustered_embeddings`), then for each `nprobe` reports recall@k
+versus brute force and the median query latency.
+
+Usage:
+    python benchmarks/ann_recall.py [--n 20000] [--k 10] [--nprobe 1,2,4,8,16,32] [--output ann.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(bench_dir)
+sys.path.insert(0, bench_dir)
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+
+import stubs
+from data_connectors.rag_pipeline.ann_index import IVFIndex
+
+def _median_ms(fn, queries) -> float:
+    samples = []
+    for q in queries:
+        started = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 4)
+
+def run_sweep(n: int = 20000, n_queries: int = 200, k: int = 10, nprobes=(1, 2, 4, 8, 16, 32)) -> dict:
+    # Queries come from the same topic mixture as the corpus but are not in it
+    vectors = stubs.make_clustered_embeddings(n + n_queries, seed=1)
+    corpus, queries = vectors[:n], vectors[n:]
+    index = IVFIndex(min_train=1)
+    started = time.perf_counter()
+    index.add([f"chunk_{i}" for i in range(n)], [f"T{i % 2000}.NS" for i in range(n)], corpus)
+    build_s = time.perf_counter() - started
+
+    truth = [{hit[0] for hit in index.exact_search(q, k)} for q in queries]
+    report = {
+        "n": n, "k": k, "nlist": index.nlist, "build_s": round(build_s, 3),
+        "exact_median_ms": _median_ms(lambda q: index.exact_search(q, k), queries),
+        "sweep": [],
+    }
+    for nprobe in nprobes:
+        hits = [{hit[0] for hit in index.search(q, k, nprobe=nprobe)} for q in queries]
+        recall = statistics.fmean(len(h & t) / k for h, t in zip(hits, truth))
+        report["sweep"].append({
+            "nprobe": nprobe,
+            f"recall_at_{k}": round(recall, 4),
+            "median_ms": _median_ms(lambda q: index.search(q, k, nprobe=nprobe), queries),
+        })
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IVF recall/latency sweep against exact search.")
+    parser.add_argument("--n", type=int, default=20000, help="Corpus size (chunks)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", default="1,2,4,8,16,32", help="Comma-separated nprobe values")
+    parser.add_argument("--output", help="Optional JSON path for the report")
+    args = parser.parse_args(argv)
+
+    report = run_sweep(args.n, args.queries, args.k, [int(p) for p in args.nprobe.split(",")])
+    print(f"\nIVF over {report['n']} chunks | nlist {report['nlist']} | built in {report['build_s']}s")
+    print(f"  exact search: {report['exact_median_ms']} ms median")
+    print(f"  {'nprobe':>6}  {'recall@' + str(args.k):>10}  {'median_ms':>10}  {'speedup':>8}")
+    for row in report["sweep"]:
+        speedup = report["exact_median_ms"] / row["median_ms"] if row["median_ms"] else float("inf")
+        print(f"  {row['nprobe']:>6}  {row[f'recall_at_{args.k}']:>10.4f}  {row['median_ms']:>10.4f}  {speedup:>7.1f}x")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+if __name__ == "__main__":
+    main()
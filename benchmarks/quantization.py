@@ -0,0 +1,114 @@
+"""
+Size / speed / recall trade-off of the vector store's embedding encodings.
+
+Writes the same synthetic clustered corpus (see
+`stubs.make_clustered_embeddings`) into one store per dtype, then reports the
+SQLite file size, bytes per vector, the cold per-ticker load (SQLite read +
+decode), the full-table decode, per-ticker top-k latency and recall@k of
+top-k against float32 ground truth, both within a ticker and across the
+whole corpus.
+
+Usage:
+    python benchmarks/quantization.py [--tickers 2000] [--chunks 10] [--k 3] [--output quant.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(bench_dir)
+sys.path.insert(0, bench_dir)
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+
+import stubs
+from data_connectors.rag_pipeline.vector_store import VectorStore, EMBEDDING_DTYPES, rank_top_k
+
+def _median_ms(fn, items) -> float:
+    samples = []
+    for item in items:
+        started = time.perf_counter()
+        fn(item)
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 4)
+
+def _recall(found, truth) -> float:
+    return statistics.fmean(len(set(f) & set(t)) / len(t) for f, t in zip(found, truth))
+
+def run_comparison(n_tickers: int = 2000, chunks_per_ticker: int = 10, n_queries: int = 200, k: int = 3,
+                   dtypes=EMBEDDING_DTYPES) -> dict:
+    n = n_tickers * chunks_per_ticker
+    vectors = stubs.make_clustered_embeddings(n + n_queries, seed=2)
+    corpus, queries = vectors[:n], vectors[n:]
+    tickers = [f"T{i}.NS" for i in range(n_tickers)]
+    rows = [(f"{tickers[i // chunks_per_ticker]}_chunk_{i % chunks_per_ticker}", tickers[i // chunks_per_ticker],
+             f"chunk {i}", corpus[i]) for i in range(n)]
+    # Each query is asked of one ticker, round-robin
+    asked = [(tickers[j % n_tickers], q) for j, q in enumerate(queries)]
+
+    report = {"tickers": n_tickers, "chunks": n, "k": k, "dtypes": []}
+    truth_ticker = truth_global = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for dtype in dtypes:
+            db_path = os.path.join(tmp, f"{dtype}.db")
+            store = VectorStore(db_path, dtype=dtype)
+            store.upsert_many(rows)
+            store._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+            def cold_load(ticker):
+                store.invalidate(ticker)
+                store.load(ticker)
+            load_ms = _median_ms(cold_load, tickers[:n_queries])
+            started = time.perf_counter()
+            ids, _, matrix = store.all_vectors()
+            decode_all_ms = round((time.perf_counter() - started) * 1000, 2)
+
+            for ticker in tickers:
+                store.load(ticker)
+            top_k_ms = _median_ms(lambda item: store.top_k(item[0], item[1], k), asked)
+            per_ticker = [[text for text, _ in store.top_k(t, q, k)] for t, q in asked]
+            across = [rank_top_k(matrix, q, k)[0].tolist() for q in queries]
+            if truth_ticker is None:
+                truth_ticker, truth_global = per_ticker, across
+            size = os.path.getsize(db_path)
+            report["dtypes"].append({
+                "dtype": dtype,
+                "file_mb": round(size / 1e6, 3),
+                "blob_bytes": len(store._conn.execute("SELECT embedding FROM embeddings LIMIT 1").fetchone()[0]),
+                "cold_load_ms": load_ms,
+                "decode_all_ms": decode_all_ms,
+                "top_k_ms": top_k_ms,
+                f"recall_at_{k}_ticker": round(_recall(per_ticker, truth_ticker), 4),
+                f"recall_at_{k}_global": round(_recall(across, truth_global), 4),
+            })
+            store.close()
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare float32 / float16 / int8 embedding storage.")
+    parser.add_argument("--tickers", type=int, default=2000)
+    parser.add_argument("--chunks", type=int, default=10, help="Chunks per ticker")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--output", help="Optional JSON path for the report")
+    args = parser.parse_args(argv)
+
+    report = run_comparison(args.tickers, args.chunks, args.queries, args.k)
+    k = args.k
+    print(f"\nVector store encodings | {report['tickers']} tickers, {report['chunks']} chunks, k={k}")
+    print(f"  {'dtype':>7}  {'file_mb':>8}  {'blob_b':>6}  {'load_ms':>8}  {'decode_all_ms':>13}  "
+          f"{'top_k_ms':>8}  {'recall_tkr':>10}  {'recall_all':>10}")
+    for row in report["dtypes"]:
+        print(f"  {row['dtype']:>7}  {row['file_mb']:>8.2f}  {row['blob_bytes']:>6}  {row['cold_load_ms']:>8.4f}  "
+              f"{row['decode_all_ms']:>13.2f}  {row['top_k_ms']:>8.4f}  {row[f'recall_at_{k}_ticker']:>10.4f}  "
+              f"{row[f'recall_at_{k}_global']:>10.4f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+if __name__ == "__main__":
+    main()
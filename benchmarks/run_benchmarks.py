@@ -0,0 +1,263 @@
+"""
+Offline micro-benchmarks for the hot paths of the pipeline.
+
+yfinance, Groq, the embedding model and the shared HTTP client's transport are
+replaced by the deterministic stand-ins in `benchmarks/stubs.py`, and every
+SQLite file (and the HTTP response cache) is redirected to a temporary
+directory, so runs are repeatable and never touch the network or the real
+stores. Results are written as JSON (one file per commit by default) so
+two runs can be diffed with `--compare`.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--only ingest,query] [--repeat 20]
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<old>.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+
+bench_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(bench_dir)
+RESULTS_DIR = os.path.join(bench_dir, "results")
+
+sys.path.insert(0, bench_dir)
+sys.path.insert(0, root_dir)
+
+import numpy as np
+import stubs
+
+stubs.install()
+os.environ.setdefault("GROQ_API_KEY", "bench-stub-key")
+
+import master_orchestrator
+from data_connectors.rag_pipeline import ingest
+from data_connectors.rag_pipeline.vector_store import normalize_rows, rank_top_k
+from data_connectors.rag_pipeline.ann_index import IVFIndex
+from data_connectors import yfinance_data, news_fetcher
+from data_connectors.http_client import http_client
+from core.risk_manager import evaluate_portfolio_risk
+from compliance import audit_logger
+from data_connectors.market_store import MarketStore
+from data_connectors.indicators import compute_indicator_arrays
+from data_connectors.incremental_indicators import IndicatorState
+from agents.fundamental.fa_agent import FA_RAG_QUERY
+
+BENCH_TICKER = "RELIANCE.NS"
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=root_dir, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def _isolate_stores(tmp_dir: str):
+    """Points every SQLite-backed module and the HTTP response cache at a scratch directory."""
+    ingest.DB_PATH = os.path.join(tmp_dir, "vector_store.db")
+    ingest._EMBED_MODEL = stubs.HashingEncoder()
+    audit_logger.DB_PATH = os.path.join(tmp_dir, "audit_logs.db")
+    audit_logger._db_ready = False
+    yfinance_data.market_store = MarketStore(os.path.join(tmp_dir, "market_store"))
+    yfinance_data.quote_cache.invalidate()
+    stubs.install_http(http_client, os.path.join(tmp_dir, "http_cache"))
+    news_fetcher.invalidate()
+
+def measure(fn, repeat: int, warmup: int = 1) -> dict:
+    """Runs `fn` warmup + repeat times and returns latency stats in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "repeat": repeat,
+        "min_ms": round(samples[0], 4),
+        "median_ms": round(statistics.median(samples), 4),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 4),
+        "max_ms": round(samples[-1], 4),
+    }
+
+# ─────────────────────────────────────────────
+# Benchmarks: each returns a zero-arg callable
+# ─────────────────────────────────────────────
+
+def bench_ingest():
+    return lambda: ingest.ingest_stock_fundamentals(BENCH_TICKER)
+
+def bench_ingest_many(n_tickers: int = 100):
+    tickers = [f"BULK{i}.NS" for i in range(n_tickers)]
+    return lambda: ingest.ingest_many_fundamentals(tickers)
+
+def bench_query():
+    ingest.ingest_stock_fundamentals(BENCH_TICKER)
+    return lambda: ingest.query_fundamentals(BENCH_TICKER, FA_RAG_QUERY)
+
+def bench_cosine_ranking(n_chunks: int = 1000, n_results: int = 3):
+    """Ranks `n_chunks` stored embeddings the way query_fundamentals does (matvec + argpartition)."""
+    rng = np.random.default_rng(7)
+    vectors = normalize_rows(rng.standard_normal((n_chunks, stubs.EMBED_DIM)))
+    query = rng.standard_normal(stubs.EMBED_DIM).astype(np.float32)
+    return lambda: rank_top_k(vectors, query, n_results)
+
+def bench_ann_search(n_chunks: int = 20000, k: int = 10):
+    """Cross-ticker IVF search at the default nprobe (see ann_recall.py for the recall sweep)."""
+    vectors = stubs.make_clustered_embeddings(n_chunks + 1, seed=1)
+    index = IVFIndex(min_train=1)
+    index.add([f"chunk_{i}" for i in range(n_chunks)], [f"T{i % 2000}.NS" for i in range(n_chunks)], vectors[:-1])
+    return lambda: index.search(vectors[-1], k)
+
+def bench_fetch_ohlcv():
+    return lambda: yfinance_data.fetch_live_ohlcv(BENCH_TICKER)
+
+def bench_quote_cache_hit():
+    yfinance_data.get_quote(BENCH_TICKER)
+    return lambda: yfinance_data.get_quote(BENCH_TICKER)
+
+def bench_sync_history():
+    """Forced refresh: one delta download merged into the local store."""
+    return lambda: yfinance_data.sync_history(BENCH_TICKER, force=True)
+
+def bench_store_read():
+    yfinance_data.sync_history(BENCH_TICKER, force=True)
+    return lambda: float(yfinance_data.market_store.read(BENCH_TICKER)["close"].mean())
+
+def bench_fetch_ohlcv_many(n_tickers: int = 500):
+    tickers = [f"T{i}.NS" for i in range(n_tickers)]
+    return lambda: yfinance_data.fetch_live_ohlcv_many(tickers)
+
+def bench_indicator_panel(n_tickers: int = 2000, n_bars: int = 260):
+    """One vectorized indicator pass over a universe-sized (tickers x bars) panel."""
+    rng = np.random.default_rng(11)
+    close = 100 + np.cumsum(rng.normal(0, 1, (n_tickers, n_bars)), axis=1)
+    panel = {"close": close, "high": close + 1, "low": close - 1}
+    return lambda: compute_indicator_arrays(panel)
+
+def bench_incremental_bar():
+    """One bar absorbed by a warmed-up incremental indicator state."""
+    state = IndicatorState()
+    for i in range(300):
+        state.update(i * 60, 100.0, 101.0, 99.0, 100.0 + (i % 7), 1000)
+    counter = iter(range(300, 10**9))
+
+    def run():
+        i = next(counter)
+        state.update(i * 60, 100.0, 101.0, 99.0, 100.0 + (i % 7), 1000)
+    return run
+
+def bench_risk():
+    insights = [{"agent_name": f"agent_{i}", "confidence_score": 0.8} for i in range(3)]
+    return lambda: evaluate_portfolio_risk(BENCH_TICKER, "BUY", insights)
+
+def bench_audit_insert():
+    counter = iter(range(10**9))
+    return lambda: audit_logger.log_execution(f"BENCH-{next(counter)}", BENCH_TICKER, "BUY", False, "benchmark")
+
+def bench_fetch_headlines():
+    """One news page through the shared HTTP client (disk-cached after the first call) plus parsing."""
+    def run():
+        news_fetcher.invalidate(BENCH_TICKER)
+        return news_fetcher.fetch_headlines(BENCH_TICKER)
+    return run
+
+def bench_master_invoke():
+    app = master_orchestrator.get_master_app()
+    return lambda: app.invoke(master_orchestrator.build_initial_state(BENCH_TICKER))
+
+BENCHMARKS = {
+    "ingest_stock_fundamentals": (bench_ingest, 10),
+    "ingest_many_fundamentals_100": (bench_ingest_many, 5),
+    "query_fundamentals": (bench_query, 50),
+    "cosine_ranking_1k": (bench_cosine_ranking, 20),
+    "ann_search_20k": (bench_ann_search, 200),
+    "fetch_live_ohlcv": (bench_fetch_ohlcv, 50),
+    "quote_cache_hit": (bench_quote_cache_hit, 1000),
+    "sync_history_delta": (bench_sync_history, 50),
+    "market_store_read": (bench_store_read, 200),
+    "fetch_live_ohlcv_many_500": (bench_fetch_ohlcv_many, 5),
+    "indicators_2000x260": (bench_indicator_panel, 5),
+    "incremental_indicator_bar": (bench_incremental_bar, 1000),
+    "evaluate_portfolio_risk": (bench_risk, 1000),
+    "log_execution_insert": (bench_audit_insert, 50),
+    "fetch_headlines": (bench_fetch_headlines, 50),
+    "master_app_invoke": (bench_master_invoke, 10),
+}
+
+def run_benchmarks(only=None, repeat=None) -> dict:
+    names = only or list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s) {unknown}. Available: {list(BENCHMARKS)}")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="trade_today_bench_") as tmp_dir:
+        _isolate_stores(tmp_dir)
+        for name in names:
+            factory, default_repeat = BENCHMARKS[name]
+            print(f"[Bench] {name} ...", flush=True)
+            results[name] = measure(factory(), repeat or default_repeat)
+        # Persist the ANN index while the scratch directory still exists (not at interpreter exit)
+        ingest.flush_ann_index()
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+def print_results(report: dict, baseline: dict = None):
+    print("\n" + "="*72)
+    print(f"--- BENCHMARKS @ {report['commit']} ---")
+    print("="*72)
+    header = f"  {'benchmark':<28} {'median ms':>11} {'p95 ms':>10}"
+    if baseline:
+        header += f" {'base median':>12} {'ratio':>7}"
+    print(header)
+    for name, stats in report["results"].items():
+        line = f"  {name:<28} {stats['median_ms']:>11.3f} {stats['p95_ms']:>10.3f}"
+        base = (baseline or {}).get("results", {}).get(name)
+        if base:
+            ratio = stats["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+            line += f" {base['median_ms']:>12.3f} {ratio:>6.2f}x"
+        print(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline micro-benchmarks for the trade_today hot paths.")
+    parser.add_argument("--only", help=f"Comma-separated subset of: {','.join(BENCHMARKS)}")
+    parser.add_argument("--repeat", type=int, help="Override the per-benchmark repeat count")
+    parser.add_argument("--output", help="Result JSON path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Baseline result JSON to compare medians against")
+    args = parser.parse_args(argv)
+
+    only = [n.strip() for n in args.only.split(",")] if args.only else None
+    report = run_benchmarks(only=only, repeat=args.repeat)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(report, baseline)
+    print(f"\nResults written to {output}")
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Deterministic local stand-ins for the external services used by the benchmarks:
+yfinance (Ticker.info / Ticker.history / download), Groq (ChatGroq), the
+SentenceTransformer embedding model and the HTTP transport behind the shared
+`http_client` (Yahoo news pages). Nothing here touches the network.
+"""
+import re
+import sys
+import types
+import hashlib
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+EMBED_DIM = 384
+
+def _seed(text: str) -> int:
+    return int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+
+def make_history(ticker: str, days: int = 5) -> pd.DataFrame:
+    """Reproducible daily OHLCV frame shaped like `yf.Ticker(...).history()`."""
+    rng = np.random.default_rng(_seed(ticker))
+    close = 1000 + np.cumsum(rng.normal(0, 10, days))
+    index = pd.date_range(end=pd.Timestamp("2026-10-16", tz="Asia/Kolkata"), periods=days, freq="B")
+    return pd.DataFrame({
+        "Open": close - rng.uniform(0, 5, days),
+        "High": close + rng.uniform(0, 10, days),
+        "Low": close - rng.uniform(0, 10, days),
+        "Close": close,
+        "Volume": rng.integers(100_000, 5_000_000, days),
+        "Dividends": 0.0,
+        "Stock Splits": 0.0,
+    }, index=index)
+
+def make_info(ticker: str) -> dict:
+    rng = np.random.default_rng(_seed(ticker))
+    return {
+        "longName": f"{ticker.split('.')[0].title()} Limited",
+        "sector": "Energy", "industry": "Oil & Gas Refining & Marketing",
+        "marketCap": int(rng.integers(10**11, 10**13)), "trailingPE": float(rng.uniform(8, 60)),
+        "priceToBook": float(rng.uniform(1, 10)), "trailingEps": float(rng.uniform(5, 200)),
+        "totalRevenue": int(rng.integers(10**10, 10**12)), "profitMargins": float(rng.uniform(0.02, 0.3)),
+        "debtToEquity": float(rng.uniform(0, 150)), "returnOnEquity": float(rng.uniform(0.02, 0.4)),
+        "dividendYield": float(rng.uniform(0, 0.05)), "beta": float(rng.uniform(0.5, 1.5)),
+        "fiftyTwoWeekHigh": 1500.0, "fiftyTwoWeekLow": 900.0, "targetMeanPrice": 1400.0,
+        "recommendationKey": "buy",
+        "longBusinessSummary": " ".join(["The company refines crude oil and operates retail outlets."] * 20),
+    }
+
+class StubTicker:
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+        self.info = make_info(ticker)
+
+    def history(self, period: str = "5d", interval: str = "1d", start=None, **kwargs) -> pd.DataFrame:
+        days = {"1d": 1, "5d": 5, "1mo": 21, "3mo": 63, "6mo": 126, "1y": 252}.get(period, 252)
+        return make_history(self.ticker, days)
+
+def stub_download(tickers, period: str = "5d", group_by: str = "ticker", **kwargs) -> pd.DataFrame:
+    symbols = tickers.split() if isinstance(tickers, str) else list(tickers)
+    frames = {t: StubTicker(t).history(period=period) for t in symbols}
+    data = pd.concat(frames, axis=1)
+    # Like yf.download (ignore_tz=True), daily bars come back without the exchange zone
+    if data.index.tz is not None:
+        data.index = data.index.tz_localize(None)
+    return data
+
+class HashingEncoder:
+    """Drop-in for SentenceTransformer.encode: deterministic pseudo-embeddings per text."""
+    def encode(self, texts, **kwargs):
+        return np.stack([
+            np.random.default_rng(_seed(t)).standard_normal(EMBED_DIM).astype(np.float32) for t in texts
+        ])
+
+def make_clustered_embeddings(n: int, dim: int = EMBED_DIM, topics: int = 200, noise: float = 0.6,
+                              seed: int = 0) -> np.ndarray:
+    """Unit vectors drawn around `topics` centres, a rough stand-in for a real sentence-embedding corpus."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((topics, dim))
+    vectors = centres[rng.integers(0, topics, n)] + noise * rng.standard_normal((n, dim))
+    vectors = vectors.astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+_NEWS_PATH = re.compile(r"/quote/([^/]+)/news")
+
+class StubTransport(BaseAdapter):
+    """requests transport: Yahoo news URLs get a fixed headline page per ticker, anything else a 404."""
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        match = _NEWS_PATH.search(request.url)
+        if match:
+            ticker = match.group(1)
+            body = "".join(f'<h3 class="clamp">{ticker} headline {i}: quarterly results in focus</h3>' for i in range(5))
+            response.status_code, response._content = 200, body.encode("utf-8")
+        else:
+            response.status_code, response._content = 404, b""
+        response.headers = CaseInsensitiveDict({"Content-Type": "text/html; charset=utf-8"})
+        response.encoding, response.url, response.request = "utf-8", request.url, request
+        return response
+
+    def close(self):
+        pass
+
+def install_http(client, cache_dir: str):
+    """Points a `HttpClient` at `StubTransport` and keeps its response cache under `cache_dir`."""
+    from data_connectors.http_client import ResponseCache
+    client.cache = ResponseCache(cache_dir)
+    transport = StubTransport()
+    client.session.mount("https://", transport)
+    client.session.mount("http://", transport)
+
+def install(groq_response: str = "Bullish. P/E and ROE look healthy relative to peers."):
+    """Registers the stand-ins in sys.modules. Call before anything imports yfinance/langchain_groq."""
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    yf = types.ModuleType("yfinance")
+    yf.Ticker = StubTicker
+    yf.download = stub_download
+    sys.modules["yfinance"] = yf
+
+    class StubChatGroq(FakeListChatModel):
+        def __init__(self, **kwargs):
+            super().__init__(responses=[groq_response])
+
+    groq = types.ModuleType("langchain_groq")
+    groq.ChatGroq = StubChatGroq
+    sys.modules["langchain_groq"] = groq
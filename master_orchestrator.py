@@ -1,6 +1,10 @@
 import os
 import sys
+import time
+import asyncio
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
 # 1. PATH RESOLUTION: Inject all Phase directories into sys.path
 # This is the critical fix for the fragmented architecture.
@@ -16,45 +20,178 @@ for phase in phases:
     sys.path.insert(0, os.path.join(root_dir, phase))
 
 # Now we can safely import across modules!
-from langgraph.graph import StateGraph, END
+# (langgraph, langchain_groq, yfinance and sentence_transformers are imported lazily
+#  on first use; see get_master_app() and warm_up())
 from core.state import AnalystState, MarketData
+from core.single_flight import SingleFlight, analysis_key
 
 # Import actual logic from other phases
-from agents.technical.ta_agent import run_technical_analysis
-from agents.fundamental.fa_agent import run_fundamental_analysis
-from agents.sentiment.sentiment_agent import run_sentiment_analysis
+from agents.technical.ta_agent import run_technical_analysis, arun_technical_analysis
+from agents.fundamental.fa_agent import run_fundamental_analysis, arun_fundamental_analysis, FA_RAG_QUERY
+from agents.sentiment.sentiment_agent import run_sentiment_analysis, arun_sentiment_analysis
 from core.risk_manager import evaluate_portfolio_risk
+from core.metrics import registry as metrics_registry, timed
+from core.profiler import RunProfiler, PROFILE_DIR, profiled, profiling_active
 from execution.order_manager import log_advisory_signal
-from data_connectors.yfinance_data import fetch_live_ohlcv
+from data_connectors.yfinance_data import get_quote, aget_quote, latest_indicators
+from data_connectors.news_fetcher import cached_headlines
 
 logger = logging.getLogger("master_orchestrator")
 
-def master_ingest_node(state: AnalystState):
-    """(Phase 2 integration)"""
-    ticker = state["active_ticker"]
-    print(f"[Master] Gathering remote OHLCV (yfinance) and Fundamentals for {ticker}...")
-    
-    ohlcv_data = fetch_live_ohlcv(ticker)
-    
+def _market_data_update(ticker: str, ohlcv_data: dict) -> dict:
     current_px = ohlcv_data.get("current_price", 0.0)
+    indicators = {} if "error" in ohlcv_data else latest_indicators(ticker)
     
     return {
-        "market_data": MarketData(ticker=ticker, current_price=current_px, technical_indicators=ohlcv_data)
+        "market_data": MarketData(ticker=ticker, current_price=current_px,
+                                  technical_indicators={**ohlcv_data, **indicators})
     }
 
-def master_specialist_node(state: AnalystState):
-    """(Phase 3 integration) Calls actual agents."""
-    print("[Master] Triggering Technical, Fundamental, and Sentiment Agents...")
+def _preseeded(state: AnalystState) -> bool:
+    """True when the caller (e.g. a batch scan) already supplied bars and indicators."""
+    market_data = state.get("market_data")
+    return market_data is not None and bool(market_data.technical_indicators)
+
+def master_ingest_node(state: AnalystState):
+    """(Phase 2 integration)"""
     ticker = state["active_ticker"]
+    if _preseeded(state):
+        print(f"[Master] Using pre-seeded market data for {ticker}.")
+        return {}
+    print(f"[Master] Gathering remote OHLCV (yfinance) and Fundamentals for {ticker}...")
     
-    # Run the real agents (these will fallback to mock data if API keys aren't set)
-    ta_res = run_technical_analysis(ticker, {"mock": "ohlcv"})
-    fa_res = run_fundamental_analysis(ticker, {"mock": "rag_docs"})
-    sa_res = run_sentiment_analysis(ticker, {"mock": "news_articles"})
+    ohlcv_data = get_quote(ticker)
+    return _market_data_update(ticker, ohlcv_data)
+
+async def amaster_ingest_node(state: AnalystState):
+    """Async ingest: the yfinance call and indicator pass are pushed off the event loop."""
+    ticker = state["active_ticker"]
+    if _preseeded(state):
+        print(f"[Master] Using pre-seeded market data for {ticker}.")
+        return {}
+    print(f"[Master] Gathering remote OHLCV (yfinance) and Fundamentals for {ticker}...")
     
-    return {
-        "agent_debates": [ta_res, fa_res, sa_res]
-    }
+    ohlcv_data = await aget_quote(ticker)
+    return await asyncio.to_thread(_market_data_update, ticker, ohlcv_data)
+
+# Specialists run as parallel graph branches. Each branch hands its agent call to
+# this pool and waits at most AGENT_TIMEOUT_SECONDS, so one slow Groq round-trip
+# drops that agent's vote instead of stalling the risk layer.
+#
+# A thread cannot be killed, so a timed-out agent keeps its pool slot until it
+# returns on its own. At most SPECIALIST_MAX_ABANDONED such calls may hold slots;
+# beyond that new specialist calls are shed immediately (reported like a timeout)
+# so hung agents can never occupy the whole pool and queue every later run.
+AGENT_TIMEOUT_SECONDS = float(os.getenv("AGENT_TIMEOUT_SECONDS", "60"))
+SPECIALIST_POOL_SIZE = int(os.getenv("SPECIALIST_POOL_SIZE", "32"))
+SPECIALIST_MAX_ABANDONED = int(os.getenv("SPECIALIST_MAX_ABANDONED", str(SPECIALIST_POOL_SIZE // 2)))
+_specialist_pool = ThreadPoolExecutor(
+    max_workers=SPECIALIST_POOL_SIZE,
+    thread_name_prefix="specialist"
+)
+_abandoned = set()  # timed-out futures still running on the pool
+_abandoned_lock = threading.Lock()
+
+def _release_abandoned(future):
+    with _abandoned_lock:
+        _abandoned.discard(future)
+
+def abandoned_specialists() -> int:
+    """Timed-out specialist calls still holding a pool thread."""
+    with _abandoned_lock:
+        return len(_abandoned)
+
+def _run_specialist(agent_label: str, agent_fn, *args):
+    """Runs one specialist agent with a deadline and returns its partial state update."""
+    started = time.perf_counter()
+    profiling = profiling_active()
+    if not profiling and abandoned_specialists() >= SPECIALIST_MAX_ABANDONED:
+        metrics_registry.observe("trade_today_agent", 0.0, True, agent=agent_label, outcome="shed")
+        logger.warning(f"{agent_label} shed: {SPECIALIST_MAX_ABANDONED} timed-out agents still hold the specialist pool.")
+        return {"error_logs": [f"{agent_label} skipped; specialist pool saturated by timed-out agents."]}
+    try:
+        if profiling:
+            # Under the profiler the agent must run on this thread to be attributed to the node
+            result = agent_fn(*args)
+        else:
+            future = _specialist_pool.submit(agent_fn, *args)
+            result = future.result(timeout=AGENT_TIMEOUT_SECONDS)
+    except FutureTimeoutError:
+        # Still queued: cancelling frees it outright. Running: track it until it returns.
+        if not profiling and not future.cancel():
+            with _abandoned_lock:
+                _abandoned.add(future)
+            future.add_done_callback(_release_abandoned)
+        metrics_registry.observe("trade_today_agent", time.perf_counter() - started, True, agent=agent_label, outcome="timeout")
+        logger.warning(f"{agent_label} exceeded {AGENT_TIMEOUT_SECONDS}s. Dropping its result.")
+        return {"error_logs": [f"{agent_label} timed out after {AGENT_TIMEOUT_SECONDS}s; result dropped."]}
+    except Exception as e:
+        metrics_registry.observe("trade_today_agent", time.perf_counter() - started, True, agent=agent_label, outcome="error")
+        logger.error(f"{agent_label} crashed: {str(e)}")
+        return {"error_logs": [f"{agent_label} failed: {str(e)}"]}
+
+    metrics_registry.observe("trade_today_agent", time.perf_counter() - started, agent=agent_label, outcome="ok")
+    # Merged into AnalystState.agent_debates by its operator.add reducer
+    return {"agent_debates": [result]}
+
+async def _arun_specialist(agent_label: str, agent_coro_fn, *args):
+    """Async counterpart of `_run_specialist`; the agent coroutine is cancelled on timeout."""
+    started = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(agent_coro_fn(*args), timeout=AGENT_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        metrics_registry.observe("trade_today_agent", time.perf_counter() - started, True, agent=agent_label, outcome="timeout")
+        logger.warning(f"{agent_label} exceeded {AGENT_TIMEOUT_SECONDS}s. Dropping its result.")
+        return {"error_logs": [f"{agent_label} timed out after {AGENT_TIMEOUT_SECONDS}s; result dropped."]}
+    except Exception as e:
+        metrics_registry.observe("trade_today_agent", time.perf_counter() - started, True, agent=agent_label, outcome="error")
+        logger.error(f"{agent_label} crashed: {str(e)}")
+        return {"error_logs": [f"{agent_label} failed: {str(e)}"]}
+
+    metrics_registry.observe("trade_today_agent", time.perf_counter() - started, agent=agent_label, outcome="ok")
+    return {"agent_debates": [result]}
+
+def master_technical_node(state: AnalystState):
+    """(Phase 3 integration) Technical Analyst branch."""
+    print("[Master] Triggering Technical Agent...")
+    return _run_specialist("Technical Analyst", run_technical_analysis, state["active_ticker"],
+                           state["market_data"].technical_indicators)
+
+async def amaster_technical_node(state: AnalystState):
+    print("[Master] Triggering Technical Agent...")
+    return await _arun_specialist("Technical Analyst", arun_technical_analysis, state["active_ticker"],
+                                  state["market_data"].technical_indicators)
+
+def master_fundamental_node(state: AnalystState):
+    """(Phase 3 integration) Fundamental Analyst branch (RAG ingest + Groq)."""
+    print("[Master] Triggering Fundamental Agent...")
+    return _run_specialist("Fundamental Analyst", run_fundamental_analysis, state["active_ticker"], {"mock": "rag_docs"})
+
+async def amaster_fundamental_node(state: AnalystState):
+    print("[Master] Triggering Fundamental Agent...")
+    return await _arun_specialist("Fundamental Analyst", arun_fundamental_analysis, state["active_ticker"], {"mock": "rag_docs"})
+
+def _news_data(ticker: str) -> dict:
+    """Headlines already scraped in this process (e.g. by a batch prefetch); never hits the network."""
+    headlines = cached_headlines(ticker)
+    return {"headlines": headlines} if headlines else {"mock": "news_articles"}
+
+def master_sentiment_node(state: AnalystState):
+    """(Phase 3 integration) Sentiment Analyst branch."""
+    print("[Master] Triggering Sentiment Agent...")
+    return _run_specialist("Sentiment Analyst", run_sentiment_analysis, state["active_ticker"],
+                           _news_data(state["active_ticker"]))
+
+async def amaster_sentiment_node(state: AnalystState):
+    print("[Master] Triggering Sentiment Agent...")
+    return await _arun_specialist("Sentiment Analyst", arun_sentiment_analysis, state["active_ticker"],
+                                  _news_data(state["active_ticker"]))
+
+SPECIALIST_NODES = {
+    "technical": (master_technical_node, amaster_technical_node),
+    "fundamental": (master_fundamental_node, amaster_fundamental_node),
+    "sentiment": (master_sentiment_node, amaster_sentiment_node),
+}
 
 def master_risk_node(state: AnalystState):
     """(Phase 4 integration)"""
@@ -67,52 +204,197 @@ def master_risk_node(state: AnalystState):
         "execution_plan": risk_assessment.get("rejection_reason", "Approved")
     }
 
-def master_advisory_node(state: AnalystState):
-    """(Phase 5 integration - Advisory Only)"""
+def _announce_advisory(state: AnalystState):
     if state["risk_approved"]:
         print("[Master] Risk passed. Logging final advisory signal to SQLite...")
     else:
         print("[Master] Risk failed. Logging blocked advisory signal...")
+
+def _advisory_update(state: AnalystState, route_res: dict) -> dict:
+    return {
+        "advisory_algo_id": route_res.get("algo_id", ""),
+        "error_logs": [f"Advisory status: {route_res['status']}"]
+    }
+
+def master_advisory_node(state: AnalystState):
+    """(Phase 5 integration - Advisory Only)"""
+    _announce_advisory(state)
         
     route_res = log_advisory_signal(
         state["active_ticker"], 
         state["final_decision"], 
         {"risk_approved": state["risk_approved"], "rejection_reason": state["execution_plan"]}
     )
-    return {"error_logs": [f"Advisory status: {route_res['status']}"]}
+    return _advisory_update(state, route_res)
+
+async def amaster_advisory_node(state: AnalystState):
+    """Async advisory: the SQLite audit write runs in the default executor."""
+    _announce_advisory(state)
+    route_res = await asyncio.to_thread(
+        log_advisory_signal,
+        state["active_ticker"],
+        state["final_decision"],
+        {"risk_approved": state["risk_approved"], "rejection_reason": state["execution_plan"]}
+    )
+    return _advisory_update(state, route_res)
+
+def _build_master_graph():
+    """Builds and compiles the UNIFIED Graph."""
+    from langgraph.graph import StateGraph, END
+    from langchain_core.runnables import RunnableLambda
+
+    builder = StateGraph(AnalystState)
+
+    def node(name, fn, afn=None):
+        # Every node reports wall time / calls / errors under trade_today_node{node=...};
+        # the sync path also honours an opt-in RunProfiler passed through the run config.
+        instrument = timed(node=name)
+        if afn is None:
+            return instrument(profiled(name, fn))
+        return RunnableLambda(instrument(profiled(name, fn)), afunc=instrument(afn), name=name)
 
-# Build the UNIFIED Graph
-builder = StateGraph(AnalystState)
+    # Each node carries a sync and an async implementation so the same compiled graph
+    # serves `invoke` (CLI, batch workers) and `ainvoke` (FastAPI) without blocking the loop.
+    builder.add_node("ingest", node("ingest", master_ingest_node, amaster_ingest_node))
+    for node_name, (node_fn, anode_fn) in SPECIALIST_NODES.items():
+        builder.add_node(node_name, node(node_name, node_fn, anode_fn))
+    builder.add_node("risk_layer", node("risk_layer", master_risk_node))
+    builder.add_node("advisory_logger", node("advisory_logger", master_advisory_node, amaster_advisory_node))
 
-builder.add_node("ingest", master_ingest_node)
-builder.add_node("specialists", master_specialist_node)
-builder.add_node("risk_layer", master_risk_node)
-builder.add_node("advisory_logger", master_advisory_node)
+    builder.set_entry_point("ingest")
+    # Fan out to the specialists; risk_layer runs once all branches of the superstep land
+    for node_name in SPECIALIST_NODES:
+        builder.add_edge("ingest", node_name)
+        builder.add_edge(node_name, "risk_layer")
+    builder.add_edge("risk_layer", "advisory_logger")
+    builder.add_edge("advisory_logger", END)
 
-builder.set_entry_point("ingest")
-builder.add_edge("ingest", "specialists")
-builder.add_edge("specialists", "risk_layer")
-builder.add_edge("risk_layer", "advisory_logger")
-builder.add_edge("advisory_logger", END)
+    return builder.compile()
 
-master_app = builder.compile()
+_graph_lock = threading.Lock()
 
-def run_master_orchestrator(ticker: str):
+def get_master_app():
+    """Compiled master graph, built on first use (importing this module stays cheap)."""
+    app = globals().get("master_app")
+    if app is None:
+        with _graph_lock:
+            app = globals().get("master_app")
+            if app is None:
+                app = globals()["master_app"] = _build_master_graph()
+    return app
+
+def __getattr__(name):
+    # `master_orchestrator.master_app` keeps working and triggers the lazy compile
+    if name == "master_app":
+        return get_master_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def warm_up() -> dict:
+    """
+    Optional pre-traffic warm-up: compiles the graph, imports the lazily loaded
+    clients, loads the MiniLM embedding model, embeds the agents' standard
+    RAG queries and loads the cross-ticker ANN index. Returns seconds spent
+    per step.
+    """
+    from data_connectors.rag_pipeline.ingest import _get_embed_model, prewarm_query_cache, load_ann_index
+
+    steps = {
+        "compile_graph": get_master_app,
+        "import_langchain_groq": lambda: __import__("langchain_groq"),
+        "import_yfinance": lambda: __import__("yfinance"),
+        "load_embedding_model": _get_embed_model,
+        "prewarm_query_cache": lambda: prewarm_query_cache([FA_RAG_QUERY]),
+        "load_ann_index": lambda: load_ann_index().result(),
+    }
+    timings = {}
+    for step, fn in steps.items():
+        started = time.perf_counter()
+        fn()
+        timings[step] = round(time.perf_counter() - started, 3)
+        logger.info(f"Warm-up {step}: {timings[step]}s")
+    return timings
+
+def build_initial_state(ticker: str, query: str = "Analyze", market_data: MarketData = None) -> AnalystState:
+    """
+    Blank AnalystState for a single-ticker graph run. Passing `market_data` with
+    technical indicators already filled in makes the ingest node skip its fetch.
+    """
+    return AnalystState(
+        user_query=query, active_ticker=ticker, market_data=market_data or MarketData(ticker=ticker),
+        agent_debates=[], final_decision="", execution_plan="", risk_approved=False,
+        advisory_algo_id="", error_logs=[]
+    )
+
+def summarize_final_state(state: dict) -> dict:
+    """JSON-safe view of a finished graph state (pydantic models are dumped to dicts)."""
+    market_data = state.get("market_data")
+    return {
+        "ticker": state.get("active_ticker"),
+        "final_decision": state.get("final_decision", ""),
+        "risk_approved": state.get("risk_approved", False),
+        "execution_plan": state.get("execution_plan", ""),
+        "advisory_algo_id": state.get("advisory_algo_id", ""),
+        "current_price": market_data.current_price if market_data else 0.0,
+        "agent_debates": [
+            a.model_dump() if hasattr(a, "model_dump") else a for a in state.get("agent_debates", [])
+        ],
+        "error_logs": state.get("error_logs", []),
+    }
+
+# Concurrent runs for the same (ticker, query, market bar) share one graph execution
+master_flight = SingleFlight()
+
+def profile_master_orchestrator(ticker: str, query: str = "Analyze", profile_dir: str = PROFILE_DIR):
+    """
+    Runs the graph once under a RunProfiler (cProfile + tracemalloc per node) and
+    returns (final_state, report_dir). Never coalesced: a profile must execute.
+    """
+    profiler = RunProfiler(label=ticker.replace(".", "_"), output_dir=profile_dir)
+    result = get_master_app().invoke(
+        build_initial_state(ticker, query), config={"configurable": {"profiler": profiler}}
+    )
+    return result, profiler.write_report()
+
+def run_master_orchestrator(ticker: str, query: str = "Analyze", profile: bool = False,
+                            profile_dir: str = PROFILE_DIR):
     """Trigger the fully integrated graph end-to-end."""
     print("\n" + "="*50)
     print(f"--- INITIALIZING MASTER INTEGRATION RUN: {ticker} ---")
     print("="*50)
     
-    initial_state = AnalystState(
-        user_query="Analyze", active_ticker=ticker, market_data=MarketData(ticker=ticker),
-        agent_debates=[], final_decision="", execution_plan="", risk_approved=False, error_logs=[]
-    )
-    
-    result = master_app.invoke(initial_state)
+    if profile:
+        result, report_dir = profile_master_orchestrator(ticker, query, profile_dir)
+        print(f"Profile report: {report_dir}")
+    else:
+        initial_state = build_initial_state(ticker, query)
+        result = master_flight.do(analysis_key(ticker, query), get_master_app().invoke, initial_state)
     print("\n--- FINAL MASTER STATE ---")
     print(f"Risk Approved: {result['risk_approved']}")
     print(f"Execution Log: {result['error_logs']}")
     return result
 
+async def arun_master_orchestrator(ticker: str, query: str = "Analyze"):
+    """Async end-to-end run via `master_app.ainvoke`."""
+    logger.info(f"Async master run for {ticker}")
+    return await master_flight.ado(analysis_key(ticker, query), get_master_app().ainvoke, build_initial_state(ticker, query))
+
 if __name__ == "__main__":
-    run_master_orchestrator("RELIANCE.NS")
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the unified master graph for one ticker.")
+    parser.add_argument("ticker", nargs="?", default="RELIANCE.NS")
+    parser.add_argument("--warm-up", action="store_true", help="Load the model and compile the graph first")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="Print which imports and warm-up steps cost what, then exit")
+    parser.add_argument("--profile", action="store_true",
+                        help="Capture cProfile + tracemalloc per node and write a report")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR)
+    args = parser.parse_args()
+
+    if args.startup_report:
+        from startup_report import print_startup_report
+        print_startup_report()
+        sys.exit(0)
+    if args.warm_up:
+        warm_up()
+    run_master_orchestrator(args.ticker, profile=args.profile, profile_dir=args.profile_dir)
@@ -0,0 +1,64 @@
+"""
+Converts an existing RAG vector store to another embedding encoding.
+
+float16 halves the embedding blobs and int8 (one float32 scale per vector)
+shrinks them to roughly a quarter; see `rag_pipeline.vector_store`. The file
+is rewritten in place in one transaction and VACUUMed. Stop the API and any
+scans first, since open stores cache the encoding. The embedding cache
+stays float32. The persisted ANN index (vector_store.ivf.npz) records the
+encoding it was built from and is rebuilt from the converted rows on next load.
+
+Usage:
+    python migrate_vector_store.py --dtype int8 [--db path/to/vector_store.db] [--backup]
+"""
+import os
+import sys
+import shutil
+import sqlite3
+import argparse
+import logging
+
+root_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+
+from data_connectors.rag_pipeline.vector_store import VectorStore, EMBEDDING_DTYPES
+
+DEFAULT_DB_PATH = os.path.join(root_dir, "Phase_2_Data_Connectivity", "data_connectors", "rag_pipeline", "vector_store.db")
+
+def _file_size(db_path: str) -> int:
+    return sum(os.path.getsize(p) for p in (db_path, f"{db_path}-wal") if os.path.exists(p))
+
+def migrate(db_path: str, dtype: str, backup: bool = False) -> dict:
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"No vector store at {db_path}")
+    if backup:
+        # Checkpoint first so the copy is self-contained without the -wal file
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.close()
+        shutil.copy2(db_path, f"{db_path}.bak")
+    size_before = _file_size(db_path)
+    store = VectorStore(db_path)
+    try:
+        report = store.convert(dtype)
+    finally:
+        store.close()
+    report.update(db_path=db_path, bytes_before=size_before, bytes_after=_file_size(db_path))
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-encode the embeddings of a RAG vector store.")
+    parser.add_argument("--dtype", choices=EMBEDDING_DTYPES, required=True)
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="SQLite file (defaults to the pipeline's vector_store.db)")
+    parser.add_argument("--backup", action="store_true", help="Copy the file to <db>.bak before converting")
+    args = parser.parse_args(argv)
+
+    report = migrate(args.db, args.dtype, backup=args.backup)
+    print(f"{report['db_path']}: {report['from']} -> {report['to']}")
+    print(f"  embeddings: {report['embeddings']}")
+    print(f"  size: {report['bytes_before'] / 1e6:.2f} MB -> {report['bytes_after'] / 1e6:.2f} MB")
+    return report
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,81 @@
+"""
+Cold-start report for the master graph.
+
+Spawns a fresh interpreter with `-X importtime`, imports `master_orchestrator`
+and runs `warm_up()`, then prints which top-level packages cost the most to
+import and how long each warm-up step took.
+
+Usage:
+    python startup_report.py [--top 15]
+    python master_orchestrator.py --startup-report
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+
+root_dir = os.path.dirname(os.path.abspath(__file__))
+
+_PROBE = (
+    "import json, time\n"
+    "t0 = time.perf_counter()\n"
+    "import master_orchestrator\n"
+    "import_s = time.perf_counter() - t0\n"
+    "timings = master_orchestrator.warm_up()\n"
+    "print('STARTUP_REPORT ' + json.dumps({'import_master_orchestrator': round(import_s, 3), **timings}))\n"
+)
+
+def _parse_importtime(stderr: str) -> dict:
+    """Aggregates `-X importtime` lines into per-package (cumulative_us, self_us)."""
+    cumulative = {}
+    self_time = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        self_us, cumulative_us, name = fields
+        package = name.strip().split(".")[0]
+        # The first (outermost) import of a package carries its whole subtree
+        cumulative[package] = max(cumulative.get(package, 0), int(cumulative_us))
+        self_time[package] += int(self_us)
+    return {pkg: (cumulative[pkg], self_time[pkg]) for pkg in cumulative}
+
+def collect_startup_report() -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=root_dir, capture_output=True, text=True
+    )
+    steps = {}
+    for line in proc.stdout.splitlines():
+        if line.startswith("STARTUP_REPORT "):
+            steps = json.loads(line[len("STARTUP_REPORT "):])
+    if proc.returncode != 0:
+        errors = [l for l in proc.stderr.splitlines() if l.strip() and not l.startswith("import time:")]
+        steps["error"] = errors[-1] if errors else "probe failed"
+    return {"steps": steps, "imports": _parse_importtime(proc.stderr)}
+
+def print_startup_report(top: int = 15):
+    report = collect_startup_report()
+
+    print("\n" + "="*60)
+    print("--- COLD START REPORT ---")
+    print("="*60)
+    print("\nStartup steps (seconds):")
+    for step, value in report["steps"].items():
+        print(f"  {step:<28} {value}")
+
+    print(f"\nTop {top} packages by cumulative import time:")
+    print(f"  {'package':<28} {'cumulative ms':>14} {'self ms':>10}")
+    ranked = sorted(report["imports"].items(), key=lambda kv: kv[1][0], reverse=True)
+    for package, (cumulative_us, self_us) in ranked[:top]:
+        print(f"  {package:<28} {cumulative_us / 1000:>14.1f} {self_us / 1000:>10.1f}")
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show which imports and warm-up steps dominate cold start.")
+    parser.add_argument("--top", type=int, default=15)
+    print_startup_report(parser.parse_args().top)
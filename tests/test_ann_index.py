@@ -0,0 +1,133 @@
+import os
+import sys
+import tempfile
+from unittest import mock
+
+import numpy as np
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+
+from data_connectors.rag_pipeline import ingest
+from data_connectors.rag_pipeline.ann_index import IVFIndex
+
+def _corpus(n, dim=32, topics=40, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((topics, dim))
+    vectors = centres[rng.integers(0, topics, n)] + 0.5 * rng.standard_normal((n, dim))
+    return vectors.astype(np.float32)
+
+class _Encoder:
+    """Maps each text to a fixed random vector; 'chemicals' texts share one direction."""
+    def encode(self, texts, **kwargs):
+        out = []
+        for t in texts:
+            v = np.random.default_rng(abs(hash(t)) % 2**32).standard_normal(32)
+            if "chemicals" in t.lower():
+                v = v * 0.1 + np.eye(32)[0] * 5
+            out.append(v)
+        return np.array(out, dtype=np.float32)
+
+def _info(ticker):
+    summary = "Specialty chemicals maker expanding capacity." if ticker.startswith("CHEM") else "Retail bank."
+    return {"longName": f"{ticker} Ltd", "longBusinessSummary": summary}
+
+def run_tests():
+    print("\n--- Testing Cross-Ticker ANN Index ---")
+
+    # 1. Untrained index is exact; training kicks in at min_train
+    print("\n[1] Testing training and recall:")
+    vectors = _corpus(3051)
+    ids = [f"c{i}" for i in range(3000)]
+    index = IVFIndex(min_train=1000, nprobe=4)
+    index.add(ids[:500], ["T"] * 500, vectors[:500])
+    assert index.nlist == 0, "Small corpora stay brute force"
+    assert index.search(vectors[3000], 5) == index.exact_search(vectors[3000], 5)
+    index.add(ids[500:], ["T"] * 2500, vectors[500:3000])
+    assert index.nlist > 1 and len(index) == 3000
+    queries = vectors[3001:]
+    recall = np.mean([
+        len({h[0] for h in index.search(q, 10)} & {h[0] for h in index.exact_search(q, 10)}) / 10 for q in queries
+    ])
+    full = index.search(queries[0], 10, nprobe=index.nlist)
+    assert full == index.exact_search(queries[0], 10), "nprobe == nlist must be exact"
+    assert recall >= 0.8, f"Recall too low: {recall}"
+    print(f"-> nlist {index.nlist}, recall@10 {recall:.3f} at nprobe 4")
+
+    # 2. Incremental insert and replacement by chunk id
+    print("\n[2] Testing incremental inserts:")
+    target = vectors[3000]
+    index.add(["new"], ["NEW.NS"], target)
+    assert index.search(target, 1)[0][:2] == ("new", "NEW.NS")
+    index.add(["new"], ["NEW.NS"], -target)
+    assert len(index) == 3001 and "new" not in {h[0] for h in index.search(target, 20)}
+    print("-> Replaced chunks are tombstoned")
+
+    # 2b. Re-ingesting the same chunks must not grow the index
+    print("\n[2b] Testing repeated re-adds:")
+    small = IVFIndex(min_train=1000)
+    small.add(ids[:800], ["T"] * 800, vectors[:800])
+    for _ in range(500):
+        small.add(ids[:4], ["T"] * 4, vectors[:4])
+    assert small._size == 800 and small._dead == 0, "Unchanged vectors must be skipped"
+    rng = np.random.default_rng(5)
+    for _ in range(500):
+        small.add(ids[:4], ["T"] * 4, rng.standard_normal((4, 32)).astype(np.float32))
+    assert len(small) == 800 and small._size <= 800 * 1.25 + 4, f"Tombstones must be compacted ({small._size} rows)"
+    assert len(small.ids) == small._size and small.search(vectors[5], 1)[0][0] == "c5"
+    index.add(["new"], ["NEW.NS"], target)
+    index.compact()
+    assert index._size == len(index) == 3001 and index.search(target, 1)[0][0] == "new", "Compaction keeps the trained cells"
+    print(f"-> {small._size} rows for {len(small)} live vectors")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 3. Persistence round trip
+        print("\n[3] Testing persistence:")
+        path = os.path.join(tmp, "index.ivf.npz")
+        index.save(path)
+        loaded = IVFIndex.load(path)
+        assert len(loaded) == 3001 and loaded.nlist == index.nlist
+        for q in queries[:10]:
+            assert loaded.search(q, 10) == index.search(q, 10)
+        print(f"-> Reloaded {len(loaded)} vectors")
+
+        # 4. Ingest keeps the index in sync; cross-ticker search returns texts
+        print("\n[4] Testing ingest integration:")
+        db_path = os.path.join(tmp, "vector_store.db")
+        with mock.patch.object(ingest, "DB_PATH", db_path), \
+             mock.patch.object(ingest, "_EMBED_MODEL", _Encoder()), \
+             mock.patch.object(ingest, "_fetch_info", side_effect=_info), \
+             mock.patch.object(ingest, "_ANN", None):
+            ingest.ingest_many_fundamentals([f"BANK{i}.NS" for i in range(10)] + ["CHEM1.NS"])
+            ingest.ingest_stock_fundamentals("CHEM2.NS")
+            hits = ingest.search_fundamentals("capacity expansion in specialty chemicals", k=2)
+            assert {h["ticker"] for h in hits} == {"CHEM1.NS", "CHEM2.NS"}
+            assert all("chemicals" in h["text"] for h in hits)
+            ingest.flush_ann_index()
+            assert os.path.exists(os.path.join(tmp, "vector_store.ivf.npz")), "Index is persisted next to the DB"
+            assert len(IVFIndex.load(os.path.join(tmp, "vector_store.ivf.npz"))) == 48
+
+            # A missing or stale index file is rebuilt from SQLite
+            os.remove(os.path.join(tmp, "vector_store.ivf.npz"))
+            with mock.patch.object(ingest, "_ANN", None):
+                assert len(ingest._get_ann_index()) == 48
+
+            # After a migration the index is rebuilt from the quantized rows, and
+            # re-ingesting unchanged fundamentals leaves it untouched
+            ingest.flush_ann_index()
+            ingest._get_store().convert("int8")
+            with mock.patch.object(ingest, "_ANN", None):
+                index = ingest._get_ann_index()
+                assert index.encoding == "int8", "An index built from float32 rows must be rebuilt"
+                index.save(index.path)
+                ingest.ingest_stock_fundamentals("CHEM2.NS")
+                ingest.flush_ann_index()
+                assert index._dead == 0 and not index.dirty, "Unchanged chunks must match their quantized rows"
+                assert IVFIndex.load(index.path).encoding == "int8"
+            ingest._get_store().close()
+        print(f"-> {[(h['ticker'], h['score']) for h in hits]}")
+
+    print("\n-> All ANN Index tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
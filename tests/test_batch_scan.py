@@ -0,0 +1,54 @@
+import os
+import sys
+import json
+import tempfile
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+import master_orchestrator
+from batch_scan import run_batch_scan, load_tickers
+
+class _StubGraph:
+    """Stands in for master_app so the scan mechanics can be checked offline."""
+    def invoke(self, state):
+        if state["active_ticker"] == "BROKEN.NS":
+            raise RuntimeError("simulated yfinance outage")
+        return dict(state, final_decision="BUY", risk_approved=True, execution_plan="Approved")
+
+def run_tests():
+    print("\n--- Testing Batch Scan Mode ---")
+    real_app = master_orchestrator.master_app
+    master_orchestrator.master_app = _StubGraph()
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            # 1. Universe JSON loading
+            print("\n[1] Testing universe loading:")
+            universe_path = os.path.join(tmp, "universe.json")
+            with open(universe_path, "w") as f:
+                json.dump([{"ticker": "RELIANCE.NS", "name": "Reliance"}, {"ticker": "TCS.NS", "name": "TCS"}], f)
+            assert load_tickers(universe_path) == ["RELIANCE.NS", "TCS.NS"], "Universe tickers mismatch"
+            print("-> Universe JSON parsed.")
+
+            # 2. Error isolation + streaming output
+            print("\n[2] Testing per-ticker error isolation:")
+            tickers = [f"T{i}.NS" for i in range(20)] + ["BROKEN.NS"]
+            output_path = os.path.join(tmp, "scan.jsonl")
+            summary = run_batch_scan(tickers, workers=4, max_in_flight=3, output_path=output_path)
+            assert summary["tickers"] == 21, "Every ticker must be accounted for"
+            assert summary["failed"] == 1, "Only the broken ticker should fail"
+
+            with open(output_path) as f:
+                records = [json.loads(line) for line in f]
+            assert len(records) == 21, "Every result must be streamed to disk"
+            broken = [r for r in records if r["ticker"] == "BROKEN.NS"][0]
+            assert broken["status"] == "error" and "outage" in broken["error"]
+            print(f"-> Summary: {summary}")
+    finally:
+        master_orchestrator.master_app = real_app
+
+    print("\n-> All Batch Scan tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
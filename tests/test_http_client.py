@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+import tempfile
+from unittest import mock
+
+import requests
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+
+from data_connectors.http_client import HttpClient, ResponseCache, TokenBucket
+
+def _response(status, body=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    response.encoding = "utf-8"
+    return response
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+def run_tests():
+    print("\n--- Testing Shared HTTP Client ---")
+
+    # 1. Token bucket allows a burst, then paces at the configured rate
+    print("\n[1] Testing token bucket:")
+    clock = _FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=clock, sleep=clock.sleep)
+    waits = [bucket.acquire() for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0], "Burst capacity must be served immediately"
+    assert abs(waits[3] - 0.5) < 1e-9 and abs(waits[4] - 0.5) < 1e-9
+    print(f"-> Waits: {waits}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sleeps = []
+        client = HttpClient(cache=ResponseCache(tmp), sleep=sleeps.append)
+
+        # 2. 503 / connection errors are retried with bounded jittered backoff
+        print("\n[2] Testing retries:")
+        replies = [requests.ConnectionError("reset"), _response(503), _response(200, b"ok")]
+        with mock.patch.object(client.session, "request", side_effect=replies) as request:
+            response = client.get("https://example.com/data", ttl=0)
+        assert response.status_code == 200 and request.call_count == 3
+        assert client.stats()["retries"] == 2
+        assert all(0 <= s <= client.backoff_max for s in sleeps)
+        with mock.patch.object(client.session, "request", return_value=_response(429, headers={"Retry-After": "2"})) as request:
+            response = client.get("https://example.com/limited", ttl=0)
+        assert response.status_code == 429 and request.call_count == client.max_retries + 1
+        assert sleeps[-1] == 2.0, "Retry-After must be honoured"
+        print(f"-> Backoff sleeps: {[round(s, 3) for s in sleeps]}")
+
+        # 3. Cached GETs are served from disk within their TTL
+        print("\n[3] Testing on-disk response cache:")
+        url = "https://finance.yahoo.com/quote/TCS.NS/news"
+        assert client.ttl_for(url) > 0 and client.ttl_for("https://example.com/") == 0
+        page = _response(200, b"<h3>Headline</h3>", {"ETag": '"abc"', "Content-Type": "text/html"})
+        with mock.patch.object(client.session, "request", return_value=page) as request:
+            first = client.get(url)
+            second = client.get(url)
+        assert request.call_count == 1, "Second call must come from the cache"
+        assert second.text == first.text and getattr(second, "from_cache", False)
+        print(f"-> {client.stats()}")
+
+        # 4. Identical bodies share one blob (content addressed)
+        print("\n[4] Testing content addressing:")
+        with mock.patch.object(client.session, "request", return_value=_response(200, b"<h3>Headline</h3>")):
+            client.get("https://finance.yahoo.com/quote/INFY.NS/news")
+        blobs = [f for _, _, files in os.walk(os.path.join(tmp, "blobs")) for f in files]
+        index = os.listdir(os.path.join(tmp, "index"))
+        assert len(blobs) == 1 and len(index) == 2
+        print(f"-> {len(index)} entries, {len(blobs)} blob")
+
+        # 5. Expired entries are revalidated with a conditional GET
+        print("\n[5] Testing revalidation:")
+        with mock.patch.object(client.session, "request", return_value=_response(304)) as request:
+            with mock.patch("data_connectors.http_client.time.time", return_value=time.time() + 3600):
+                revalidated = client.get(url)
+        sent = request.call_args.kwargs["headers"]
+        assert sent["If-None-Match"] == '"abc"'
+        assert revalidated.status_code == 200 and revalidated.text == "<h3>Headline</h3>"
+        assert client.stats()["revalidated"] == 1
+        assert "trade_today_http_cache_hits_total" in client.render_prometheus()
+        print("-> 304 served the cached body")
+
+        # 6. Validators are found whatever casing the server used
+        print("\n[6] Testing lower-case validator headers:")
+        lower_url = "https://finance.yahoo.com/quote/HDFCBANK.NS/news"
+        lower = _response(200, b"<h3>Bank</h3>", {"etag": '"xyz"', "last-modified": "Wed, 01 Jan 2025 00:00:00 GMT"})
+        with mock.patch.object(client.session, "request", return_value=lower):
+            client.get(lower_url)
+        with mock.patch.object(client.session, "request", return_value=_response(304)) as request:
+            with mock.patch("data_connectors.http_client.time.time", return_value=time.time() + 3600):
+                assert client.get(lower_url).text == "<h3>Bank</h3>"
+        sent = request.call_args.kwargs["headers"]
+        assert sent["If-None-Match"] == '"xyz"' and sent["If-Modified-Since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+        print("-> Conditional GET sent for etag / last-modified")
+
+    print("\n-> All HTTP Client tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import tempfile
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+
+import numpy as np
+import pandas as pd
+
+from data_connectors.market_store import MarketStore
+from data_connectors.indicators import build_panel, compute_indicators
+from data_connectors.incremental_indicators import IndicatorState
+
+def _random_bars(seed: int, days: int):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1.5, days))
+    index = pd.date_range(end="2026-10-16", periods=days, freq="B", tz="Asia/Kolkata")
+    return pd.DataFrame({"Open": close + rng.normal(0, 0.5, days), "High": close + rng.uniform(0.5, 2, days),
+                         "Low": close - rng.uniform(0.5, 2, days), "Close": close,
+                         "Volume": rng.integers(1000, 9000, days)}, index=index)
+
+def _feed(state, panel, start, stop):
+    for t in range(start, stop):
+        state.update(panel["ts"][t], panel["open"][0, t], panel["high"][0, t], panel["low"][0, t],
+                     panel["close"][0, t], panel["volume"][0, t])
+    return state
+
+def run_tests():
+    print("\n--- Testing Incremental Indicator State ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MarketStore(tmp)
+        store.append("AAA.NS", _random_bars(3, 300))
+        panel = build_panel(["AAA.NS"], store, lookback=300)
+
+        # 1. Equivalence with the vectorized engine over the same bars
+        print("\n[1] Testing equivalence with the vectorized engine:")
+        state = _feed(IndicatorState(), panel, 0, 300)
+        incremental = state.snapshot()
+        vectorized = compute_indicators(["AAA.NS"], store=store, lookback=300)["AAA.NS"]
+        for name, expected in vectorized.items():
+            got = incremental[name]
+            assert got is not None and abs(got - expected) <= 1e-3, f"{name}: {got} != {expected}"
+        print(f"-> {len(vectorized)} values match after {state.bars} bars.")
+
+        # 2. Session VWAP: daily bars each open a new session
+        print("\n[2] Testing VWAP:")
+        typical = (panel["high"][0, -1] + panel["low"][0, -1] + panel["close"][0, -1]) / 3
+        assert abs(incremental["vwap"] - typical) < 1e-3
+        intraday = IndicatorState()
+        bars = [(1760584500 + 60 * i, 10.0 + i, 10.5 + i, 9.5 + i, 10.0 + i, 100 * (i + 1)) for i in range(5)]
+        for bar in bars:
+            intraday.update(*bar)
+        pv = sum(((b[2] + b[3] + b[4]) / 3) * b[5] for b in bars)
+        assert abs(intraday.snapshot()["vwap"] - round(pv / sum(b[5] for b in bars), 4)) < 1e-9
+        print(f"-> Intraday VWAP {intraday.snapshot()['vwap']}")
+
+        # 3. Re-sending the latest timestamp revises the forming bar
+        print("\n[3] Testing in-progress bar revision:")
+        reference = _feed(IndicatorState(), panel, 0, 300).snapshot()
+        revised = _feed(IndicatorState(), panel, 0, 300)
+        revised.update(panel["ts"][-1], 1.0, 999.0, 1.0, 500.0, 10)
+        revised.update(panel["ts"][-1], panel["open"][0, -1], panel["high"][0, -1], panel["low"][0, -1],
+                       panel["close"][0, -1], panel["volume"][0, -1])
+        for name, expected in reference.items():
+            assert expected is None or abs(revised.snapshot()[name] - expected) < 1e-6, f"{name} drifted after revision"
+        assert revised.bars == 300, "A revision must not count as a new bar"
+        print("-> Revision restored the original values.")
+
+        # 4. Serialization: a restored state continues exactly like the original
+        print("\n[4] Testing JSON round-trip:")
+        half = _feed(IndicatorState(), panel, 0, 150)
+        restored = IndicatorState.from_dict(json.loads(json.dumps(half.to_dict())))
+        _feed(restored, panel, 150, 300)
+        for name, expected in reference.items():
+            assert expected is None or abs(restored.snapshot()[name] - expected) < 1e-6, f"{name} mismatch after resume"
+        print("-> Resumed state matches an uninterrupted run.")
+
+        # 5. yfinance_data keeps state on disk and only absorbs new bars
+        print("\n[5] Testing latest_indicators persistence:")
+        from data_connectors import yfinance_data
+        real_store = yfinance_data.market_store
+        yfinance_data.market_store = store
+        try:
+            first = yfinance_data.latest_indicators("AAA.NS")
+            state_path = os.path.join(store.ticker_dir("AAA.NS"), "indicators.json")
+            assert os.path.exists(state_path)
+            assert "vwap" not in first, "Daily bars must not report a session VWAP"
+            written = os.stat(state_path).st_mtime_ns
+            os.utime(state_path, ns=(written - 10**9, written - 10**9))
+            assert yfinance_data.latest_indicators("AAA.NS") == first
+            assert os.stat(state_path).st_mtime_ns == written - 10**9, "No new bar: the state must not be rewritten"
+            yfinance_data._indicator_states.clear()  # simulate a restarted worker
+            store.append("AAA.NS", _random_bars(4, 1).set_axis(
+                pd.DatetimeIndex([pd.Timestamp("2026-10-19", tz="Asia/Kolkata")])))
+            resumed = yfinance_data.latest_indicators("AAA.NS")
+            assert resumed["bars"] == first["bars"] + 1
+            full = compute_indicators(["AAA.NS"], store=store, lookback=301)["AAA.NS"]
+            assert abs(resumed["rsi_14"] - full["rsi_14"]) < 1e-3 and abs(resumed["sma_50"] - full["sma_50"]) < 1e-3
+            yfinance_data._indicator_states["AAA.NS"].last_ts -= 19800  # keyed by bar open, not date
+            assert yfinance_data.latest_indicators("AAA.NS") == resumed, "A misaligned state is rebuilt"
+            print(f"-> {resumed['bars']} bars, RSI {resumed['rsi_14']}")
+        finally:
+            yfinance_data.market_store = real_store
+            yfinance_data._indicator_states.clear()
+
+    print("\n-> All Incremental Indicator tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
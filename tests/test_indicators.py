@@ -0,0 +1,76 @@
+import os
+import sys
+import tempfile
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+
+import numpy as np
+import pandas as pd
+
+from data_connectors.market_store import MarketStore
+from data_connectors.indicators import build_panel, compute_indicator_arrays, compute_indicators
+
+def _random_bars(seed: int, days: int, end: str = "2026-10-16"):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1.5, days))
+    index = pd.date_range(end=end, periods=days, freq="B", tz="Asia/Kolkata")
+    return pd.DataFrame({"Open": close + rng.normal(0, 0.5, days), "High": close + rng.uniform(0.5, 2, days),
+                         "Low": close - rng.uniform(0.5, 2, days), "Close": close,
+                         "Volume": rng.integers(1000, 9000, days)}, index=index)
+
+def run_tests():
+    print("\n--- Testing Vectorized Indicator Engine ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MarketStore(tmp)
+        frames = {"AAA.NS": _random_bars(1, 300), "BBB.NS": _random_bars(2, 120)}
+        for ticker, frame in frames.items():
+            store.append(ticker, frame)
+
+        # 1. Panel alignment: the shorter history is NaN-padded on the left
+        print("\n[1] Testing panel alignment:")
+        panel = build_panel(list(frames), store, lookback=260)
+        assert panel["close"].shape == (2, 260)
+        assert np.isnan(panel["close"][1, :140]).all() and not np.isnan(panel["close"][1, 140:]).any()
+        print(f"-> Panel shape {panel['close'].shape}.")
+
+        # 2. Every indicator matches a per-ticker pandas reference
+        print("\n[2] Testing against pandas reference implementations:")
+        arrays = compute_indicator_arrays(panel)
+        for row, ticker in enumerate(frames):
+            f = frames[ticker].iloc[-260:]
+            close, valid = f["Close"], ~np.isnan(panel["close"][row])
+            ref = {
+                "sma_50": close.rolling(50).mean(),
+                "ema_12": close.ewm(span=12, adjust=False).mean(),
+                "bb_upper": close.rolling(20).mean() + 2 * close.rolling(20).std(ddof=0),
+            }
+            change = close.diff()
+            gain = change.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+            loss = (-change).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+            ref["rsi_14"] = 100 - 100 / (1 + gain / loss)
+            macd_line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+            ref["macd_signal"] = macd_line.ewm(span=9, adjust=False).mean()
+            prev_close = close.shift()
+            tr = pd.concat([f["High"] - f["Low"], (f["High"] - prev_close).abs(), (f["Low"] - prev_close).abs()], axis=1).max(axis=1)
+            ref["atr_14"] = tr.ewm(alpha=1 / 14, adjust=False).mean()
+
+            for name, expected in ref.items():
+                got = arrays[name][row][valid]
+                np.testing.assert_allclose(got, expected.to_numpy(), rtol=1e-9, atol=1e-9, equal_nan=True,
+                                           err_msg=f"{name} mismatch for {ticker}")
+        print("-> SMA, EMA, RSI, MACD, ATR and Bollinger match.")
+
+        # 3. Latest-value view used for MarketData.technical_indicators
+        print("\n[3] Testing latest values per ticker:")
+        latest = compute_indicators(list(frames) + ["MISSING.NS"], store=store)
+        assert latest["AAA.NS"]["sma_200"] is not None and latest["AAA.NS"]["bars"] == 260
+        assert latest["BBB.NS"]["sma_200"] is None, "Too little history must yield None, not a number"
+        assert latest["BBB.NS"]["rsi_14"] is not None
+        assert latest["MISSING.NS"]["bars"] == 0 and latest["MISSING.NS"]["macd"] is None
+        print(f"-> AAA.NS: {latest['AAA.NS']}")
+
+    print("\n-> All Indicator Engine tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
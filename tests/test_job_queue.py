@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+import tempfile
+import threading
+import subprocess
+
+# Ensure the root of Phase 1 is in the python path
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root, "Phase_1_Core_Framework"))
+
+from core.job_queue import JobQueue, JobStore
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+def run_tests():
+    print("\n--- Testing Background Job Queue ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "jobs.db")
+        order = []
+        gate = threading.Event()
+
+        def runner(ticker, query):
+            gate.wait()
+            if ticker == "BROKEN.NS":
+                raise RuntimeError("no data")
+            order.append(ticker)
+            return {"ticker": ticker, "final_decision": "BUY"}
+
+        # 1. Priority lanes: interactive work overtakes a queued batch scan
+        print("\n[1] Testing interactive lane priority:")
+        queue = JobQueue(runner, JobStore(db_path), workers=1, interactive_workers=0)
+        queue.start()
+        batch_id = queue.submit([f"B{i}.NS" for i in range(5)] + ["BROKEN.NS"])
+        interactive_id = queue.submit(["RELIANCE.NS"])
+        time.sleep(0.1)
+        gate.set()
+        assert _wait_for(lambda: queue.store.get(batch_id)["status"] == "completed"), "Batch job must finish"
+        assert order.index("RELIANCE.NS") <= 1, "Interactive ticker must jump the batch queue"
+        batch = queue.store.get(batch_id)
+        assert batch["completed"] == 5 and batch["failed"] == 1, "Failures are isolated per ticker"
+        assert queue.store.get(interactive_id)["status"] == "completed"
+        dup_id = queue.submit(["D.NS", "E.NS", "D.NS"])
+        assert _wait_for(lambda: queue.store.get(dup_id)["status"] == "completed")
+        dup = queue.store.get(dup_id)
+        assert dup["total"] == dup["completed"] == len(dup["results"]) == 2, "Duplicate tickers are analysed once"
+        print(f"-> Execution order: {order}")
+
+        # 2. Cancellation drops queued tickers
+        print("\n[2] Testing cancellation:")
+        gate.clear()
+        cancel_id = queue.submit([f"C{i}.NS" for i in range(10)])
+        assert queue.cancel(cancel_id), "Active jobs must be cancellable"
+        assert not queue.cancel(cancel_id), "A cancelled job cannot be cancelled twice"
+        gate.set()
+        time.sleep(0.2)
+        job = queue.store.get(cancel_id)
+        assert job["status"] == "cancelled" and job["completed"] <= 1, "Cancelled tickers must not run"
+        queue.stop()
+        print(f"-> Cancelled job state: {job['status']} ({job['completed']} completed)")
+
+        # 3. Restart resumes unfinished jobs from SQLite
+        print("\n[3] Testing resume after restart:")
+        store = JobStore(db_path)
+        store.create("resume-me", ["X.NS", "Y.NS"], "Analyze", "batch")
+        store.record_result("resume-me", "X.NS", True, {"ticker": "X.NS"})
+        store.set_status("resume-me", "running")
+        resumed = JobQueue(runner, JobStore(db_path), workers=2)
+        resumed.start()
+        assert _wait_for(lambda: resumed.store.get("resume-me")["status"] == "completed"), "Job must resume"
+        assert order.count("X.NS") == 0, "Already-finished tickers must not be re-run"
+        resumed.stop()
+        print("-> Unfinished job resumed and completed.")
+
+        # 4. Importing the API router must not create jobs.db
+        print("\n[4] Testing lazy queue construction:")
+        lazy_path = os.path.join(tmp, "lazy_jobs.db")
+        probe = ("import sys; sys.path[:0] = [sys.argv[1], sys.argv[2]]; import api.jobs as jobs, os; "
+                 "assert not os.path.exists(sys.argv[3]); jobs.get_job_queue(); assert os.path.exists(sys.argv[3])")
+        proc = subprocess.run(
+            [sys.executable, "-c", probe, root, os.path.join(root, "Phase_1_Core_Framework"), lazy_path],
+            env={**os.environ, "JOBS_DB_PATH": lazy_path}, capture_output=True, text=True
+        )
+        assert proc.returncode == 0, proc.stderr[-2000:]
+        print("-> jobs.db is created on first use, not at import")
+
+    print("\n-> All Job Queue tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,122 @@
+import os
+import sys
+import json
+import types
+import tempfile
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+
+import numpy as np
+import pandas as pd
+
+from data_connectors.market_store import MarketStore
+
+def _bars(start: str, closes, tz="Asia/Kolkata"):
+    index = pd.date_range(start, periods=len(closes), freq="B", tz=tz)
+    return pd.DataFrame({"Open": closes, "High": closes, "Low": closes,
+                         "Close": closes, "Volume": [100] * len(closes)}, index=index)
+
+class _FakeTicker:
+    """Records the history() window the store asked Yahoo for."""
+    requests = []
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    def history(self, **kwargs):
+        _FakeTicker.requests.append(kwargs)
+        if "period" in kwargs:
+            return _bars("2026-10-05", [10.0, 11.0, 12.0])
+        return _bars("2026-10-07", [12.5, 13.0])
+
+def run_tests():
+    print("\n--- Testing Local Market Store ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MarketStore(tmp)
+
+        # 1. Append + zero-copy reads
+        print("\n[1] Testing append and memory-mapped reads:")
+        assert store.read("RELIANCE.NS") == {}, "Unknown tickers read as empty"
+        assert store.append("RELIANCE.NS", _bars("2026-10-05", [10.0, 11.0, 12.0])) == 3
+        cols = store.read("RELIANCE.NS")
+        assert isinstance(cols["close"], np.memmap), "Reads must be memory-mapped"
+        assert cols["close"].tolist() == [10.0, 11.0, 12.0]
+        print(f"-> {len(cols['ts'])} bars stored.")
+
+        # 2. Incremental merge: older bars ignored, same-day bar replaced, newer appended
+        print("\n[2] Testing incremental merge:")
+        added = store.append("RELIANCE.NS", _bars("2026-10-06", [99.0, 12.5, 13.0]))
+        assert added == 1, f"Only the new bar should be appended, got {added}"
+        assert store.read("RELIANCE.NS")["close"].tolist() == [10.0, 11.0, 12.5, 13.0]
+        assert store.latest_bar("RELIANCE.NS")["current_price"] == 13.0
+        print(f"-> {store.latest_bar('RELIANCE.NS')}")
+
+        # 3. Interrupted append (columns written, meta not committed) is discarded
+        print("\n[3] Testing recovery from an interrupted append:")
+        with open(os.path.join(store.ticker_dir("RELIANCE.NS"), "close.f8"), "ab") as f:
+            np.asarray([1e9]).tofile(f)
+        assert store.read("RELIANCE.NS")["close"].tolist()[-1] == 13.0, "Uncommitted rows must be invisible"
+        store.append("RELIANCE.NS", _bars("2026-10-09", [14.0]))
+        assert store.read("RELIANCE.NS")["close"].tolist() == [10.0, 11.0, 12.5, 13.0, 14.0]
+        print("-> Uncommitted bytes truncated.")
+
+        # 4. fetch_live_ohlcv only asks Yahoo for bars after the last stored one
+        print("\n[4] Testing delta downloads through yfinance_data:")
+        fake = types.ModuleType("yfinance")
+        fake.Ticker = _FakeTicker
+        real = sys.modules.get("yfinance")
+        sys.modules["yfinance"] = fake
+        from data_connectors import yfinance_data
+        real_store = yfinance_data.market_store
+        yfinance_data.market_store = MarketStore(os.path.join(tmp, "live"))
+        try:
+            first = yfinance_data.fetch_live_ohlcv("TCS.NS")
+            assert first["current_price"] == 12.0 and "period" in _FakeTicker.requests[0]
+            yfinance_data.fetch_live_ohlcv("TCS.NS")
+            assert len(_FakeTicker.requests) == 1, "A fresh ticker must not be re-downloaded"
+            assert yfinance_data.sync_history("TCS.NS", force=True) == 1
+            assert "start" in _FakeTicker.requests[1], "Refresh must request only the missing window"
+            assert yfinance_data.fetch_live_ohlcv("TCS.NS")["current_price"] == 13.0
+            print(f"-> Requests made: {_FakeTicker.requests}")
+        finally:
+            yfinance_data.market_store = real_store
+            if real is not None:
+                sys.modules["yfinance"] = real
+            else:
+                sys.modules.pop("yfinance", None)
+
+        # 5. history() (IST index) and download() (naive index) key a day identically
+        print("\n[5] Testing both fetch paths share bar timestamps:")
+        store.append("MIXED.NS", _bars("2026-10-12", [1.0, 2.0, 3.0]))
+        assert store.append("MIXED.NS", _bars("2026-10-12", [1.0, 2.0, 3.5], tz=None)) == 0
+        cols = store.read("MIXED.NS")
+        assert cols["close"].tolist() == [1.0, 2.0, 3.5], "Same days from either path must merge"
+        assert int(cols["ts"][0]) == int(pd.Timestamp("2026-10-12", tz="UTC").timestamp())
+        assert store.append("MIXED.NS", _bars("2026-10-14", [3.75, 4.0])) == 1
+        assert store.read("MIXED.NS")["close"].tolist() == [1.0, 2.0, 3.75, 4.0], "history() revises today's bar"
+        print(f"-> {store.read('MIXED.NS')['close'].tolist()}")
+
+        # 6. Stores keyed by raw bar-open times are re-keyed by date on first access
+        print("\n[6] Testing upgrade of legacy timestamps:")
+        legacy = os.path.join(tmp, "legacy")
+        base = MarketStore(legacy).ticker_dir("OLD.NS")
+        os.makedirs(base)
+        ist = pd.Timestamp("2026-10-12", tz="Asia/Kolkata").value // 10**9
+        naive = pd.Timestamp("2026-10-13").value // 10**9
+        legacy_rows = {"ts": [ist, ist + 86400, naive], "open": [1.0, 2.0, 2.5], "high": [1.0, 2.0, 2.5],
+                       "low": [1.0, 2.0, 2.5], "close": [1.0, 2.0, 2.5], "volume": [100, 100, 100]}
+        for name, dtype in (("ts", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"),
+                            ("close", "<f8"), ("volume", "<i8")):
+            np.asarray(legacy_rows[name], dtype=dtype).tofile(os.path.join(base, f"{name}.{dtype[1:]}"))
+        with open(os.path.join(base, "meta.json"), "w") as f:
+            json.dump({"rows": 3, "last_ts": int(naive), "fetched_at": 0.0}, f)
+        upgraded = MarketStore(legacy)
+        assert upgraded.read("OLD.NS")["close"].tolist() == [1.0, 2.5], "The duplicated day keeps its last row"
+        assert upgraded.last_timestamp("OLD.NS") == int(naive)
+        print(f"-> {upgraded.meta('OLD.NS')}")
+
+    print("\n-> All Market Store tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
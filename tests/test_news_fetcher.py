@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import asyncio
+from unittest import mock
+
+import httpx
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+
+from data_connectors import news_fetcher
+from data_connectors.news_fetcher import parse_headlines, format_news, iter_headlines
+
+PAGE = """<html><body>
+<h3 class="clamp">{t} posts record quarterly profit</h3>
+<h3 class="clamp">{t}  POSTS record quarterly profit</h3>
+<h3 class="clamp">{t} announces buyback</h3>
+<h3>Unrelated sidebar heading that is long</h3>
+</body></html>"""
+
+def run_tests():
+    print("\n--- Testing Batch News Fetching ---")
+
+    # 1. lxml parsing with hash de-duplication (case/whitespace-insensitive)
+    print("\n[1] Testing headline parsing:")
+    headlines = parse_headlines(PAGE.format(t="TCS"))
+    assert headlines == ["TCS posts record quarterly profit", "TCS announces buyback"]
+    fallback = parse_headlines("<h3>short</h3><h3>A sufficiently long fallback headline</h3>")
+    assert fallback == ["A sufficiently long fallback headline"]
+    assert format_news("TCS.NS", []) == "No recent news found for TCS.NS."
+    print(f"-> {headlines}")
+
+    # 2. Concurrent batch scrape yields every ticker, fastest first
+    print("\n[2] Testing concurrent batch fetch:")
+    news_fetcher.invalidate()
+    in_flight, peak, requested = [0], [0], []
+
+    async def handler(request):
+        ticker = request.url.path.split("/")[2]
+        requested.append(ticker)
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.2 if ticker == "SLOW.NS" else 0.01)
+        in_flight[0] -= 1
+        if ticker == "BAD.NS":
+            return httpx.Response(404)
+        return httpx.Response(200, text=PAGE.format(t=ticker))
+
+    async def collect(tickers, **kwargs):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return [item async for item in iter_headlines(tickers, client=client, **kwargs)]
+        finally:
+            await client.aclose()
+
+    tickers = ["SLOW.NS"] + [f"T{i}.NS" for i in range(10)] + ["BAD.NS", "T0.NS"]
+    with mock.patch.object(news_fetcher.http_client.bucket("finance.yahoo.com"), "acquire", return_value=0.0):
+        start = time.perf_counter()
+        results = asyncio.run(collect(tickers, max_concurrency=4))
+        elapsed = time.perf_counter() - start
+    order = [t for t, _ in results]
+    assert len(results) == 12, "Duplicate tickers are fetched once"
+    assert order[-1] == "SLOW.NS", "Results must be yielded as they complete"
+    assert peak[0] <= 4, "Concurrency must be bounded"
+    assert "error" in dict(results)["BAD.NS"]
+    assert dict(results)["T3.NS"]["headlines"][0] == "T3.NS posts record quarterly profit"
+    print(f"-> {len(results)} tickers in {elapsed * 1000:.0f} ms, peak concurrency {peak[0]}")
+
+    # 3. Per-ticker TTL cache: a repeat batch only scrapes what failed
+    print("\n[3] Testing per-ticker cache:")
+    requested.clear()
+    with mock.patch.object(news_fetcher.http_client.bucket("finance.yahoo.com"), "acquire", return_value=0.0):
+        again = asyncio.run(collect(tickers))
+    assert requested == ["BAD.NS"], "Only uncached (errored) tickers are re-scraped"
+    assert len(again) == 12
+    assert news_fetcher.cached_headlines("T1.NS", ttl=0) is None, "Expired entries are misses"
+    print("-> Cached tickers served without requests")
+
+    print("\n-> All Batch News Fetching tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
@@ -7,6 +7,7 @@ sys.path.insert(0, os.path.join(root, "Phase_4_Risk_And_Observability"))
 
 from core.risk_manager import evaluate_portfolio_risk
 from core.langfuse_config import get_langfuse_handler
+from core.metrics import MetricsRegistry, registry, timed, track_latency
 
 def run_tests():
     print("\n--- Testing Phase 4: Risk & Observability ---")
@@ -48,6 +49,32 @@ def run_tests():
     assert not indecisive_res["risk_approved"], "HOLD consensus should block automated execution."
     print(f"-> Rejection Status: {indecisive_res['rejection_reason']}")
     
+    # 5. Test latency instrumentation + Prometheus rendering
+    print("\n[5] Testing Latency Metrics Registry:")
+    registry.reset()
+
+    @timed(node="unit_node")
+    def unit_node():
+        return "ok"
+
+    unit_node()
+    try:
+        with track_latency(service="yfinance", operation="history"):
+            raise TimeoutError("simulated")
+    except TimeoutError:
+        pass
+    snapshot = registry.snapshot()
+    assert snapshot["trade_today_node"][0]["count"] == 1, "Node call must be counted"
+    assert snapshot["trade_today_external_call"][0]["errors"] == 1, "Raised calls must be counted as errors"
+
+    text = registry.render_prometheus()
+    assert 'trade_today_node_duration_seconds_count{node="unit_node"} 1' in text
+    assert 'trade_today_external_call_errors_total{operation="history",service="yfinance"} 1' in text
+    assert 'le="+Inf"' in text, "Histogram must expose a +Inf bucket"
+    empty = MetricsRegistry().render_prometheus()
+    assert empty.strip() == "", "A fresh registry renders no series"
+    print("-> Prometheus exposition rendered correctly.")
+
     print("\n-> All Phase 4 simulated tests passed successfully.\n")
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+import os
+import sys
+import tempfile
+import threading
+from unittest import mock
+
+import numpy as np
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+
+from data_connectors.rag_pipeline import ingest
+from data_connectors.rag_pipeline.query_cache import QueryEmbeddingCache
+
+class _Encoder:
+    def __init__(self):
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def encode(self, texts, **kwargs):
+        with self._lock:
+            self.batches.append(list(texts))
+        return np.stack([np.random.default_rng(abs(hash(t)) % 2**32).standard_normal(16) for t in texts]).astype(np.float32)
+
+def run_tests():
+    print("\n--- Testing Query Embedding Cache ---")
+
+    # 1. Hits, misses, LRU eviction
+    print("\n[1] Testing LRU behaviour and stats:")
+    encoder = _Encoder()
+    cache = QueryEmbeddingCache(encoder.encode, maxsize=2)
+    first = cache.get("valuation")
+    assert cache.get("valuation") is first and len(encoder.batches) == 1, "Repeat queries must not re-encode"
+    assert not first.flags.writeable, "Shared cached vectors are read-only"
+    cache.get("debt")
+    cache.get("valuation")   # refreshes recency, so "debt" is evicted next
+    cache.get("growth")
+    assert cache.stats() == {"size": 2, "hits": 2, "misses": 3, "evictions": 1, "hit_ratio": 0.4}
+    cache.get("valuation")
+    assert cache.stats()["hits"] == 3 and len(encoder.batches) == 3
+    cache.get("debt")
+    assert len(encoder.batches) == 4, "Evicted queries are encoded again"
+    metrics = cache.render_prometheus()
+    assert "trade_today_query_cache_hits_total 3" in metrics and "trade_today_query_cache_size 2" in metrics
+    print(f"-> {cache.stats()}")
+
+    # 2. Pre-warming encodes only new queries, in one batch
+    print("\n[2] Testing prewarm:")
+    encoder = _Encoder()
+    cache = QueryEmbeddingCache(encoder.encode)
+    cache.get("valuation")
+    assert cache.prewarm(["valuation", "debt", "growth", "debt"]) == 2
+    assert encoder.batches[-1] == ["debt", "growth"]
+    assert cache.prewarm(["debt"]) == 0 and len(encoder.batches) == 2
+    cache.get("growth")
+    assert cache.stats()["hits"] == 1
+
+    # 3. Concurrent lookups stay consistent
+    print("\n[3] Testing concurrent access:")
+    encoder = _Encoder()
+    cache = QueryEmbeddingCache(encoder.encode, maxsize=8)
+    queries = [f"query {i % 12}" for i in range(600)]
+    errors = []
+    def worker(chunk):
+        try:
+            for q in chunk:
+                assert np.array_equal(cache.get(q), encoder.encode([q])[0])
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=worker, args=(queries[i::6],)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = cache.stats()
+    assert not errors and stats["size"] <= 8 and stats["hits"] + stats["misses"] == 600
+    print(f"-> {stats}")
+
+    # 4. query_fundamentals / search_fundamentals share the process-wide cache
+    print("\n[4] Testing RAG queries go through the cache:")
+    encoder = _Encoder()
+    with tempfile.TemporaryDirectory() as tmp, \
+         mock.patch.object(ingest, "DB_PATH", os.path.join(tmp, "vector_store.db")), \
+         mock.patch.object(ingest, "_EMBED_MODEL", encoder), \
+         mock.patch.object(ingest, "query_cache", QueryEmbeddingCache(ingest._encode_queries)):
+        ingest._get_store().upsert_chunks("TCS.NS", ["a", "b"], np.eye(2, 16, dtype=np.float32))
+        assert ingest.prewarm_query_cache(["standard query"]) == 1
+        before = len(encoder.batches)
+        for ticker in ("TCS.NS", "TCS.NS", "TCS.NS"):
+            ingest.query_fundamentals(ticker, "standard query")
+        assert len(encoder.batches) == before, "Pre-warmed query must never hit the model"
+        ingest.search_fundamentals("standard query", k=2)
+        assert len(encoder.batches) == before
+        assert ingest.query_cache.stats()["hits"] == 4
+        ingest.flush_ann_index()
+        ingest._get_store().close()
+    print(f"-> {len(encoder.batches)} encoder batches for 5 queries")
+
+    print("\n-> All Query Embedding Cache tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import threading
+from datetime import datetime
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+
+from data_connectors.quote_cache import QuoteCache, market_is_open, IST
+
+class _Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+class _Loader:
+    """Counts loads; optionally blocks so the background refresh can be observed."""
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, ticker):
+        self.release.wait(5)
+        self.calls.append(ticker)
+        if ticker == "BAD.NS":
+            return {"error": "No market data available"}
+        return {"ticker": ticker, "current_price": 100.0 + len(self.calls)}
+
+def run_tests():
+    print("\n--- Testing Quote Cache ---")
+
+    # 1. Market-hours aware TTL
+    print("\n[1] Testing market hours:")
+    open_ts = datetime(2026, 10, 16, 11, 0, tzinfo=IST).timestamp()      # Friday 11:00 IST
+    closed_ts = datetime(2026, 10, 16, 16, 0, tzinfo=IST).timestamp()    # Friday after the close
+    weekend_ts = datetime(2026, 10, 17, 11, 0, tzinfo=IST).timestamp()   # Saturday
+    assert market_is_open(open_ts) and not market_is_open(closed_ts) and not market_is_open(weekend_ts)
+    clock = _Clock(open_ts)
+    loader = _Loader()
+    cache = QuoteCache(loader, maxsize=2, ttl_market=10, ttl_closed=900, stale_seconds=30, clock=clock)
+    assert cache.ttl() == 10 and cache.ttl(closed_ts) == 900
+    print("-> 10s TTL while trading, 900s after the close.")
+
+    # 2. Hit / miss and error results are not cached
+    print("\n[2] Testing hits, misses and errors:")
+    first = cache.get("A.NS")
+    assert cache.get("A.NS") is first and loader.calls == ["A.NS"]
+    cache.get("BAD.NS")
+    cache.get("BAD.NS")
+    assert loader.calls.count("BAD.NS") == 2, "Errors must not be cached"
+    print(f"-> {cache.stats()}")
+
+    # 3. Stale-while-revalidate: stale value returned at once, refreshed in the background
+    print("\n[3] Testing stale-while-revalidate:")
+    clock.now += 15
+    loader.release.clear()
+    stale = cache.get("A.NS")
+    assert stale is first, "A stale entry must be served immediately"
+    cache.get("A.NS")
+    loader.release.set()
+    deadline = time.time() + 5
+    while cache.stats()["refreshes"] < 1 and time.time() < deadline:
+        time.sleep(0.01)
+    assert loader.calls.count("A.NS") == 2, "Exactly one background refresh per stale ticker"
+    assert cache.get("A.NS")["current_price"] != first["current_price"]
+    clock.now += 60
+    cache.get("A.NS")
+    assert cache.stats()["misses"] == 4, "Entries past the stale window must reload inline"
+    print(f"-> {cache.stats()}")
+
+    # 4. LRU eviction
+    print("\n[4] Testing LRU eviction:")
+    cache.get("B.NS")
+    cache.get("A.NS")
+    cache.get("C.NS")
+    stats = cache.stats()
+    assert stats["size"] == 2 and stats["evictions"] == 1
+    calls = len(loader.calls)
+    cache.get("A.NS")
+    assert len(loader.calls) == calls, "Most recently used entry must survive"
+    cache.get("B.NS")
+    assert len(loader.calls) == calls + 1, "Least recently used entry must be evicted"
+    assert "trade_today_quote_cache_hits_total" in cache.render_prometheus()
+    print(f"-> {stats}")
+
+    print("\n-> All Quote Cache tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,94 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+sys.path.insert(0, os.path.join(root_dir, "Phase_3_Specialist_Agents"))
+
+from data_connectors.sentiment_scorer import SentimentScorer, BULLISH_PROTOTYPES, BEARISH_PROTOTYPES
+
+_VOCAB = {"profit": 0, "surge": 0, "record": 0, "upgraded": 0, "beats": 0,
+          "loss": 1, "plunge": 1, "probe": 1, "downgraded": 1, "misses": 1}
+
+class _KeywordEncoder:
+    """Tiny stand-in for MiniLM: two sentiment axes plus a deterministic per-text noise component."""
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(len(texts))
+        out = np.zeros((len(texts), 8), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().replace(",", " ").split():
+                if word in _VOCAB:
+                    out[i, _VOCAB[word]] += 1.0
+            out[i, 2 + len(text) % 6] += 0.3
+        return out
+
+def run_tests():
+    print("\n--- Testing Local Sentiment Scorer ---")
+
+    # 1. Prototypes score in the right direction
+    print("\n[1] Testing prototype scoring:")
+    encoder = _KeywordEncoder()
+    scorer = SentimentScorer(model=encoder)
+    bullish = scorer.score_headlines(BULLISH_PROTOTYPES[:2])
+    bearish = scorer.score_headlines(BEARISH_PROTOTYPES[:2])
+    assert (bullish > 0.5).all() and (bearish < -0.5).all()
+    assert np.all(np.abs(bullish) <= 1.0)
+    print(f"-> bullish {bullish.round(2)}, bearish {bearish.round(2)}")
+
+    # 2. Per-headline cache: repeats (even re-cased) are never re-embedded
+    print("\n[2] Testing headline cache:")
+    calls = len(encoder.calls)
+    again = scorer.score_headlines([BULLISH_PROTOTYPES[0].upper(), BULLISH_PROTOTYPES[1]])
+    assert len(encoder.calls) == calls and np.allclose(again, bullish)
+    scorer.score_headlines(["TCS posts record profit", "TCS posts record profit", "Wipro misses estimates"])
+    assert encoder.calls[-1] == 2, "Duplicates within a batch are embedded once"
+    print(f"-> Encoder batch sizes: {encoder.calls}")
+
+    # 3. Watchlist scoring: one embedding batch, per-ticker summaries
+    print("\n[3] Testing watchlist scoring:")
+    news = {
+        "GOOD.NS": ["Shares surge after record profit", "Analysts upgraded the stock", "Company beats estimates"] * 2,
+        "BAD.NS": ["Regulator opens probe", "Quarterly loss widens", "Stock downgraded"],
+        "NONE.NS": [],
+    }
+    calls = len(encoder.calls)
+    results = scorer.score_tickers(news)
+    assert len(encoder.calls) == calls + 1, "All tickers share one embedding batch"
+    assert results["GOOD.NS"]["label"] == "Bullish" and results["GOOD.NS"]["confidence"] > 0.6
+    assert results["BAD.NS"]["label"] == "Bearish"
+    assert results["BAD.NS"]["confidence"] < abs(results["BAD.NS"]["score"]), "Small samples are damped"
+    assert results["NONE.NS"] == {"score": 0.0, "confidence": 0.0, "label": "Neutral", "headlines": 0}
+    print(f"-> {results}")
+
+    # 4. Sentiment agent skips the LLM when the local score is decisive
+    print("\n[4] Testing sentiment agent pre-screen:")
+    from agents.sentiment import sentiment_agent
+    sentiment_agent.sentiment_scorer = scorer
+    decisive = sentiment_agent.run_sentiment_analysis("GOOD.NS", {"headlines": news["GOOD.NS"]})
+    assert decisive["stance"] == "Bullish" and "Local headline scoring" in decisive["reasoning"]
+    bearish_news = news["BAD.NS"] + ["Shares plunge", "Company misses estimates"]
+    bearish = sentiment_agent.run_sentiment_analysis("BAD.NS", {"headlines": bearish_news})
+    assert bearish["stance"] == "Bearish" and "Local headline scoring" in bearish["reasoning"]
+    assert bearish["confidence_score"] == 0.0, "Bearish news must not count towards the BUY confidence"
+    mixed = sentiment_agent.run_sentiment_analysis("MIX.NS", {"headlines": ["Record profit", "Regulator probe"]})
+    assert "Local headline scoring" not in mixed["reasoning"], "Indecisive scores fall through to the LLM path"
+    print(f"-> {decisive['stance']} ({decisive['confidence_score']})")
+
+    # 5. Throughput on cached headlines
+    print("\n[5] Testing cached throughput:")
+    batch = news["GOOD.NS"] * 100
+    start = time.perf_counter()
+    scorer.score_headlines(batch)
+    per_headline_us = (time.perf_counter() - start) / len(batch) * 1e6
+    print(f"-> {per_headline_us:.2f} us/headline (cached)")
+
+    print("\n-> All Local Sentiment Scorer tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+
+# Ensure the root of Phase 1 is in the python path
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root, "Phase_1_Core_Framework"))
+
+from core.single_flight import SingleFlight, analysis_key
+
+def run_tests():
+    print("\n--- Testing Single-Flight Request Coalescing ---")
+
+    # 1. Threads sharing one execution
+    print("\n[1] Testing concurrent thread callers:")
+    calls = []
+    def slow_analysis(ticker):
+        calls.append(ticker)
+        time.sleep(0.2)
+        return {"ticker": ticker, "final_decision": "BUY"}
+
+    flight = SingleFlight(reuse_seconds=0)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do(("RELIANCE.NS",), slow_analysis, "RELIANCE.NS")))
+        for _ in range(10)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1, "Ten identical concurrent requests must execute once"
+    assert all(r is results[0] for r in results), "Every caller must receive the shared result"
+    print(f"-> Stats: {flight.stats}")
+
+    # 2. Post-completion reuse window
+    print("\n[2] Testing reuse window:")
+    flight = SingleFlight(reuse_seconds=60)
+    flight.do("k", slow_analysis, "TCS.NS")
+    flight.do("k", slow_analysis, "TCS.NS")
+    assert calls.count("TCS.NS") == 1, "A finished result must be reused inside the window"
+    flight.invalidate("k")
+    flight.do("k", slow_analysis, "TCS.NS")
+    assert calls.count("TCS.NS") == 2, "Invalidated keys must re-execute"
+    print(f"-> Stats: {flight.stats}")
+
+    # 3. Errors propagate but are not cached
+    print("\n[3] Testing error propagation:")
+    def failing():
+        raise RuntimeError("groq down")
+    try:
+        flight.do("bad", failing)
+        assert False, "Expected the error to propagate"
+    except RuntimeError:
+        pass
+    assert flight.do("bad", lambda: "recovered") == "recovered", "Errors must never be cached"
+    print("-> Errors propagated and not cached.")
+
+    # 4. asyncio callers
+    print("\n[4] Testing concurrent async callers:")
+    async_calls = []
+    async def async_analysis(ticker):
+        async_calls.append(ticker)
+        await asyncio.sleep(0.1)
+        return {"ticker": ticker}
+
+    async def burst():
+        aflight = SingleFlight(reuse_seconds=0)
+        key = analysis_key("infy.ns", "Analyze")
+        return await asyncio.gather(*[aflight.ado(key, async_analysis, "INFY.NS") for _ in range(25)])
+
+    async_results = asyncio.run(burst())
+    assert len(async_calls) == 1, "Twenty-five identical async requests must execute once"
+    assert len(async_results) == 25
+    print("-> Async burst coalesced into a single execution.")
+
+    print("\n-> All Single-Flight tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
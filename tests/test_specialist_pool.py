@@ -0,0 +1,63 @@
+import os
+import sys
+import threading
+from unittest import mock
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_dir)
+
+import master_orchestrator
+from master_orchestrator import _run_specialist, abandoned_specialists
+
+def run_tests():
+    print("\n--- Testing Specialist Pool Limits ---")
+    release = threading.Event()
+
+    def hung_agent(ticker):
+        release.wait(10)
+        return {"agent": "hung", "ticker": ticker}
+
+    def quick_agent(ticker):
+        return {"agent": "quick", "ticker": ticker}
+
+    with mock.patch.object(master_orchestrator, "AGENT_TIMEOUT_SECONDS", 0.05), \
+         mock.patch.object(master_orchestrator, "SPECIALIST_MAX_ABANDONED", 2):
+        # 1. Timed-out agents are tracked while they still hold a pool thread
+        print("\n[1] Testing timed-out agents are tracked:")
+        for i in range(2):
+            update = _run_specialist("Hung Analyst", hung_agent, f"H{i}.NS")
+            assert "timed out" in update["error_logs"][0]
+        assert abandoned_specialists() == 2, "Both hung calls still occupy the pool"
+
+        # 2. At the limit new work is shed instead of queueing behind hung agents
+        print("\n[2] Testing load shedding at the limit:")
+        update = _run_specialist("Quick Analyst", quick_agent, "Q.NS")
+        assert "saturated" in update["error_logs"][0] and "agent_debates" not in update
+        print(f"-> {update['error_logs'][0]}")
+
+        # 3. Slots are handed back once the hung agents return
+        print("\n[3] Testing recovery:")
+        release.set()
+        for _ in range(100):
+            if abandoned_specialists() == 0:
+                break
+            threading.Event().wait(0.01)
+        assert abandoned_specialists() == 0, "Finished agents must leave the abandoned set"
+        update = _run_specialist("Quick Analyst", quick_agent, "Q.NS")
+        assert update == {"agent_debates": [{"agent": "quick", "ticker": "Q.NS"}]}
+        print("-> Pool accepts work again.")
+
+    # 4. Under the profiler agents run inline but still fail softly
+    print("\n[4] Testing agent errors while profiling:")
+    def broken_agent(ticker):
+        raise RuntimeError("simulated Groq outage")
+    with mock.patch.object(master_orchestrator, "profiling_active", lambda: True):
+        update = _run_specialist("Broken Analyst", broken_agent, "B.NS")
+        assert update == {"error_logs": ["Broken Analyst failed: simulated Groq outage"]}
+        assert _run_specialist("Quick Analyst", quick_agent, "Q.NS")["agent_debates"][0]["agent"] == "quick"
+    print(f"-> {update['error_logs'][0]}")
+
+    print("\n-> All Specialist Pool tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
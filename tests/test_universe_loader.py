@@ -0,0 +1,143 @@
+import os
+import sys
+import json
+import time
+import tempfile
+from unittest import mock
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+
+from data_connectors import universe_loader
+from data_connectors.ticker_search import TickerSearchIndex
+
+EQUITY_CSV = """SYMBOL,NAME OF COMPANY, SERIES, DATE OF LISTING
+RELIANCE,Reliance Industries Limited,EQ,29-NOV-1995
+RELINFRA,Reliance Infrastructure Limited,EQ,15-OCT-1993
+TCS,Tata Consultancy Services Limited,EQ,25-AUG-2004
+TATAMOTORS,Tata Motors Limited,EQ,22-JUL-1998
+INFY,Infosys Limited,EQ,08-FEB-1995
+ ,Blank Symbol Limited,EQ,01-JAN-2000
+"""
+
+class _Response:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+def _redirect(tmp):
+    """Points every on-disk artifact of the loader at `tmp` and clears the memo."""
+    universe_loader.EQUITY_CSV_PATH = os.path.join(tmp, "EQUITY_L.csv")
+    universe_loader.EQUITY_META_PATH = os.path.join(tmp, "EQUITY_L.meta.json")
+    universe_loader.UNIVERSE_SNAPSHOT_PATH = os.path.join(tmp, "ticker_universe.npz")
+    universe_loader.BSE_CSV_PATH = os.path.join(tmp, "BSE_Equity.csv")
+    universe_loader._memo.clear()
+
+def run_tests():
+    print("\n--- Testing Universe Loader & Ticker Search ---")
+
+    # 1. Vectorized parsing drops blank rows and formats for yfinance
+    print("\n[1] Testing EQUITY_L.csv parsing:")
+    df = universe_loader.parse_nse_csv(EQUITY_CSV)
+    assert df["ticker"].tolist() == ["RELIANCE.NS", "RELINFRA.NS", "TCS.NS", "TATAMOTORS.NS", "INFY.NS"]
+    assert (df["exchange"] == "NSE").all()
+    print(f"-> Parsed {len(df)} rows")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _redirect(tmp)
+
+        # 2. First load downloads (through the shared HTTP client), stores validators and writes the snapshot
+        print("\n[2] Testing initial download:")
+        ok = _Response(200, EQUITY_CSV, {"ETag": '"v1"', "Last-Modified": "Fri, 16 Oct 2026 10:00:00 GMT"})
+        with mock.patch.object(universe_loader.http_client, "_send", return_value=ok) as get:
+            universe = universe_loader.load_universe()
+            assert "If-None-Match" not in get.call_args.kwargs["headers"]
+        assert len(universe["ticker"]) == 5
+        assert os.path.exists(universe_loader.UNIVERSE_SNAPSHOT_PATH)
+        print(f"-> {len(universe['ticker'])} tickers, snapshot written")
+
+        # 3. A fresh snapshot is served without touching the network
+        print("\n[3] Testing fresh snapshot:")
+        universe_loader._memo.clear()
+        with mock.patch.object(universe_loader.http_client, "_send", side_effect=AssertionError("no request expected")):
+            start = time.perf_counter()
+            again = universe_loader.load_universe()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        assert again["name"].tolist() == universe["name"].tolist()
+        print(f"-> Loaded from snapshot in {elapsed_ms:.2f} ms")
+
+        # 4. A stale snapshot is revalidated; 304 keeps the cached copy
+        print("\n[4] Testing conditional revalidation:")
+        mtime_before = os.path.getmtime(universe_loader.UNIVERSE_SNAPSHOT_PATH) - 3600
+        os.utime(universe_loader.UNIVERSE_SNAPSHOT_PATH, (mtime_before, mtime_before))
+        with mock.patch.object(universe_loader.http_client, "_send", return_value=_Response(304)) as get:
+            revalidated = universe_loader.load_universe(max_age=60)
+            headers = get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Fri, 16 Oct 2026 10:00:00 GMT"
+        assert len(revalidated["ticker"]) == 5
+        assert os.path.getmtime(universe_loader.UNIVERSE_SNAPSHOT_PATH) > mtime_before, "304 must restart the max-age clock"
+        print("-> 304 served from the cached copy")
+
+        # 5. Network failure falls back to the on-disk copy
+        print("\n[5] Testing offline fallback:")
+        with mock.patch.object(universe_loader.http_client, "_send", side_effect=ConnectionError("offline")):
+            offline = universe_loader.load_universe(refresh=True)
+        assert len(offline["ticker"]) == 5
+        stale = os.path.getmtime(universe_loader.UNIVERSE_SNAPSHOT_PATH) - 7200
+        os.utime(universe_loader.UNIVERSE_SNAPSHOT_PATH, (stale, stale))
+        with mock.patch.object(universe_loader.http_client, "_send", side_effect=ConnectionError("offline")) as get:
+            for _ in range(5):
+                assert len(universe_loader.load_universe(max_age=60)["ticker"]) == 5
+        assert get.call_count == 0, "Failed refreshes must back off instead of calling NSE every time"
+        universe_loader._memo["failed_at"] -= universe_loader.UNIVERSE_RETRY_SECONDS
+        with mock.patch.object(universe_loader.http_client, "_send", return_value=_Response(304)) as get:
+            universe_loader.load_universe(max_age=60)
+        assert get.call_count == 1 and "failed_at" not in universe_loader._memo, "NSE is retried after the backoff"
+        print("-> Served the cached copy while offline")
+
+        # 5b. The builder still writes the BSE-only universe when NSE is unreachable
+        print("\n[5b] Testing universe_builder BSE fallback:")
+        from data_connectors import universe_builder
+        with open(universe_loader.BSE_CSV_PATH, "w", encoding="utf-8") as f:
+            f.write("Security Code,Security Name\n500325,RELIANCE INDUSTRIES LTD\n")
+        snapshot_mtime = os.path.getmtime(universe_loader.UNIVERSE_SNAPSHOT_PATH)
+        with mock.patch.object(universe_builder, "UNIVERSE_PATH", os.path.join(tmp, "ticker_universe.json")), \
+             mock.patch.object(universe_builder, "fetch_equity_csv", side_effect=ConnectionError("offline")):
+            universe_builder.build_market_universe()
+            with open(universe_builder.UNIVERSE_PATH, encoding="utf-8") as f:
+                written = json.load(f)
+        assert written == [{"ticker": "500325.BO", "name": "RELIANCE INDUSTRIES LTD", "exchange": "BSE"}]
+        assert os.path.getmtime(universe_loader.UNIVERSE_SNAPSHOT_PATH) == snapshot_mtime, \
+            "A BSE-only list must not replace the NSE snapshot"
+        print(f"-> {written}")
+
+    # 6. Search ranking, fuzzy matching and top-k
+    print("\n[6] Testing ticker search:")
+    index = TickerSearchIndex(df["ticker"].tolist(), df["name"].tolist())
+    assert index.search("RELIANCE")[0]["ticker"] == "RELIANCE.NS", "Exact symbol must rank first"
+    assert [m["ticker"] for m in index.search("reli")] == ["RELIANCE.NS", "RELINFRA.NS"]
+    assert index.search("tata motors")[0]["ticker"] == "TATAMOTORS.NS", "Every term must match"
+    assert index.search("consultancy")[0]["ticker"] == "TCS.NS", "Name tokens are searchable"
+    assert index.search("INFOSIS")[0]["ticker"] == "INFY.NS", "One substitution is tolerated"
+    assert index.search("RELIENCE")[0]["ticker"] == "RELIANCE.NS"
+    assert len(index.search("TA", k=1)) == 1
+    assert index.search("   ") == [] and index.search("ZZZZ") == []
+    assert index.label("TCS.NS") == "Tata Consultancy Services Limited (TCS.NS)"
+    assert index.label("UNKNOWN.NS") == "UNKNOWN.NS"
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        index.search("tata")
+    per_query_us = (time.perf_counter() - start) * 1000
+    print(f"-> Top-k search: {per_query_us:.1f} us/query")
+
+    print("\n-> All Universe Loader & Ticker Search tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,170 @@
+import os
+import sys
+import sqlite3
+import tempfile
+from unittest import mock
+
+import numpy as np
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+sys.path.insert(0, root_dir)
+
+from data_connectors.rag_pipeline import ingest
+from data_connectors.rag_pipeline.vector_store import VectorStore, encode_embeddings, decode_embeddings
+import migrate_vector_store
+
+class _Encoder:
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, **kwargs):
+        self.batches.append(len(texts))
+        return np.stack([np.random.default_rng(abs(hash(t)) % 2**32).standard_normal(16) for t in texts]).astype(np.float32)
+
+def _info(ticker):
+    if ticker == "BAD.NS":
+        raise RuntimeError("No data found")
+    return {"longName": f"{ticker} Ltd", "sector": "Technology", "trailingPE": 21.5,
+            "longBusinessSummary": f"{ticker} builds software."}
+
+def run_tests():
+    print("\n--- Testing RAG Vector Store ---")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "vector_store.db")
+
+        # 1. WAL mode, ticker index, one transaction per upsert
+        print("\n[1] Testing store setup and batched upsert:")
+        store = VectorStore(db_path)
+        assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        plan = store._conn.execute("EXPLAIN QUERY PLAN SELECT id FROM embeddings WHERE ticker = 'X'").fetchall()
+        assert any("idx_embeddings_ticker" in row[-1] for row in plan), "Per-ticker reads must use the index"
+        statements = []
+        store._conn.set_trace_callback(statements.append)
+        store.upsert_chunks("TCS.NS", ["a", "b", "c"], np.ones((3, 16), dtype=np.float32))
+        store._conn.set_trace_callback(None)
+        assert sum(s.startswith("COMMIT") for s in statements) == 1, "All chunks must share one commit"
+        rows = store.fetch("TCS.NS")
+        assert [r[0] for r in rows] == ["TCS.NS_chunk_0", "TCS.NS_chunk_1", "TCS.NS_chunk_2"]
+        assert rows[0][2].dtype == np.float32 and rows[0][2].shape == (16,)
+        store.upsert_chunks("TCS.NS", ["a2", "b2", "c2"], np.zeros((3, 16), dtype=np.float32))
+        assert store.count("TCS.NS") == 3 and store.fetch("TCS.NS")[0][1] == "a2", "Re-ingest replaces chunks"
+        print(f"-> {len(statements)} statements, 1 commit")
+
+        # 2. Single-ticker ingest goes through the long-lived store
+        print("\n[2] Testing ingest_stock_fundamentals:")
+        encoder = _Encoder()
+        with mock.patch.object(ingest, "DB_PATH", os.path.join(tmp, "ingest.db")), \
+             mock.patch.object(ingest, "_EMBED_MODEL", encoder), \
+             mock.patch.object(ingest, "_fetch_info", side_effect=_info):
+            result = ingest.ingest_stock_fundamentals("INFY.NS")
+            assert result == {"status": "success", "chunks_processed": 4}
+            assert ingest._get_store() is ingest._get_store(), "The connection is reused across calls"
+            assert "INFY.NS builds software" in ingest.query_fundamentals("INFY.NS", "business", n_results=4)
+
+            # 3. Bulk ingest: one embedding batch, failures isolated
+            print("\n[3] Testing bulk ingest:")
+            encoder.batches.clear()
+            tickers = [f"T{i}.NS" for i in range(20)] + ["BAD.NS"]
+            results = ingest.ingest_many_fundamentals(tickers)
+            assert list(results) == tickers
+            assert results["BAD.NS"]["status"] == "error"
+            assert all(results[t]["status"] == "success" for t in tickers[:-1])
+            assert encoder.batches == [80], "Every chunk is embedded in one batch"
+            assert ingest._get_store().count() == 84
+            print(f"-> {ingest._get_store().count()} chunks stored, encoder batches {encoder.batches}")
+
+            # 4. Content-hash embedding cache: unchanged chunks are never re-encoded
+            print("\n[4] Testing the embedding cache:")
+            encoder.batches.clear()
+            assert ingest.ingest_many_fundamentals(tickers[:-1])["T0.NS"]["status"] == "success"
+            assert ingest.ingest_stock_fundamentals("INFY.NS")["status"] == "success"
+            assert encoder.batches == [], "Unchanged fundamentals must come from the cache"
+            changed = lambda t: {**_info(t), "trailingPE": 40.0}
+            with mock.patch.object(ingest, "_fetch_info", side_effect=changed):
+                ingest.ingest_stock_fundamentals("INFY.NS")
+            assert encoder.batches == [1], "Only the changed ratios chunk is re-encoded"
+            assert "40.0" in ingest.query_fundamentals("INFY.NS", "valuation", n_results=4)
+            ingest.flush_ann_index()
+            ingest._get_store().close()
+            reopened = VectorStore(os.path.join(tmp, "ingest.db"))
+            text = ingest._build_chunks("T3.NS", _info("T3.NS"))[0]
+            cached = reopened.cached_embeddings([ingest._content_hash(text), "missing"])
+            assert list(cached) == [ingest._content_hash(text)], "The cache persists across connections"
+            assert np.allclose(cached[ingest._content_hash(text)], encoder.encode([text])[0])
+            reopened.close()
+            print(f"-> re-ingest encoder batches {encoder.batches}")
+
+        # 5. Vectorized retrieval over cached unit-row matrices
+        print("\n[5] Testing vectorized top-k retrieval:")
+        rng = np.random.default_rng(3)
+        vectors = rng.standard_normal((500, 16)).astype(np.float32) * rng.uniform(0.5, 5, (500, 1)).astype(np.float32)
+        store.upsert_chunks("BIG.NS", [f"chunk {i}" for i in range(500)], vectors)
+        matrix = store.load("BIG.NS")
+        assert matrix.vectors.dtype == np.float32 and matrix.vectors.flags["C_CONTIGUOUS"]
+        assert np.allclose(np.linalg.norm(matrix.vectors, axis=1), 1.0, atol=1e-5), "Stored rows must be unit length"
+        assert store.load("BIG.NS") is matrix, "Second load must hit the LRU"
+        query = rng.standard_normal(16).astype(np.float32)
+        expected = sorted(range(500), key=lambda i: -float(vectors[i] @ query / np.linalg.norm(vectors[i]) / np.linalg.norm(query)))[:5]
+        top = store.top_k("BIG.NS", query, k=5)
+        assert [text for text, _ in top] == [f"chunk {i}" for i in expected]
+        assert all(a[1] >= b[1] for a, b in zip(top, top[1:]))
+        assert len(store.top_k("BIG.NS", query, k=900)) == 500 and store.top_k("NONE.NS", query) == []
+        store.upsert_chunks("BIG.NS", ["replaced"], -query[None, :])
+        assert store.load("BIG.NS") is not matrix, "Upserts must invalidate the cached matrix"
+        assert store.top_k("BIG.NS", query, k=1)[0][0] != "replaced"
+        print(f"-> top-5 {[t for t, _ in top]}")
+
+        # 6. Quantized encodings round-trip and rank like float32
+        print("\n[6] Testing float16 / int8 storage:")
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        for dtype, blob_bytes, tolerance in (("float16", 32, 1e-3), ("int8", 20, 1e-2)):
+            blobs = encode_embeddings(unit, dtype)
+            assert {len(b) for b in blobs} == {blob_bytes}
+            decoded = decode_embeddings(blobs, dtype)
+            assert decoded.dtype == np.float32 and np.abs(decoded - unit).max() < tolerance
+            quantized = VectorStore(os.path.join(tmp, f"{dtype}.db"), dtype=dtype)
+            quantized.upsert_chunks("BIG.NS", [f"chunk {i}" for i in range(500)], vectors)
+            assert quantized.top_k("BIG.NS", query, k=1)[0][0] == top[0][0]
+            assert np.allclose(np.linalg.norm(quantized.load("BIG.NS").vectors, axis=1), 1.0, atol=1e-5)
+            quantized.cache_embeddings([("h", vectors[0])])
+            assert np.array_equal(quantized.cached_embeddings(["h"])["h"], vectors[0]), \
+                "The embedding cache stays float32 so upserts quantize only once"
+            quantized.close()
+            assert VectorStore(os.path.join(tmp, f"{dtype}.db")).dtype == dtype, "The encoding is recorded in the file"
+        assert np.array_equal(decode_embeddings(encode_embeddings(np.zeros((1, 4)), "int8"), "int8"), np.zeros((1, 4)))
+
+        # 7. Migrating an existing float32 file
+        print("\n[7] Testing migrate_vector_store:")
+        legacy_path = os.path.join(tmp, "legacy.db")
+        legacy = sqlite3.connect(legacy_path)
+        legacy.execute("CREATE TABLE embeddings (id TEXT PRIMARY KEY, ticker TEXT, chunk_text TEXT, embedding BLOB)")
+        legacy.executemany("INSERT INTO embeddings VALUES (?, ?, ?, ?)",
+                           [(f"BIG.NS_chunk_{i}", "BIG.NS", f"chunk {i}", unit[i].tobytes()) for i in range(500)])
+        legacy.commit()
+        legacy.close()
+        legacy = VectorStore(legacy_path, dtype="int8")
+        assert legacy.dtype == "float32", "Pre-existing files are float32"
+        legacy.cache_embeddings([("h", vectors[0])])
+        legacy.close()
+        report = migrate_vector_store.migrate(legacy_path, "int8", backup=True)
+        assert report["embeddings"] == 500 and report["bytes_after"] < report["bytes_before"]
+        assert os.path.exists(legacy_path + ".bak")
+        migrated = VectorStore(legacy_path)
+        assert migrated.dtype == "int8" and migrated.count() == 500
+        assert np.array_equal(migrated.cached_embeddings(["h"])["h"], vectors[0]), "Migration leaves the cache as is"
+        assert migrated.top_k("BIG.NS", query, k=1)[0][0] == top[0][0]
+        assert migrated.convert("int8")["embeddings"] == 0, "Converting to the current dtype is a no-op"
+        migrated.close()
+        print(f"-> {report['bytes_before']} -> {report['bytes_after']} bytes")
+
+        conn = sqlite3.connect(os.path.join(tmp, "ingest.db"))
+        assert conn.execute("SELECT COUNT(DISTINCT ticker) FROM embeddings").fetchone()[0] == 21
+        conn.close()
+        store.close()
+
+    print("\n-> All RAG Vector Store tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,140 @@
+import os
+import sys
+import types
+import tempfile
+import threading
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(root_dir, "Phase_2_Data_Connectivity"))
+
+import pandas as pd
+
+class _FakeYFinance(types.ModuleType):
+    """Offline yfinance: download() returns a (ticker, field) frame, tracking call concurrency."""
+    def __init__(self):
+        super().__init__("yfinance")
+        self.calls = []
+        self.windows = []
+        self.failing = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def download(self, tickers, **kwargs):
+        with self._lock:
+            self.calls.append(list(tickers))
+            self.windows.append({k: kwargs[k] for k in ("period", "start") if k in kwargs})
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if "OUTAGE.NS" in tickers:
+                raise ConnectionError("simulated Yahoo outage")
+            index = pd.date_range("2026-10-12", periods=5, freq="B")
+            frames = {}
+            for i, t in enumerate(tickers):
+                if t == "DELISTED.NS":
+                    continue
+                close = [float("nan")] * 5 if self.failing == t else [100.0 + i + d for d in range(5)]
+                frames[t] = pd.DataFrame({"Open": close, "High": close, "Low": close,
+                                          "Close": close, "Volume": [1000] * 5}, index=index)
+            return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+def run_tests():
+    print("\n--- Testing Batched OHLCV Fetching ---")
+    fake = _FakeYFinance()
+    real = sys.modules.get("yfinance")
+    sys.modules["yfinance"] = fake
+    tmp = tempfile.TemporaryDirectory()
+    try:
+        from data_connectors import yfinance_data
+        from data_connectors.market_store import MarketStore
+        from data_connectors.yfinance_data import fetch_live_ohlcv_many
+        real_store = yfinance_data.market_store
+        yfinance_data.market_store = MarketStore(tmp.name)
+
+        # 1. Batching + same dict shape as fetch_live_ohlcv
+        print("\n[1] Testing batching and result shape:")
+        tickers = [f"T{i}.NS" for i in range(25)]
+        results = fetch_live_ohlcv_many(tickers + ["T0.NS"], batch_size=10, max_concurrency=2)
+        assert len(fake.calls) == 3, f"Expected 3 batches, got {len(fake.calls)}"
+        assert fake.peak_in_flight <= 2, "Concurrency cap exceeded"
+        assert set(results) == set(tickers), "Every (deduplicated) ticker must be answered"
+        assert results["T0.NS"] == {"ticker": "T0.NS", "current_price": 104.0, "open": 104.0,
+                                    "high": 104.0, "low": 104.0, "volume": 1000}
+        print(f"-> {len(results)} tickers in {len(fake.calls)} downloads.")
+
+        # 2. Per-ticker failure isolation
+        print("\n[2] Testing per-ticker errors:")
+        fake.calls.clear()
+        results = fetch_live_ohlcv_many(["A.NS", "DELISTED.NS", "B.NS", "OUTAGE.NS"], batch_size=2)
+        assert "current_price" in results["A.NS"], "Healthy ticker in a partial batch must succeed"
+        assert results["DELISTED.NS"] == {"error": "No market data available"}
+        assert "outage" in results["B.NS"]["error"] and "outage" in results["OUTAGE.NS"]["error"]
+        print(f"-> {results}")
+
+        # 3. Fresh tickers are served from the local store without another download
+        print("\n[3] Testing store reuse:")
+        fake.calls.clear()
+        again = fetch_live_ohlcv_many(["A.NS", "T3.NS"])
+        assert fake.calls == [], "Fresh tickers must not trigger a download"
+        assert again["T3.NS"]["current_price"] == 107.0
+        print("-> Served from the market store.")
+
+        # 3b. A symbol Yahoo failed on (all-NaN column) is an error and stays stale
+        print("\n[3b] Testing all-NaN columns:")
+        fake.failing = "T5.NS"
+        before = yfinance_data.market_store.meta("T5.NS")["fetched_at"]
+        real_refresh = yfinance_data.OHLCV_REFRESH_SECONDS
+        yfinance_data.OHLCV_REFRESH_SECONDS = 0
+        try:
+            failed = fetch_live_ohlcv_many(["T5.NS", "T6.NS"])
+        finally:
+            yfinance_data.OHLCV_REFRESH_SECONDS = real_refresh
+            fake.failing = None
+        assert failed["T5.NS"] == {"error": "No market data available"} and "current_price" in failed["T6.NS"]
+        assert yfinance_data.market_store.meta("T5.NS")["fetched_at"] == before, "A failed symbol must not look fresh"
+        assert yfinance_data.market_store.meta("T6.NS")["fetched_at"] > before
+        print(f"-> {failed['T5.NS']}")
+
+        # 4. New tickers don't drag known ones into a full bootstrap download
+        print("\n[4] Testing batches grouped by gap:")
+        fake.calls.clear()
+        fake.windows.clear()
+        real_refresh = yfinance_data.OHLCV_REFRESH_SECONDS
+        yfinance_data.OHLCV_REFRESH_SECONDS = 0
+        try:
+            fetch_live_ohlcv_many(["T1.NS", "NEW.NS", "T2.NS", "A.NS"], batch_size=50)
+        finally:
+            yfinance_data.OHLCV_REFRESH_SECONDS = real_refresh
+        assert sorted(map(sorted, fake.calls)) == [["A.NS", "T1.NS", "T2.NS"], ["NEW.NS"]], fake.calls
+        windows = dict(zip(map(tuple, map(sorted, fake.calls)), fake.windows))
+        assert windows[("NEW.NS",)] == {"period": yfinance_data.OHLCV_BOOTSTRAP_PERIOD}
+        assert "start" in windows[("A.NS", "T1.NS", "T2.NS")], "Known tickers fetch only their delta"
+
+        store = yfinance_data.market_store
+        old_ts = store.last_timestamp("T1.NS") - 30 * 86400
+        groups = yfinance_data._group_by_gap(["T1.NS", "T2.NS"], 50)
+        assert groups == [["T1.NS", "T2.NS"]] or groups == [["T2.NS", "T1.NS"]]
+        real_last = store.last_timestamp
+        store.last_timestamp = lambda t: old_ts if t == "T2.NS" else real_last(t)
+        try:
+            assert yfinance_data._group_by_gap(["T1.NS", "T2.NS"], 50) == [["T1.NS"], ["T2.NS"]], \
+                "Tickers a month apart must not share a download window"
+        finally:
+            del store.last_timestamp
+        print(f"-> {fake.calls}")
+        yfinance_data.market_store = real_store
+    finally:
+        tmp.cleanup()
+        if real is not None:
+            sys.modules["yfinance"] = real
+        else:
+            sys.modules.pop("yfinance", None)
+
+    print("\n-> All Batched OHLCV tests passed successfully.\n")
+
+if __name__ == "__main__":
+    run_tests()